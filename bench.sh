@@ -0,0 +1,5 @@
+#!/bin/bash
+
+for bench in benchmarks/bench_*.py; do
+    PYTHONPATH=src python3 "$bench" || exit 1
+done
@@ -0,0 +1,55 @@
+import sys
+import time
+import tracemalloc
+
+from arena import markdown_to_arena
+from markdown_to_html import markdown_to_html_node
+
+
+def huge_page(blocks):
+    parts = []
+    for i in range(blocks):
+        parts.append(f"## Section {i}")
+        parts.append(f"Paragraph {i} with **bold**, _italic_, `code` and a [link](/page/{i % 50}).")
+        parts.append("\n".join(f"- item {j} of [list](/list/{j})" for j in range(8)))
+    return "\n\n".join(parts)
+
+
+def measure(build, markdown):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = build(markdown)
+    elapsed = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, size, peak, elapsed
+
+
+def best_render(render, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    markdown = huge_page(blocks)
+    print(f"{blocks * 3} blocks, {len(markdown) / 1e6:.1f} MB of markdown")
+
+    node, node_size, node_peak, node_build = measure(markdown_to_html_node, markdown)
+    arena, arena_size, arena_peak, arena_build = measure(markdown_to_arena, markdown)
+    assert arena.render() == node.to_html()
+    print(f"{'tree':<10}{'nodes':>10}{'retained MB':>14}{'peak MB':>10}{'build s':>10}{'render s':>10}")
+    rows = [
+        ("HTMLNode", len(arena), node_size, node_peak, node_build, best_render(node.to_html)),
+        ("arena", len(arena), arena_size, arena_peak, arena_build, best_render(arena.render)),
+    ]
+    for name, nodes, size, peak, build, render in rows:
+        print(f"{name:<10}{nodes:>10}{size / 1e6:>14.1f}{peak / 1e6:>10.1f}{build:>10.3f}{render:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import random
+import sys
+import time
+
+from bench_inline import make_paragraphs
+from markdown_to_html import markdown_to_html, markdown_to_html_node
+
+
+def make_pages(count, seed=0):
+    rng = random.Random(seed)
+    paragraphs = make_paragraphs(count * 4, seed)
+    pages = []
+    for i in range(count):
+        blocks = [f"# Page {i}"]
+        for j in range(4):
+            blocks.append(paragraphs[i * 4 + j])
+            blocks.append("\n".join(f"- item **{k}** with a [link](/l/{k})" for k in range(rng.randint(3, 8))))
+        blocks.append("> a _quoted_ line\n> and `another`")
+        blocks.append("```\ndef f():\n    return 1\n```")
+        pages.append("\n\n".join(blocks))
+    return pages
+
+
+def pages_per_second(render, pages, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            render(page)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) / best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pages = make_pages(count)
+    for page in pages:
+        assert markdown_to_html(page) == markdown_to_html_node(page).to_html()
+    print(f"markdown to HTML string, {count} pages (best of 5)")
+    tree = pages_per_second(lambda page: markdown_to_html_node(page).to_html(), pages)
+    direct = pages_per_second(markdown_to_html, pages)
+    print(f"  markdown_to_html_node().to_html() {tree:>9.0f} pages/s")
+    print(f"  markdown_to_html()                {direct:>9.0f} pages/s  ({direct / tree:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
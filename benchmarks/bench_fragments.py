@@ -0,0 +1,58 @@
+import sys
+import time
+
+from fragment_cache import FragmentCache
+from htmlnode import freeze, set_fragment_cache
+from markdown_to_html import markdown_to_html_node
+
+# Every page embeds the same navigation, admonition and code snippet.
+SHARED = [
+    "\n".join(f"- [Section {i}](/docs/{i})" for i in range(30)),
+    "> **Note:** run the _installer_ before\n> following any of the `steps` below.",
+    "```\n" + "\n".join(f"line {i} = compute({i})" for i in range(40)) + "\n```",
+]
+
+
+def page(i):
+    own = f"# Page {i}\n\nIntro for page {i} with **bold** text and a [link](/p/{i})."
+    return "\n\n".join([own] + SHARED + [f"Closing words for page {i}."])
+
+
+def best(render, pages, repeat=5, setup=None):
+    best_time = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for node in pages:
+            render(node)
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    nodes = [markdown_to_html_node(page(i)) for i in range(count)]
+    frozen = [freeze(node) for node in nodes]
+    expected = [node.to_html() for node in nodes]
+
+    plain = best(lambda node: node.to_html(), nodes)
+    uncached = best(lambda node: node.to_html(), frozen)
+    # Each pass starts from an empty cache, like one build: the shared
+    # blocks hit from the second page on, the pages themselves never do.
+    previous = set_fragment_cache(FragmentCache())
+    try:
+        assert [node.to_html() for node in frozen] == expected
+        cached = best(lambda node: node.to_html(), frozen, setup=lambda: set_fragment_cache(FragmentCache()))
+        cache = set_fragment_cache(previous)
+    finally:
+        set_fragment_cache(previous)
+
+    print(f"{count} pages, {sum(map(len, expected)) / 1e6:.1f} MB of HTML, best of 5")
+    for name, elapsed in [("HTMLNode", plain), ("frozen", uncached), ("frozen+cache", cached)]:
+        print(f"  {name:<14}{elapsed * 1000:>9.1f} ms  {count / elapsed:>10.0f} pages/s")
+    print(f"  {cache!r}")
+
+
+if __name__ == "__main__":
+    main()
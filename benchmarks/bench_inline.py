@@ -0,0 +1,70 @@
+import random
+import sys
+import time
+
+from text_processing import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+from textnode import TextNode, TextType
+
+
+def five_pass_text_to_textnodes(text):
+    if text == "":
+        return [TextNode("", TextType.TEXT)]
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return nodes
+
+
+def make_paragraphs(count, seed=0):
+    rng = random.Random(seed)
+    words = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "static", "site"]
+    paragraphs = []
+    for i in range(count):
+        parts = []
+        for _ in range(rng.randint(30, 80)):
+            roll = rng.random()
+            if roll < 0.04:
+                parts.append(f"**{rng.choice(words)}**")
+            elif roll < 0.07:
+                parts.append(f"_{rng.choice(words)}_")
+            elif roll < 0.09:
+                parts.append(f"`{rng.choice(words)}()`")
+            elif roll < 0.11:
+                parts.append(f"[{rng.choice(words)}](https://example.com/{i})")
+            elif roll < 0.12:
+                parts.append(f"![{rng.choice(words)}](/images/{i}.png)")
+            else:
+                parts.append(rng.choice(words))
+        paragraphs.append(" ".join(parts))
+    return paragraphs
+
+
+def best_of(function, inputs, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in inputs:
+            function(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    paragraphs = make_paragraphs(count)
+    for text in paragraphs:
+        assert text_to_textnodes(text) == five_pass_text_to_textnodes(text)
+
+    old = best_of(five_pass_text_to_textnodes, paragraphs)
+    new = best_of(text_to_textnodes, paragraphs)
+    print(f"inline parsing, {count} paragraphs (best of 5)")
+    print(f"  five-pass pipeline : {old:.3f}s  {count / old:>10.0f} paragraphs/s")
+    print(f"  single-pass scanner: {new:.3f}s  {count / new:>10.0f} paragraphs/s")
+    print(f"  speedup            : {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import sys
+import time
+
+from text_processing import extract_markdown_links, split_nodes_link
+from textnode import TextNode, TextType
+
+
+def resplit_nodes_link(old_nodes):
+    # The previous implementation: rebuild each "[text](url)" and split the
+    # remaining text on it, rescanning and copying the tail once per link.
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        links = extract_markdown_links(node.text)
+        if not links:
+            new_nodes.append(node)
+            continue
+        temp_text = node.text
+        for link_text, url in links:
+            before, temp_text = temp_text.split(f"[{link_text}]({url})", 1)
+            if before:
+                new_nodes.append(TextNode(before, TextType.TEXT))
+            new_nodes.append(TextNode(link_text, TextType.LINK, url))
+        if temp_text:
+            new_nodes.append(TextNode(temp_text, TextType.TEXT))
+    return new_nodes
+
+
+def best_of(function, nodes, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(nodes)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+    print("link splitting, one paragraph with k links (best of 5)")
+    for count in counts:
+        text = " filler text between links ".join(f"[link {i}](https://example.com/page/{i})" for i in range(count))
+        nodes = [TextNode(text, TextType.TEXT)]
+        assert split_nodes_link(nodes) == resplit_nodes_link(nodes)
+        old = best_of(resplit_nodes_link, nodes)
+        new = best_of(split_nodes_link, nodes)
+        print(f"  k={count:<6} split-per-link {old * 1000:9.2f} ms   match offsets {new * 1000:8.2f} ms   {old / new:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
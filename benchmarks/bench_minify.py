@@ -0,0 +1,44 @@
+import sys
+import time
+
+from bench_direct import make_pages
+from markdown_to_html import markdown_to_html
+from minify import HTMLMinifier, iter_minified
+from template import compile_template
+
+TEMPLATE = """<!DOCTYPE html>
+<html>
+  <head>
+    <meta charset="utf-8">
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet">
+  </head>
+  <body>
+    <article>
+      {{ Content }}
+    </article>
+  </body>
+</html>
+"""
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    template = compile_template(TEMPLATE)
+    pages = [template.render({"Title": f"Page {i}", "Content": markdown_to_html(md)}) for i, md in enumerate(make_pages(count))]
+    size = sum(len(page) for page in pages)
+    best = float("inf")
+    for _ in range(5):
+        minifiers = [HTMLMinifier() for _ in pages]
+        start = time.perf_counter()
+        for page, minifier in zip(pages, minifiers):
+            # Fed in 4 KiB chunks, the way a streamed page arrives.
+            "".join(iter_minified((page[i:i + 4096] for i in range(0, len(page), 4096)), minifier))
+        best = min(best, time.perf_counter() - start)
+    saved = sum(m.chars_in - m.chars_out for m in minifiers)
+    print(f"minifying {count} pages, {size / 1e6:.2f} MB (best of 5)")
+    print(f"  {size / best / 1e6:.1f} MB/s, saved {saved} bytes ({saved / size * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
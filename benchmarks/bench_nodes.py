@@ -0,0 +1,47 @@
+import sys
+import tracemalloc
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+
+# Subclasses without __slots__ get a per-instance __dict__ again, which is
+# what every node carried before the classes were slotted.
+class DictLeafNode(LeafNode):
+    pass
+
+
+class DictParentNode(ParentNode):
+    pass
+
+
+class DictTextNode(TextNode):
+    pass
+
+
+def bytes_per_node(build, count):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    nodes = [build(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Per-node storage only: the list holding them costs the same either way.
+    return (after - before - sys.getsizeof(nodes)) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    text = "shared text"
+    cases = [
+        ("LeafNode", lambda i: LeafNode("a", text, None), lambda i: DictLeafNode("a", text, None)),
+        ("ParentNode", lambda i: ParentNode("li", None), lambda i: DictParentNode("li", None)),
+        ("TextNode", lambda i: TextNode(text, TextType.TEXT), lambda i: DictTextNode(text, TextType.TEXT)),
+    ]
+    print(f"bytes per node, {count} nodes each (tracemalloc)")
+    print(f"  {'class':<12}{'__dict__':>10}{'slots':>10}")
+    for name, slotted, unslotted in cases:
+        print(f"  {name:<12}{bytes_per_node(unslotted, count):>10.1f}{bytes_per_node(slotted, count):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from output_writer import write_atomic, write_if_changed
+
+
+def make_pages(count):
+    rng = random.Random(0)
+    words = ["static", "site", "generator", "markdown", "page", "link", "paragraph", "list"]
+    pages = []
+    for i in range(count):
+        body = " ".join(rng.choice(words) for _ in range(3000))
+        pages.append((f"page{i}.html", f"<html><body><p>{body}</p></body></html>".encode("utf-8")))
+    return pages
+
+
+def timed(root, pages, write):
+    start = time.perf_counter()
+    written = 0
+    for name, data in pages:
+        if write(os.path.join(root, name), data) is not False:
+            written += 1
+    return time.perf_counter() - start, written
+
+
+def mtimes(root):
+    return {name: os.stat(os.path.join(root, name)).st_mtime_ns for name in os.listdir(root)}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    pages = make_pages(count)
+    size = sum(len(data) for _, data in pages) / 1e6
+    with tempfile.TemporaryDirectory() as root:
+        timed(root, pages, write_atomic)
+        before = mtimes(root)
+        always, _ = timed(root, pages, write_atomic)
+        rewritten = sum(1 for name, mtime in mtimes(root).items() if mtime != before[name])
+        before = mtimes(root)
+        unchanged, written = timed(root, pages, write_if_changed)
+        kept = sum(1 for name, mtime in mtimes(root).items() if mtime == before[name])
+        edited = [(name, data + b"\n") if i % 10 == 0 else (name, data) for i, (name, data) in enumerate(pages)]
+        tenth, tenth_written = timed(root, edited, write_if_changed)
+    print(f"writing {count} pages, {size:.1f} MB, all already on disk")
+    print(f"  always write      {always:8.3f} s  ({rewritten} mtimes changed)")
+    print(f"  write if changed  {unchanged:8.3f} s  ({written} written, {kept} mtimes kept)")
+    print(f"  10% edited        {tenth:8.3f} s  ({tenth_written} written)")
+
+
+if __name__ == "__main__":
+    main()
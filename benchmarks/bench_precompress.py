@@ -0,0 +1,47 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from precompress import precompress_public
+
+
+def make_public(root, count):
+    rng = random.Random(0)
+    words = ["static", "site", "generator", "markdown", "page", "link", "paragraph", "list"]
+    for i in range(count):
+        path = os.path.join(root, "public", f"section{i % 20}", f"page{i}.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        body = " ".join(rng.choice(words) for _ in range(6000))
+        with open(path, "w") as f:
+            f.write(f"<html><body><p>{body}</p></body></html>")
+
+
+def timed(root, workers):
+    shutil.rmtree(os.path.join(root, ".cache"), ignore_errors=True)
+    start = time.perf_counter()
+    result = precompress_public(root, workers=workers)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as root:
+        make_public(root, count)
+        serial, result = timed(root, 1)
+        parallel, _ = timed(root, workers)
+        start = time.perf_counter()
+        warm = precompress_public(root, workers=workers)
+        reuse = time.perf_counter() - start
+    size = result.bytes_in / 1e6
+    print(f"precompressing {count} pages, {size:.1f} MB -> {result.bytes_out / 1e6:.1f} MB at level 9")
+    print(f"  1 process      {serial:8.3f} s  {size / serial:6.1f} MB/s")
+    print(f"  {workers:<2} processes   {parallel:8.3f} s  {size / parallel:6.1f} MB/s")
+    print(f"  unchanged      {reuse:8.3f} s  ({len(warm.reused)} reused)")
+
+
+if __name__ == "__main__":
+    main()
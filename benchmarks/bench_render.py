@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import tracemalloc
+
+from htmlnode import LeafNode, ParentNode
+
+
+def concat_to_html(node):
+    # The original recursive ParentNode.to_html: children appended with +=.
+    if isinstance(node, LeafNode):
+        return node.to_html()
+    children_html = ""
+    for child in node.children:
+        children_html += concat_to_html(child)
+    return f"<{node.tag}{node.props_to_html()}>{children_html}</{node.tag}>"
+
+
+def recursive_to_html(node):
+    # Recursive, one method call per node, children joined.
+    if isinstance(node, LeafNode):
+        return node.to_html()
+    children_html = "".join([recursive_to_html(child) for child in node.children])
+    return f"<{node.tag}{node.props_to_html()}>{children_html}</{node.tag}>"
+
+
+def make_page(items):
+    lis = [ParentNode("li", [LeafNode(None, f"Item {i} with "), LeafNode("code", f"value_{i}")]) for i in range(items)]
+    return ParentNode("div", [LeafNode("h1", "Index"), ParentNode("ul", lis)])
+
+
+def measure(function, repeat=5):
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 40000]
+    print("rendering a page of N list items to a file (best of 5 wall time, tracemalloc peak)")
+    print("  to_html and write_html walk the tree with an explicit stack")
+    for items in sizes:
+        page = make_page(items)
+        assert concat_to_html(page) == recursive_to_html(page) == page.to_html()
+        with open(os.devnull, "w") as out:
+            runs = (
+                ("recursive +=", lambda: out.write(concat_to_html(page))),
+                ("recursive join", lambda: out.write(recursive_to_html(page))),
+                ("to_html", lambda: out.write(page.to_html())),
+                ("write_html", lambda: page.write_html(out)),
+            )
+            for name, function in runs:
+                elapsed, peak = measure(function)
+                print(f"  {items:>6} items  {name:<15} {elapsed * 1000:8.1f} ms   peak {peak / 1024 / 1024:7.2f} MiB")
+
+    depth = 50000
+    node = LeafNode(None, "deep")
+    for _ in range(depth):
+        node = ParentNode("blockquote", [node])
+    try:
+        recursive_to_html(node)
+        recursive = "ok"
+    except RecursionError:
+        recursive = "RecursionError"
+    elapsed, _ = measure(node.to_html)
+    print(f"  {depth} nested blockquotes: recursive {recursive}, to_html {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
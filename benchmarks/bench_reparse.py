@@ -0,0 +1,45 @@
+import sys
+import time
+
+from markdown_to_html import markdown_to_html_node, parse_document
+
+
+def make_document(blocks):
+    parts = ["# Handbook"]
+    for i in range(blocks - 1):
+        if i % 3 == 0:
+            parts.append(f"Paragraph {i} with **bold** text, _italics_ and a [link](/page/{i}).")
+        elif i % 3 == 1:
+            parts.append(f"- item {i}\n- item {i} with `code`\n- item {i} again")
+        else:
+            parts.append(f"## Section {i}")
+    return "\n\n".join(parts)
+
+
+def best_of(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    markdown = make_document(blocks)
+    edited = markdown.replace("Paragraph 2400 with", "Paragraph 2400, edited, with")
+    previous = parse_document(markdown)
+    result = parse_document(edited, previous)
+    assert result.node.to_html() == markdown_to_html_node(edited).to_html()
+
+    full = best_of(lambda: markdown_to_html_node(edited))
+    incremental = best_of(lambda: parse_document(edited, previous))
+    print(f"reparse after a one-paragraph edit, {blocks} blocks (best of 5)")
+    print(f"  full parse       : {full * 1000:8.2f} ms")
+    print(f"  incremental parse: {incremental * 1000:8.2f} ms  ({result.parsed} block reparsed)")
+    print(f"  speedup          : {full / incremental:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import sys
+import time
+import tracemalloc
+
+from bench_inline import make_paragraphs
+from text_processing import text_to_textnodes
+
+
+def parse_all(paragraphs, spans):
+    return [text_to_textnodes(text, spans=spans) for text in paragraphs]
+
+
+def measure(paragraphs, spans):
+    start = time.perf_counter()
+    parse_all(paragraphs, spans)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    nodes = parse_all(paragraphs, spans)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes
+    return elapsed, held
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    paragraphs = make_paragraphs(count)
+    for text in paragraphs:
+        assert text_to_textnodes(text, spans=True) == text_to_textnodes(text)
+
+    print(f"inline nodes held for {count} paragraphs (parse time, memory held by the node lists)")
+    for name, spans in (("substring nodes", False), ("span nodes", True)):
+        elapsed, held = measure(paragraphs, spans)
+        print(f"  {name:<16} {elapsed:7.3f}s   {held / 1024 / 1024:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
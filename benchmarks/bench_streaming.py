@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from markdown_to_html import markdown_to_html_node, write_markdown_file_as_html
+
+
+def write_changelog(path, megabytes):
+    entry = "## 1.0.{n}\n\n- Fixed **bug** number {n} in `module_{n}`\n- Added [docs](https://example.com/{n})\n\nSome prose about release {n} with _emphasis_.\n\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Changelog\n\n")
+        n = 0
+        while f.tell() < megabytes * 1024 * 1024:
+            f.write(entry.format(n=n))
+            n += 1
+
+
+def measure(function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    # Timed separately: tracing every allocation slows the run down several times.
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "changelog.md")
+        write_changelog(path, megabytes)
+
+        def whole():
+            with open(path, encoding="utf-8") as f, open(os.devnull, "w") as out:
+                out.write(markdown_to_html_node(f.read()).to_html())
+
+        def streaming():
+            with open(path, encoding="utf-8") as f, open(os.devnull, "w") as out:
+                write_markdown_file_as_html(f, out)
+
+        print(f"markdown to html, {megabytes} MiB changelog (wall time, tracemalloc peak)")
+        for name, function in (("whole document", whole), ("streaming blocks", streaming)):
+            elapsed, peak = measure(function)
+            print(f"  {name:<17} {elapsed:7.2f}s   peak {peak / 1024 / 1024:9.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
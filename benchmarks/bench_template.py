@@ -0,0 +1,53 @@
+import sys
+import time
+
+from template import compile_template
+
+SLOTS = ["Title", "Description", "Author", "Date", "Content"]
+
+
+def make_template(size):
+    # A layout of about `size` characters with each slot appearing twice.
+    filler = "<div class=\"wrapper\"><span>static layout text</span></div>\n"
+    pieces = []
+    for name in SLOTS * 2:
+        pieces.append(filler * (size // (len(filler) * len(SLOTS) * 2) + 1))
+        pieces.append(f"{{{{ {name} }}}}")
+    return "".join(pieces)
+
+
+def replace_render(text, values):
+    for name, value in values.items():
+        text = text.replace(f"{{{{ {name} }}}}", value)
+    return text
+
+
+def best(function, repeat=5):
+    best_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    content = "<p>" + "page body " * 2000 + "</p>"
+    values = {name: f"{name} value" for name in SLOTS}
+    values["Content"] = content
+    print(f"filling a template with {len(SLOTS)} slots, {pages} pages (best of 5)")
+    for size in (4 * 1024, 64 * 1024):
+        text = make_template(size)
+        compiled = compile_template(text)
+        assert compiled.render(values) == replace_render(text, values)
+        replace_time = best(lambda: [replace_render(text, values) for _ in range(pages)])
+        compiled_time = best(lambda: [compiled.render(values) for _ in range(pages)])
+        print(
+            f"  {len(text) // 1024:>3} KiB template  str.replace {replace_time * 1000:8.1f} ms"
+            f"  compiled {compiled_time * 1000:8.1f} ms  ({replace_time / compiled_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+from array import array
+
+from htmlnode import VOID_TAGS, HTMLNode, LeafNode, ParentNode
+from markdown_to_html import block_to_html_node
+from text_processing import markdown_to_blocks, scan_block
+
+NONE = -1
+
+
+class ArenaTree:
+    """An HTML tree stored as parallel arrays instead of one object per node.
+
+    Node i has a tag id (into tags, NONE for no tag), a parent, a first
+    child and a next sibling (indices, NONE when absent), a props id (into
+    props, NONE for no props) and, for leaves, a value span into text
+    (value_start NONE when the leaf has no value). Parents are marked in
+    is_parent. Build one with ArenaBuilder.
+    """
+
+    def __init__(self, tags, props, props_html, tag_ids, is_parent, parents, first_child, next_sibling,
+                 props_ids, value_start, value_end, text):
+        self.tags = tags
+        self.props = props
+        self.props_html = props_html
+        self.tag_ids = tag_ids
+        self.is_parent = is_parent
+        self.parents = parents
+        self.first_child = first_child
+        self.next_sibling = next_sibling
+        self.props_ids = props_ids
+        self.value_start = value_start
+        self.value_end = value_end
+        self.text = text
+
+    def __len__(self):
+        return len(self.tag_ids)
+
+    def __repr__(self):
+        return f"ArenaTree(nodes={len(self)}, tags={len(self.tags)}, props={len(self.props)}, text={len(self.text)})"
+
+    def children(self, index):
+        child = self.first_child[index]
+        while child != NONE:
+            yield child
+            child = self.next_sibling[child]
+
+    def _open(self, index):
+        tag = self.tags[self.tag_ids[index]] if self.tag_ids[index] != NONE else None
+        props_id = self.props_ids[index]
+        props_html = self.props_html[props_id] if props_id != NONE else ""
+        return tag, props_html
+
+    def iter_html(self, index=0, batch_size=1024):
+        """Yield the HTML of node index in chunks, exactly as its HTMLNode's to_html would render it."""
+        parts = []
+        emit = parts.append
+        stack = []
+        node = index
+        while True:
+            tag, props_html = self._open(node)
+            if self.is_parent[node]:
+                if tag is None:
+                    raise ValueError("All parent nodes must have a tag")
+                if self.first_child[node] == NONE:
+                    raise ValueError("All parent nodes must have children")
+                emit(f"<{tag}{props_html}>")
+                stack.append(node)
+                node = self.first_child[node]
+                continue
+
+            start = self.value_start[node]
+            if start == NONE:
+                raise ValueError("All leaf nodes must have a value")
+            value = self.text[start:self.value_end[node]]
+            if tag is None:
+                emit(value)
+            elif tag in VOID_TAGS:
+                emit(f"<{tag}{props_html}>")
+            else:
+                emit(f"<{tag}{props_html}>{value}</{tag}>")
+
+            # Climb to the next node in document order, closing finished parents.
+            while node != index:
+                sibling = self.next_sibling[node]
+                if sibling != NONE:
+                    node = sibling
+                    break
+                node = stack.pop()
+                emit(f"</{self.tags[self.tag_ids[node]]}>")
+                if len(parts) >= batch_size:
+                    yield "".join(parts)
+                    parts.clear()
+            else:
+                break
+        if parts:
+            yield "".join(parts)
+
+    def render(self, index=0):
+        return "".join(self.iter_html(index))
+
+    def to_node(self, index=0):
+        """Build the HTMLNode tree for node index, for code that needs objects."""
+        nodes = {}
+        order = [index]
+        for node in order:
+            if self.is_parent[node]:
+                order.extend(self.children(node))
+        for node in reversed(order):
+            tag, _ = self._open(node)
+            props_id = self.props_ids[node]
+            props = dict(self.props[props_id]) if props_id != NONE else None
+            if self.is_parent[node]:
+                children = [nodes.pop(child) for child in self.children(node)]
+                nodes[node] = ParentNode(tag, children, props)
+            else:
+                start = self.value_start[node]
+                value = self.text[start:self.value_end[node]] if start != NONE else None
+                nodes[node] = LeafNode(tag, value, props)
+        return nodes[index]
+
+
+class ArenaBuilder:
+    """Appends HTMLNode trees to a growing ArenaTree.
+
+    Add a root with add_parent, then feed it subtrees with add(node, root)
+    one at a time; each subtree's objects can be dropped as soon as it is
+    added.
+    """
+
+    def __init__(self):
+        self._tag_index = {}
+        self._props_index = {}
+        self.tags = []
+        self.props = []
+        self.props_html = []
+        self.tag_ids = array("i")
+        self.is_parent = array("b")
+        self.parents = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.props_ids = array("i")
+        self.value_start = array("q")
+        self.value_end = array("q")
+        self._last_child = array("i")
+        self._values = []
+        self._text_length = 0
+
+    def _tag_id(self, tag):
+        if tag is None:
+            return NONE
+        tag_id = self._tag_index.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_index[tag] = len(self.tags)
+            self.tags.append(tag)
+        return tag_id
+
+    def _props_id(self, props):
+        if not props:
+            return NONE
+        key = tuple(props.items())
+        props_id = self._props_index.get(key)
+        if props_id is None:
+            props_id = self._props_index[key] = len(self.props)
+            self.props.append(key)
+            self.props_html.append(HTMLNode(props=props).props_to_html())
+        return props_id
+
+    def _append(self, tag, parent, is_parent, props_id, value):
+        index = len(self.tag_ids)
+        self.tag_ids.append(self._tag_id(tag))
+        self.is_parent.append(1 if is_parent else 0)
+        self.parents.append(parent)
+        self.first_child.append(NONE)
+        self.next_sibling.append(NONE)
+        self._last_child.append(NONE)
+        self.props_ids.append(props_id)
+        if value is None:
+            self.value_start.append(NONE)
+            self.value_end.append(NONE)
+        else:
+            self.value_start.append(self._text_length)
+            self._text_length += len(value)
+            self.value_end.append(self._text_length)
+            self._values.append(value)
+        if parent != NONE:
+            last = self._last_child[parent]
+            if last == NONE:
+                self.first_child[parent] = index
+            else:
+                self.next_sibling[last] = index
+            self._last_child[parent] = index
+        return index
+
+    def add_parent(self, tag, props=None, parent=NONE):
+        """Append an empty parent element and return its index."""
+        return self._append(tag, parent, True, self._props_id(props), None)
+
+    def add(self, node, parent=NONE):
+        """Append node's whole tree under parent and return node's index."""
+        root = NONE
+        stack = [(node, parent)]
+        while stack:
+            item, item_parent = stack.pop()
+            if isinstance(item, ParentNode) and type(item).to_html is ParentNode.to_html:
+                index = self._append(item.tag, item_parent, True, self._props_id(item.props), None)
+                stack.extend((child, index) for child in reversed(item.children or ()))
+            elif isinstance(item, LeafNode) and type(item).to_html is LeafNode.to_html:
+                index = self._append(item.tag, item_parent, False, self._props_id(item.props), item.value)
+            else:
+                # A node with its own to_html is kept as the raw HTML it renders.
+                index = self._append(None, item_parent, False, NONE, item.to_html())
+            if root == NONE:
+                root = index
+        return root
+
+    def build(self):
+        return ArenaTree(
+            self.tags,
+            self.props,
+            self.props_html,
+            self.tag_ids,
+            self.is_parent,
+            self.parents,
+            self.first_child,
+            self.next_sibling,
+            self.props_ids,
+            self.value_start,
+            self.value_end,
+            "".join(self._values),
+        )
+
+
+def markdown_to_arena(markdown):
+    """Parse markdown straight into an ArenaTree, one block's nodes at a time.
+
+    Renders the same HTML as markdown_to_html_node(markdown).to_html(), but
+    never holds more than one block's HTMLNode objects.
+    """
+    builder = ArenaBuilder()
+    root = builder.add_parent("div")
+    for block in markdown_to_blocks(markdown):
+        builder.add(block_to_html_node(scan_block(block)), root)
+    return builder.build()
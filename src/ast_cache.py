@@ -0,0 +1,129 @@
+import hashlib
+import marshal
+import os
+import shutil
+
+from htmlnode import LeafNode, ParentNode
+from markdown_to_html import PARSER_VERSION
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+VERSION_FILE = "VERSION"
+
+_LEAF = 0
+_PARENT = 1
+
+
+def encode_node(node):
+    if isinstance(node, ParentNode):
+        return (_PARENT, node.tag, node.props, tuple(encode_node(child) for child in node.children))
+    return (_LEAF, node.tag, node.value, node.props)
+
+
+def decode_node(data):
+    if data[0] == _PARENT:
+        return ParentNode(data[1], [decode_node(child) for child in data[3]], data[2])
+    return LeafNode(data[1], data[2], data[3])
+
+
+def content_key(markdown):
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+class ASTCache:
+    """On-disk cache of parsed markdown trees, keyed by source content hash.
+
+    Trees are stored as marshal-encoded tuples, one file per document. A
+    hit bumps the entry's mtime, and prune() evicts least recently used
+    entries until the cache fits in max_bytes. The whole cache is dropped
+    when PARSER_VERSION changes.
+
+    get() and put() are safe to call from several processes at once;
+    prune() should run once the build is done.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._check_version()
+
+    def _check_version(self):
+        version_path = os.path.join(self.path, VERSION_FILE)
+        try:
+            with open(version_path, "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            version = None
+        if version == PARSER_VERSION:
+            return
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.makedirs(self.path, exist_ok=True)
+        with open(version_path, "w", encoding="utf-8") as f:
+            f.write(PARSER_VERSION)
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key[:2], key[2:])
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = marshal.load(f)
+            node = decode_node(data)
+        except FileNotFoundError:
+            return None
+        except (EOFError, ValueError, TypeError, IndexError):
+            # A torn or foreign file; drop it and reparse.
+            self._discard(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return node
+
+    def put(self, key, node):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(encode_node(node), f)
+        os.replace(tmp_path, path)
+
+    def _discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits. Returns the count."""
+        entries = []
+        total = 0
+        for bucket in os.scandir(self.path):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+        entries.sort()
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+            evicted += 1
+        return evicted
+
+
+def parse_cached(markdown, cache, parse):
+    if cache is None:
+        return parse(markdown)
+    key = content_key(markdown)
+    node = cache.get(key)
+    if node is None:
+        node = parse(markdown)
+        cache.put(key, node)
+    return node
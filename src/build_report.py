@@ -0,0 +1,180 @@
+from contextlib import contextmanager, nullcontext
+import json
+import time
+
+PAGE_STAGES = ["read", "blocks", "inline", "tree", "to_html", "minify", "write"]
+# Stages timed around others: {stage: (reported as, stages timed inside it)}.
+# Whatever time the inner stages don't cover is tree construction on the tree
+# path ("parse"), and writing block HTML on the direct path ("render").
+ENCLOSING_STAGES = {
+    "parse": ("tree", ["blocks", "inline"]),
+    "render": ("to_html", ["inline"]),
+}
+
+
+class StageTimer:
+    """Accumulates wall and CPU seconds per named stage."""
+
+    def __init__(self):
+        self.stages = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.minified = None
+
+    def add(self, stage, wall, cpu):
+        totals = self.stages.setdefault(stage, [0.0, 0.0])
+        totals[0] += wall
+        totals[1] += cpu
+
+    def count_io(self, bytes_read, bytes_written):
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+
+    def count_minified(self, bytes_in, bytes_out):
+        if self.minified is None:
+            self.minified = {"bytes_in": 0, "bytes_out": 0}
+        self.minified["bytes_in"] += bytes_in
+        self.minified["bytes_out"] += bytes_out
+
+    @contextmanager
+    def stage(self, name):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+    def wrap(self, name, function):
+        def timed(*args, **kwargs):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+        return timed
+
+    def as_dict(self):
+        stages = {name: list(totals) for name, totals in self.stages.items()}
+        for enclosing, (residual, inner) in ENCLOSING_STAGES.items():
+            if enclosing not in stages:
+                continue
+            outer_wall, outer_cpu = stages.pop(enclosing)
+            for name in inner:
+                wall, cpu = stages.get(name, (0.0, 0.0))
+                outer_wall -= wall
+                outer_cpu -= cpu
+            stages[residual] = [max(outer_wall, 0.0), max(outer_cpu, 0.0)]
+        stats = {"stages": stages, "bytes_read": self.bytes_read, "bytes_written": self.bytes_written}
+        if self.minified is not None:
+            stats["minify"] = dict(self.minified)
+        return stats
+
+
+class _NullTimer:
+    def stage(self, name):
+        return nullcontext()
+
+    def count_io(self, bytes_read, bytes_written):
+        pass
+
+    def count_minified(self, bytes_in, bytes_out):
+        pass
+
+    def wrap(self, name, function):
+        return function
+
+
+NULL_TIMER = _NullTimer()
+
+
+class BuildReport:
+    def __init__(self):
+        self.totals = StageTimer()
+        self.pages = []
+        self.wall = 0.0
+        self.inline_cache = None
+
+    def add_page(self, page, stats):
+        wall = sum(times[0] for times in stats["stages"].values())
+        cpu = sum(times[1] for times in stats["stages"].values())
+        self.pages.append({"page": page, "wall": wall, "cpu": cpu, **stats})
+        for name, (stage_wall, stage_cpu) in stats["stages"].items():
+            self.totals.add(name, stage_wall, stage_cpu)
+        self.totals.bytes_read += stats["bytes_read"]
+        self.totals.bytes_written += stats["bytes_written"]
+        if "inline_cache" in stats:
+            if self.inline_cache is None:
+                self.inline_cache = {"hits": 0, "misses": 0, "evictions": 0}
+            for name, count in stats["inline_cache"].items():
+                self.inline_cache[name] += count
+        if "minify" in stats:
+            self.totals.count_minified(stats["minify"]["bytes_in"], stats["minify"]["bytes_out"])
+
+    def slowest(self, top_n):
+        return sorted(self.pages, key=lambda page: (-page["wall"], page["page"]))[:top_n]
+
+    def minify_summary(self):
+        """Bytes in and out of the minifier, bytes saved and throughput over its stage time."""
+        counts = self.totals.minified
+        if counts is None:
+            return None
+        saved = counts["bytes_in"] - counts["bytes_out"]
+        wall = self.totals.stages.get("minify", (0.0, 0.0))[0]
+        return {
+            "bytes_in": counts["bytes_in"],
+            "bytes_out": counts["bytes_out"],
+            "bytes_saved": saved,
+            "saved_percent": saved / counts["bytes_in"] * 100 if counts["bytes_in"] else 0.0,
+            "mb_per_s": counts["bytes_in"] / wall / 1e6 if wall else 0.0,
+        }
+
+    def as_dict(self, top_n=10):
+        return {
+            "wall": self.wall,
+            "pages": len(self.pages),
+            "stages": {name: {"wall": wall, "cpu": cpu} for name, (wall, cpu) in self.totals.stages.items()},
+            "bytes_read": self.totals.bytes_read,
+            "bytes_written": self.totals.bytes_written,
+            "inline_cache": self.inline_cache,
+            "minify": self.minify_summary(),
+            "slowest": self.slowest(top_n),
+            "all_pages": self.pages,
+        }
+
+    def format(self, top_n=10):
+        lines = [f"Build report: {len(self.pages)} pages rendered in {self.wall:.3f}s"]
+        lines.append("  stage totals, summed over all workers:")
+        lines.append(f"  {'stage':<12}{'wall (s)':>12}{'cpu (s)':>12}")
+        names = [name for name in PAGE_STAGES if name in self.totals.stages]
+        names += sorted(name for name in self.totals.stages if name not in PAGE_STAGES)
+        for name in names:
+            wall, cpu = self.totals.stages[name]
+            lines.append(f"  {name:<12}{wall:>12.4f}{cpu:>12.4f}")
+        lines.append(f"  bytes read: {self.totals.bytes_read}, bytes written: {self.totals.bytes_written}")
+        if self.inline_cache is not None:
+            counts = self.inline_cache
+            lookups = counts["hits"] + counts["misses"]
+            rate = counts["hits"] / lookups * 100 if lookups else 0.0
+            lines.append(
+                f"  inline cache: {counts['hits']} hits, {counts['misses']} misses ({rate:.1f}% hit rate), "
+                f"{counts['evictions']} evictions"
+            )
+        minified = self.minify_summary()
+        if minified is not None:
+            lines.append(
+                f"  minify: {minified['bytes_in']} -> {minified['bytes_out']} bytes, saved {minified['bytes_saved']} "
+                f"({minified['saved_percent']:.1f}%) at {minified['mb_per_s']:.1f} MB/s"
+            )
+        slowest = self.slowest(top_n)
+        if slowest:
+            lines.append(f"  slowest {len(slowest)} pages:")
+            for page in slowest:
+                lines.append(f"    {page['wall'] * 1000:>10.2f} ms  {page['page']}")
+        return "\n".join(lines)
+
+    def write_json(self, path, top_n=10):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(top_n), f, indent=1)
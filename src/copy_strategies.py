@@ -0,0 +1,170 @@
+import errno
+import fcntl
+import os
+import shutil
+import threading
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Errors that mean "this mechanism is not available here", as opposed to a
+# real failure of this particular file.
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EMLINK,
+}
+# link(2) also answers EPERM for filesystems without hard links. Elsewhere
+# EPERM is a real permission error and is raised.
+HARDLINK_UNSUPPORTED_ERRNOS = UNSUPPORTED_ERRNOS | {errno.EPERM}
+
+
+def _remove_target(target):
+    # Never write through an existing target: it may be a hardlink to the
+    # source, and truncating it would empty the source as well.
+    if os.path.lexists(target):
+        os.remove(target)
+
+
+def copy_hardlink(source, target):
+    _remove_target(target)
+    os.link(source, target)
+
+
+def copy_regular(source, target):
+    _remove_target(target)
+    shutil.copy(source, target)
+
+
+def _copy_with(transfer, source, target):
+    _remove_target(target)
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            transfer(src.fileno(), dst.fileno(), os.fstat(src.fileno()).st_size)
+    except OSError:
+        # Don't leave a truncated file behind for the next strategy to skip over.
+        if os.path.exists(target):
+            os.remove(target)
+        raise
+    shutil.copymode(source, target)
+
+
+def _reflink(src_fd, dst_fd, size):
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd, dst_fd, size):
+    while size > 0:
+        sent = os.copy_file_range(src_fd, dst_fd, size)
+        if sent == 0:
+            break
+        size -= sent
+
+
+def _sendfile(src_fd, dst_fd, size):
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def copy_reflink(source, target):
+    _copy_with(_reflink, source, target)
+
+
+def copy_file_range(source, target):
+    _copy_with(_copy_file_range, source, target)
+
+
+def copy_sendfile(source, target):
+    _copy_with(_sendfile, source, target)
+
+
+STRATEGIES = {
+    "hardlink": copy_hardlink,
+    "reflink": copy_reflink,
+    "copy_file_range": copy_file_range,
+    "sendfile": copy_sendfile,
+    "copy": copy_regular,
+}
+
+if not hasattr(os, "copy_file_range"):
+    del STRATEGIES["copy_file_range"]
+if not hasattr(os, "sendfile"):
+    del STRATEGIES["sendfile"]
+
+STRATEGY_NAMES = ["auto"] + list(STRATEGIES)
+
+
+class AutoCopier:
+    """Copy function that picks the cheapest mechanism that works.
+
+    Candidates are tried cheapest first; the first copy acts as the probe.
+    When a mechanism fails with an "unsupported" errno it is dropped for the
+    rest of the run and the same file is retried with the next one, so a
+    whole tree settles on one strategy after at most a few attempts. With
+    hardlink=False, hardlinks are never tried.
+    """
+
+    def __init__(self, source_dir, target_dir, hardlink=True):
+        self.candidates = list(STRATEGIES)
+        if not hardlink or not _same_filesystem(source_dir, target_dir):
+            self.candidates.remove("hardlink")
+        self._lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.candidates[0]
+
+    def __call__(self, source, target):
+        while True:
+            name = self.candidates[0]
+            try:
+                return STRATEGIES[name](source, target)
+            except OSError as e:
+                unsupported = HARDLINK_UNSUPPORTED_ERRNOS if name == "hardlink" else UNSUPPORTED_ERRNOS
+                if name == "copy" or e.errno not in unsupported:
+                    raise
+                self._demote(name)
+
+    def _demote(self, name):
+        with self._lock:
+            if self.candidates[0] == name:
+                self.candidates.pop(0)
+
+
+def _same_filesystem(source_dir, target_dir):
+    probe = target_dir
+    while not os.path.exists(probe):
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            return False
+        probe = parent
+    return os.stat(source_dir).st_dev == os.stat(probe).st_dev
+
+
+def get_copy_function(strategy, source_dir, target_dir, hardlink=True):
+    """Return the copy function for strategy.
+
+    With hardlink=False the copies must not share an inode with their
+    sources, so "hardlink" falls back to the best of the other mechanisms.
+    """
+    if strategy == "auto" or (strategy == "hardlink" and not hardlink):
+        return AutoCopier(source_dir, target_dir, hardlink)
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown copy strategy: {strategy}")
+    return STRATEGIES[strategy]
+
+
+def strategy_name(copy_function):
+    if isinstance(copy_function, AutoCopier):
+        return copy_function.name
+    for name, function in STRATEGIES.items():
+        if function is copy_function:
+            return name
+    return getattr(copy_function, "__name__", "custom")
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
+import re
+
+from copy_strategies import get_copy_function
+from htmlnode import ParentNode
+from output_writer import copy_atomic
+from static_files import (
+    DEFAULT_WORKERS,
+    CopyError,
+    CopyResult,
+    copy_files,
+    hash_file,
+    load_manifest,
+    save_manifest,
+    walk_files,
+)
+from template import CompiledTemplate
+
+FINGERPRINT_LENGTH = 8
+MANIFEST_NAME = "asset-manifest.json"
+# A start tag in template markup, and a quoted src or href attribute in one.
+TAG_PATTERN = re.compile(r"""<([A-Za-z][A-Za-z0-9-]*)(?:[^>"']|"[^"]*"|'[^']*')*>""")
+URL_ATTRIBUTE_PATTERN = re.compile(r"""(\s(src|href)\s*=\s*)(?:"([^"]*)"|'([^']*)')""", re.IGNORECASE)
+
+
+def fingerprinted_name(rel_path, digest):
+    base, ext = os.path.splitext(rel_path)
+    return f"{base}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def hash_files(root, rel_paths, cache, workers=DEFAULT_WORKERS):
+    """Return {rel_path: sha256} for rel_paths, updating cache in place.
+
+    cache maps rel_path to {"size", "mtime", "hash"}; a file whose size and
+    mtime match its cache entry is not read again.
+    """
+    digests = {}
+    stale = []
+    for rel_path in rel_paths:
+        st = os.stat(os.path.join(root, rel_path))
+        entry = cache.get(rel_path)
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns:
+            digests[rel_path] = entry["hash"]
+        else:
+            stale.append((rel_path, st))
+
+    paths = [os.path.join(root, rel_path) for rel_path, _ in stale]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        fresh = list(executor.map(hash_file, paths))
+
+    for (rel_path, st), digest in zip(stale, fresh):
+        cache[rel_path] = {"size": st.st_size, "mtime": st.st_mtime_ns, "hash": digest}
+        digests[rel_path] = digest
+
+    for rel_path in list(cache):
+        if rel_path not in digests:
+            del cache[rel_path]
+    return digests
+
+
+def fingerprint_static(dir, workers=DEFAULT_WORKERS, strategy="auto"):
+    """Publish static/ files as name.<hash>.ext next to the originals in public/.
+
+    Writes public/asset-manifest.json mapping each original path to its
+    fingerprinted path, and removes fingerprinted files the previous
+    manifest produced that are no longer current.
+    """
+    source_dir = os.path.join(dir, "static")
+    target_dir = os.path.join(dir, "public")
+    cache_path = os.path.join(dir, ".cache", "asset-hashes.json")
+    manifest_path = os.path.join(target_dir, MANIFEST_NAME)
+
+    cache = load_manifest(cache_path)
+    previous = load_manifest(manifest_path)
+    digests = hash_files(source_dir, walk_files(source_dir), cache, workers)
+    manifest = {rel_path: fingerprinted_name(rel_path, digest) for rel_path, digest in sorted(digests.items())}
+
+    to_copy = []
+    for rel_path, hashed_path in manifest.items():
+        source_path = os.path.join(source_dir, rel_path)
+        target_path = os.path.join(target_dir, hashed_path)
+        # The name is content-addressed, so an existing file is already right,
+        # unless it is a hardlink an older build left, which editing the
+        # source in place would change.
+        if not os.path.exists(target_path) or os.path.samefile(source_path, target_path):
+            to_copy.append((hashed_path, source_path, target_path))
+    for parent in sorted({os.path.dirname(target_path) for _, _, target_path in to_copy}):
+        os.makedirs(parent, exist_ok=True)
+    # Never hardlinked: the published bytes must stay those the name hashes.
+    copy_function = get_copy_function(strategy, source_dir, target_dir, hardlink=False)
+    result = CopyResult()
+    # Copied under a temporary name first: a half-written file here would
+    # pass the exists check above on every later run.
+    result.errors = copy_files(to_copy, workers, partial(copy_atomic, copy_function=copy_function))
+    if result.errors:
+        raise CopyError(result)
+
+    current = set(manifest.values())
+    for hashed_path in previous.values():
+        if hashed_path not in current:
+            stale_path = os.path.join(target_dir, hashed_path)
+            if os.path.isfile(stale_path):
+                os.remove(stale_path)
+
+    save_manifest(cache_path, cache)
+    save_manifest(manifest_path, manifest)
+    return manifest
+
+
+def load_asset_manifest(public_dir):
+    return load_manifest(os.path.join(public_dir, MANIFEST_NAME))
+
+
+def asset_url(url, manifest):
+    """Map a site-relative URL through the manifest, leaving others alone."""
+    if not manifest or "://" in url or url.startswith(("data:", "//", "#")):
+        return url
+    path, sep, suffix = url.partition("?")
+    if not sep:
+        path, sep, suffix = url.partition("#")
+    prefix = ""
+    if path.startswith("/"):
+        prefix = "/"
+    elif path.startswith("./"):
+        prefix = "./"
+    hashed = manifest.get(path[len(prefix):])
+    if hashed is None:
+        return url
+    return prefix + hashed + sep + suffix
+
+
+def rewrite_asset_urls(node, manifest):
+    """Point every <img src> in the tree at its fingerprinted file."""
+    if not manifest:
+        return node
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ParentNode):
+            stack.extend(current.children or ())
+        elif current.tag == "img" and current.props and "src" in current.props:
+            current.props["src"] = asset_url(current.props["src"], manifest)
+    return node
+
+
+def _rewrite_tag(match, manifest):
+    # Like rewrite_asset_urls, links to pages (<a href>) are left alone;
+    # stylesheets (<link href>) and src attributes are rewritten.
+    is_link = match.group(1).lower() == "link"
+
+    def rewrite(attribute):
+        if attribute.group(2).lower() == "href" and not is_link:
+            return attribute.group(0)
+        if attribute.group(3) is not None:
+            return f'{attribute.group(1)}"{asset_url(attribute.group(3), manifest)}"'
+        return f"{attribute.group(1)}'{asset_url(attribute.group(4), manifest)}'"
+
+    return URL_ATTRIBUTE_PATTERN.sub(rewrite, match.group(0))
+
+
+def rewrite_template_asset_urls(template, manifest):
+    """Return a copy of a CompiledTemplate whose asset URLs point at fingerprinted files.
+
+    src attributes and <link href> in the template's own markup are
+    rewritten; slot values are left to rewrite_asset_urls.
+    """
+    if not manifest:
+        return template
+    chunks = [TAG_PATTERN.sub(lambda match: _rewrite_tag(match, manifest), chunk) for chunk in template.chunks]
+    return CompiledTemplate(chunks, template.slots, template.placeholders, template.dependencies, template.hashes)
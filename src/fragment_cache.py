@@ -0,0 +1,73 @@
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 4096
+# Total characters of HTML kept, across all fragments.
+DEFAULT_MAX_CHARS = 16 * 1024 * 1024
+# A subtree of a few nodes renders faster than it can be looked up and
+# recorded, so only larger ones are cached.
+DEFAULT_MIN_NODES = 8
+
+
+class FragmentCache:
+    """In-memory LRU memo of rendered HTML, keyed by frozen subtree.
+
+    Entries are keyed by a FrozenParentNode's structural hash, computed once
+    when the node is built, so an equal subtree from another page finds the
+    HTML rendered for the first one. Hashes can collide, so a hit is only
+    taken when the stored node equals the one looked up; that comparison
+    stops at the first shared child object. The cache is bounded both by
+    entry count and by the total length of the stored HTML. Subtrees of
+    fewer than min_nodes nodes are rendered as usual.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_chars=DEFAULT_MAX_CHARS, min_nodes=DEFAULT_MIN_NODES):
+        if max_entries < 1:
+            raise ValueError("Fragment cache needs room for at least one entry")
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.min_nodes = min_nodes
+        self.entries = OrderedDict()
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, node):
+        key = hash(node)
+        entry = self.entries.get(key)
+        if entry is None or (entry[0] is not node and entry[0] != node):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, node, html):
+        if len(html) > self.max_chars:
+            return
+        key = hash(node)
+        # A colliding subtree replaces the one stored under its hash.
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.chars -= len(previous[1])
+        self.entries[key] = (node, html)
+        self.chars += len(html)
+        while len(self.entries) > self.max_entries or self.chars > self.max_chars:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.chars -= len(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "chars": self.chars,
+        }
+
+    def __repr__(self):
+        return (
+            f"FragmentCache(entries={len(self.entries)}/{self.max_entries}, chars={self.chars}/{self.max_chars}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
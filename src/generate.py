@@ -0,0 +1,278 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import hashlib
+import json
+import os
+
+from ast_cache import parse_cached
+from build_report import NULL_TIMER, StageTimer
+from fingerprint import hash_files, rewrite_asset_urls, rewrite_template_asset_urls
+from inline_cache import InlineCache
+from markdown_to_html import (
+    PARSER_VERSION,
+    get_inline_cache,
+    markdown_to_html,
+    markdown_to_html_node,
+    set_inline_cache,
+)
+from minify import MINIFIER_VERSION, HTMLMinifier, iter_minified
+from output_writer import write_if_changed
+from static_files import load_manifest, remove_empty_parents, save_manifest
+from template import compile_template, load_compiled_template
+
+GRAPH_VERSION = 2
+ASSET_MANIFEST_INPUT = "<asset-manifest>"
+MINIFY_INPUT = "<minify>"
+PARSER_INPUT = "<parser>"
+
+
+class GenerateResult:
+    def __init__(self):
+        self.generated = []
+        self.skipped = []
+        # Rendered pages whose output was already on disk byte for byte.
+        self.unchanged = []
+        self.removed = []
+        self.errors = []
+        self.page_stats = []
+
+    def __repr__(self):
+        return (
+            f"GenerateResult(generated={len(self.generated)}, skipped={len(self.skipped)}, "
+            f"unchanged={len(self.unchanged)}, removed={len(self.removed)}, errors={len(self.errors)})"
+        )
+
+
+def extract_title(markdown):
+    for line in markdown.split("\n"):
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise ValueError("No h1 header found in markdown")
+
+
+def render_page(markdown, template, asset_manifest=None, ast_cache=None, timer=NULL_TIMER):
+    """Render a page into template, a CompiledTemplate or template text."""
+    if isinstance(template, str):
+        template = compile_template(template)
+    template = rewrite_template_asset_urls(template, asset_manifest)
+    return template.render(page_values(markdown, asset_manifest, ast_cache, timer))
+
+
+def page_values(markdown, asset_manifest=None, ast_cache=None, timer=NULL_TIMER):
+    """Return the template values for a page: its Title and rendered Content."""
+    if not asset_manifest:
+        # No URLs to rewrite, so nothing needs the tree: go straight from
+        # markdown to HTML. An ASTCache has nothing to serve here, since
+        # loading and rendering a cached tree is slower than this path, so
+        # it is left alone; the inline cache is used by both.
+        content = markdown_to_html(markdown, None if timer is NULL_TIMER else timer)
+        return {"Title": extract_title(markdown), "Content": content}
+    parse = markdown_to_html_node
+    if timer is not NULL_TIMER:
+        parse = timer.wrap("parse", partial(markdown_to_html_node, timer=timer))
+    node = parse_cached(markdown, ast_cache, parse)
+    rewrite_asset_urls(node, asset_manifest)
+    title = extract_title(markdown)
+    with timer.stage("to_html"):
+        content = node.to_html()
+    return {"Title": title, "Content": content}
+
+
+def generate_page(
+    source_path, dest_path, template, asset_manifest=None, ast_cache=None, timer=NULL_TIMER, minify=False
+):
+    """Render source_path into dest_path; returns False if dest_path already held the same page."""
+    if isinstance(template, str):
+        template = compile_template(template)
+    with timer.stage("read"):
+        with open(source_path, "rb") as f:
+            data = f.read()
+        markdown = data.decode("utf-8")
+    chunks = template.iter_chunks(page_values(markdown, asset_manifest, ast_cache, timer))
+    minifier = None
+    if minify:
+        minifier = HTMLMinifier()
+        with timer.stage("minify"):
+            html = "".join(iter_minified(chunks, minifier))
+    else:
+        html = "".join(chunks)
+    with timer.stage("write"):
+        output = html.encode("utf-8")
+        written = write_if_changed(dest_path, output)
+    timer.count_io(len(data), len(output))
+    if minifier is not None:
+        # The minifier only removes ASCII, so characters saved are bytes saved.
+        saved = minifier.chars_in - minifier.chars_out
+        timer.count_minified(len(output) + saved, len(output))
+    return written
+
+
+def find_pages(content_dir):
+    """Return sorted (rel_source, rel_dest) pairs for every .md file."""
+    pages = []
+    for current, _, names in os.walk(content_dir):
+        for name in names:
+            if not name.endswith(".md"):
+                continue
+            path = os.path.join(current, name)
+            rel_source = os.path.relpath(path, content_dir).replace(os.sep, "/")
+            pages.append((rel_source, rel_source[: -len(".md")] + ".html"))
+    pages.sort()
+    return pages
+
+
+def _generate_job(job, template, asset_manifest, ast_cache, report, minify=False):
+    rel_source, source_path, dest_path = job
+    timer = StageTimer() if report else NULL_TIMER
+    inline_cache = get_inline_cache()
+    before = inline_cache.stats() if report and inline_cache is not None else None
+    try:
+        written = generate_page(source_path, dest_path, template, asset_manifest, ast_cache, timer, minify)
+    except Exception as e:
+        return rel_source, f"{type(e).__name__}: {e}", None, False
+    if not report:
+        return rel_source, None, None, written
+    stats = timer.as_dict()
+    if before is not None:
+        after = inline_cache.stats()
+        stats["inline_cache"] = {name: after[name] - before[name] for name in ("hits", "misses", "evictions")}
+    return rel_source, None, stats, written
+
+
+def _init_worker(inline_cache_size):
+    if inline_cache_size > 0:
+        set_inline_cache(InlineCache(inline_cache_size))
+
+
+def _manifest_digest(asset_manifest):
+    data = json.dumps(asset_manifest, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _remove_output(dest_dir, rel_dest):
+    path = os.path.join(dest_dir, rel_dest)
+    if os.path.isfile(path):
+        os.remove(path)
+    remove_empty_parents(path, dest_dir)
+
+
+def generate_pages(
+    content_dir,
+    template_path,
+    dest_dir,
+    workers=None,
+    asset_manifest=None,
+    graph_path=None,
+    ast_cache=None,
+    report=False,
+    inline_cache_size=0,
+    minify=False,
+):
+    """Render every markdown file under content_dir into dest_dir.
+
+    Pages are rendered over a process pool of `workers` processes (default:
+    one per CPU); workers=1 renders in this process. Every page is rendered
+    independently, so the output is the same for any worker count. A page
+    that fails is recorded in the result's errors and does not stop the
+    others.
+
+    With graph_path, the build graph from the previous run is used to skip
+    pages whose inputs (source, template, partials, asset manifest and
+    PARSER_VERSION) are unchanged and whose output still exists, and to
+    delete the outputs of sources that no longer exist. Pages are written
+    straight from markdown to HTML unless the tree is needed to rewrite
+    asset URLs; then an ASTCache supplies parsed trees of unchanged
+    markdown. With inline_cache_size, each worker keeps an InlineCache of
+    that many entries for the whole run, so inline text repeated across
+    pages is parsed once per worker. With minify, pages are passed through
+    HTMLMinifier before they are written. A rendered page identical to the
+    file already at its output path is not rewritten, and is listed in the
+    result's unchanged as well as generated; changed pages are replaced
+    atomically. With report, every rendered page's per-stage timings and
+    byte counts are collected in the result's page_stats.
+    """
+    template = rewrite_template_asset_urls(load_compiled_template(template_path), asset_manifest)
+
+    shared_inputs = {os.path.abspath(path): digest for path, digest in template.hashes.items()}
+    shared_inputs[PARSER_INPUT] = PARSER_VERSION
+    if asset_manifest:
+        shared_inputs[ASSET_MANIFEST_INPUT] = _manifest_digest(asset_manifest)
+    if minify:
+        shared_inputs[MINIFY_INPUT] = MINIFIER_VERSION
+
+    graph = load_manifest(graph_path) if graph_path else {}
+    if graph.get("version") != GRAPH_VERSION:
+        graph = {}
+    old_pages = graph.get("pages", {})
+    source_cache = graph.get("sources", {})
+
+    pages = find_pages(content_dir)
+    source_hashes = hash_files(content_dir, [rel_source for rel_source, _ in pages], source_cache)
+
+    result = GenerateResult()
+    new_pages = {}
+    jobs = []
+    for rel_source, rel_dest in pages:
+        inputs = dict(shared_inputs)
+        inputs[os.path.abspath(os.path.join(content_dir, rel_source))] = source_hashes[rel_source]
+        entry = {"output": rel_dest, "inputs": inputs}
+        dest_path = os.path.join(dest_dir, rel_dest)
+        if old_pages.get(rel_source) == entry and os.path.isfile(dest_path):
+            new_pages[rel_source] = entry
+            result.skipped.append(rel_source)
+            continue
+        new_pages[rel_source] = entry
+        jobs.append((rel_source, os.path.join(content_dir, rel_source), dest_path))
+
+    for rel_source, entry in sorted(old_pages.items()):
+        if rel_source not in new_pages:
+            _remove_output(dest_dir, entry["output"])
+            result.removed.append(rel_source)
+    for parent in sorted({os.path.dirname(dest_path) for _, _, dest_path in jobs}):
+        os.makedirs(parent, exist_ok=True)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    run_job = partial(
+        _generate_job,
+        template=template,
+        asset_manifest=asset_manifest,
+        ast_cache=ast_cache,
+        report=report,
+        minify=minify,
+    )
+
+    if workers == 1:
+        previous = get_inline_cache()
+        _init_worker(inline_cache_size)
+        try:
+            outcomes = [run_job(job) for job in jobs]
+        finally:
+            set_inline_cache(previous)
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(inline_cache_size,)
+        ) as executor:
+            outcomes = list(executor.map(run_job, jobs, chunksize=chunksize))
+
+    for rel_source, error, stats, written in outcomes:
+        if error is None:
+            result.generated.append(rel_source)
+            if not written:
+                result.unchanged.append(rel_source)
+            if stats is not None:
+                result.page_stats.append((rel_source, stats))
+        else:
+            # No inputs, so the next build retries the page, but the output
+            # is still recorded: an earlier build may have left one there,
+            # to be removed if the source goes away.
+            new_pages[rel_source] = {"output": new_pages[rel_source]["output"], "inputs": {}}
+            result.errors.append((rel_source, error))
+
+    if ast_cache is not None:
+        ast_cache.prune()
+    if graph_path:
+        save_manifest(graph_path, {"version": GRAPH_VERSION, "pages": new_pages, "sources": source_cache})
+    return result
@@ -1,8 +1,18 @@
 from enum import Enum
+from sys import intern
+from types import MappingProxyType
+from weakref import WeakValueDictionary
+
+WRITE_BUFFER_SIZE = 64 * 1024
+VOID_TAGS = frozenset(["img", "br", "hr", "input", "meta", "link"])
 
 class HTMLNode:
+    # Nodes are built by the million; slots keep each one small. Tags are
+    # interned so every "p" or "li" in a build is the same string object.
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None,value=None,children=None,props=None):
-        self.tag = tag
+        self.tag = intern(tag) if tag is not None else None
         self.value = value
         self.children = children
         self.props = props
@@ -10,6 +20,24 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
 
+    def iter_html(self):
+        """Yield the HTML of to_html() in chunks, without building the whole string."""
+        return iter_html_chunks(self)
+
+    def write_html(self, fp, buffer_size=WRITE_BUFFER_SIZE):
+        """Write the HTML of to_html() to the text file object fp, about buffer_size characters at a time."""
+        chunks = []
+        pending = 0
+        for chunk in self.iter_html():
+            chunks.append(chunk)
+            pending += len(chunk)
+            if pending >= buffer_size:
+                fp.write("".join(chunks))
+                chunks = []
+                pending = 0
+        if chunks:
+            fp.write("".join(chunks))
+
     def props_to_html(self):
         if self.props is None:
             return ""
@@ -24,6 +52,8 @@ class HTMLNode:
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
     
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):       
         super().__init__(tag=tag, value=value, children=None, props=props)
 
@@ -34,7 +64,7 @@ class LeafNode(HTMLNode):
         if self.tag is None:
             return self.value
 
-        if self.tag in ["img", "br", "hr", "input", "meta", "link"]:
+        if self.tag in VOID_TAGS:
             if self.props:
                 props_html = self.props_to_html()
                 return f"<{self.tag}{props_html}>"
@@ -51,6 +81,8 @@ class LeafNode(HTMLNode):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
     
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):  
         super().__init__(tag=tag, value=None, children=children, props=props)
         
@@ -61,15 +93,273 @@ class ParentNode(HTMLNode):
         if self.children is None or len(self.children) == 0:
             raise ValueError("All parent nodes must have children")
         
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
-        
-        if self.props:
-            props_html = self.props_to_html()
-            return f"<{self.tag}{props_html}>{children_html}</{self.tag}>"
-        else:
-            return f"<{self.tag}>{children_html}</{self.tag}>"
+        return "".join(iter_html_chunks(self, as_parent=True))
     
     def __repr__(self):
-        return f"ParentNode({self.tag}, {self.children}, {self.props})"
\ No newline at end of file
+        return f"ParentNode({self.tag}, {self.children}, {self.props})"
+
+
+def _props_key(props):
+    return tuple(props.items()) if props else None
+
+class _Frozen:
+    """Mixin for nodes that cannot be changed once built and hash by structure."""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        # Attributes can be set while __init__ runs, until the hash is stored.
+        if hasattr(self, "_hash"):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        # Compared with a stack rather than recursion; identical objects and
+        # differing hashes settle each pair without looking inside.
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                continue
+            if type(a) is not type(b) or a._hash != b._hash:
+                return False
+            # 1 == True, but they render differently.
+            if a.tag != b.tag or type(a.value) is not type(b.value) or a.value != b.value:
+                return False
+            if _props_key(a.props) != _props_key(b.props):
+                return False
+            if a.children is None or b.children is None:
+                if a.children is not b.children:
+                    return False
+                continue
+            if len(a.children) != len(b.children):
+                return False
+            stack.extend(zip(a.children, b.children))
+        return True
+
+class FrozenLeafNode(_Frozen, LeafNode):
+    """An immutable LeafNode; props become a read-only mapping."""
+    __slots__ = ("_hash", "__weakref__")
+    _size = 1
+
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag, value, MappingProxyType(dict(props)) if props else None)
+        self._hash = hash((LeafNode, self.tag, value, _props_key(props)))
+
+    def __repr__(self):
+        return f"FrozenLeafNode({self.tag}, {self.value}, {self.props and dict(self.props)})"
+
+class FrozenParentNode(_Frozen, ParentNode):
+    """An immutable ParentNode whose structural hash is computed once, from its children's.
+
+    Children that are not frozen yet are frozen on the way in. When a
+    FragmentCache is installed with set_fragment_cache, rendering a frozen
+    parent that was rendered before is a single lookup.
+    """
+    __slots__ = ("_size", "_hash", "__weakref__")
+
+    def __init__(self, tag, children, props=None):
+        if children is not None:
+            children = tuple(freeze(child) for child in children)
+        super().__init__(tag, children, MappingProxyType(dict(props)) if props else None)
+        props_key = _props_key(props)
+        child_hashes = None
+        # Nodes in the subtree, so the cache can skip ones cheaper to render than to record.
+        self._size = 1
+        if children is not None:
+            child_hashes = tuple(child._hash for child in children)
+            self._size += sum(child._size for child in children)
+        # Set last: once _hash exists the node refuses further assignments.
+        self._hash = hash((ParentNode, self.tag, props_key, child_hashes))
+
+    def __repr__(self):
+        return f"FrozenParentNode({self.tag}, {list(self.children or ())}, {self.props and dict(self.props)})"
+
+# Every live subtree freeze() has built, by structure. Children are
+# interned before their parents, so a parent's key can name its children by
+# id: while the parent is alive its children are too, and their ids are not
+# reused.
+_interned = WeakValueDictionary()
+
+def _intern(node):
+    if node.children is not None:
+        key = (type(node), node.tag, _props_key(node.props), tuple(id(child) for child in node.children))
+    else:
+        key = (type(node), node.tag, type(node.value), node.value, _props_key(node.props))
+    return _interned.setdefault(key, node)
+
+def freeze(node):
+    """Return an immutable copy of the tree under node, sharing already frozen subtrees.
+
+    Equal subtrees frozen while an earlier copy is still alive come back as
+    that same object, even across calls, so comparing them (as FragmentCache
+    does on every hit) stops at the first shared child. A node with its own
+    to_html is frozen as a raw leaf holding the HTML it renders now.
+    """
+    frozen = {}
+    stack = [(node, False)]
+    while stack:
+        item, expanded = stack.pop()
+        if isinstance(item, _Frozen) or id(item) in frozen:
+            continue
+        kind = _render_kind(type(item))
+        if kind == _PARENT and item.children and not expanded:
+            stack.append((item, True))
+            stack.extend((child, False) for child in item.children)
+            continue
+        if kind == _PARENT:
+            children = None
+            if item.children is not None:
+                children = [child if isinstance(child, _Frozen) else frozen[id(child)] for child in item.children]
+            result = FrozenParentNode(item.tag, children, item.props)
+        elif kind == _LEAF:
+            result = FrozenLeafNode(item.tag, item.value, item.props)
+        else:
+            result = FrozenLeafNode(None, item.to_html())
+        # Keyed by id: the caller's tree keeps every item alive meanwhile.
+        frozen[id(item)] = _intern(result)
+    return node if isinstance(node, _Frozen) else frozen[id(node)]
+
+_fragment_cache = None
+
+def set_fragment_cache(cache):
+    """Install cache (a FragmentCache, or None to turn it off); returns the previous one."""
+    global _fragment_cache
+    previous = _fragment_cache
+    _fragment_cache = cache
+    return previous
+
+def get_fragment_cache():
+    return _fragment_cache
+
+
+_LEAF = 0
+_PARENT = 1
+_OTHER = 2
+_FROZEN = 3
+# How iter_html_chunks treats each node type: a subclass that keeps the
+# Leaf/ParentNode to_html is rendered inline, one that overrides it is asked
+# for its own to_html().
+_render_kinds = {}
+
+def _render_kind(node_type):
+    kind = _render_kinds.get(node_type)
+    if kind is None:
+        if node_type.to_html is LeafNode.to_html:
+            kind = _LEAF
+        elif node_type.to_html is ParentNode.to_html:
+            kind = _FROZEN if issubclass(node_type, FrozenParentNode) else _PARENT
+        else:
+            kind = _OTHER
+        _render_kinds[node_type] = kind
+    return kind
+
+# "<li>"/"</li>" and friends, built once per tag instead of once per node.
+_open_tags = {}
+_close_tags = {}
+
+def _tag_strings(tag):
+    open_tag = _open_tags.get(tag)
+    if open_tag is None:
+        open_tag = _open_tags[tag] = f"<{tag}>"
+        _close_tags[tag] = f"</{tag}>"
+    return open_tag, _close_tags[tag]
+
+def iter_html_chunks(node, as_parent=False, batch_size=1024):
+    """Yield the HTML of node.to_html() in chunks, walking the tree with an explicit stack.
+
+    There is no recursion, so trees of any depth render, and the same
+    ValueErrors as to_html are raised for the first invalid node in
+    document order. Pieces are joined batch_size at a time before being
+    yielded. as_parent renders node itself as a plain ParentNode, for a
+    subclass whose to_html extends ParentNode.to_html.
+
+    With a FragmentCache installed, each FrozenParentNode of at least its
+    min_nodes nodes is looked up first, and its HTML is stored once its
+    closing tag is emitted.
+    """
+    parts = []
+    emit = parts.append
+    kinds = _render_kinds
+    fragments = _fragment_cache
+    min_nodes = fragments.min_nodes if fragments is not None else 0
+    # Each stack entry is a parent's child iterator, its closing tag and,
+    # for a frozen parent being recorded, (node, index of its first part).
+    stack = []
+    children = iter((node,))
+    close_tag = None
+    capture = None
+    capturing = 0
+    root_kind = None
+    if as_parent:
+        root_kind = _FROZEN if _render_kind(type(node)) == _FROZEN else _PARENT
+    while True:
+        for item in children:
+            kind = root_kind or kinds.get(type(item))
+            root_kind = None
+            if kind is None:
+                kind = _render_kind(type(item))
+
+            if kind == _LEAF:
+                value = item.value
+                if value is None:
+                    raise ValueError("All leaf nodes must have a value")
+                tag = item.tag
+                if tag is None:
+                    emit(value)
+                elif tag in VOID_TAGS:
+                    emit(f"<{tag}{item.props_to_html()}>" if item.props else f"<{tag}>")
+                elif item.props:
+                    emit(f"<{tag}{item.props_to_html()}>{value}</{tag}>")
+                else:
+                    emit(f"<{tag}>{value}</{tag}>")
+            elif kind == _OTHER:
+                emit(item.to_html())
+            else:
+                item_capture = None
+                if kind == _FROZEN and fragments is not None and item._size >= min_nodes:
+                    html = fragments.get(item)
+                    if html is not None:
+                        emit(html)
+                        continue
+                    item_capture = (item, len(parts))
+                    capturing += 1
+                tag = item.tag
+                if tag is None:
+                    raise ValueError("All parent nodes must have a tag")
+                if item.children is None or len(item.children) == 0:
+                    raise ValueError("All parent nodes must have children")
+                open_tag, item_close_tag = _tag_strings(tag)
+                emit(f"<{tag}{item.props_to_html()}>" if item.props else open_tag)
+                stack.append((children, close_tag, capture))
+                children = iter(item.children)
+                close_tag = item_close_tag
+                capture = item_capture
+                break
+        else:
+            if not stack:
+                break
+            emit(close_tag)
+            if capture is not None:
+                # Collapse the fragment's parts into one string, so an outer
+                # frozen parent joins it as a single piece.
+                start = capture[1]
+                html = "".join(parts[start:])
+                parts[start:] = [html]
+                fragments.put(capture[0], html)
+                capturing -= 1
+            children, close_tag, capture = stack.pop()
+            if len(parts) >= batch_size and not capturing:
+                yield "".join(parts)
+                parts.clear()
+    if parts:
+        yield "".join(parts)
+
+def render_html(node):
+    """Render node like to_html, without recursion."""
+    return "".join(iter_html_chunks(node))
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+from textnode import FrozenTextNode
+
+DEFAULT_MAX_ENTRIES = 4096
+# Inline strings that repeat across pages (nav labels, list items, footers)
+# are short; long paragraphs are almost never seen twice and would only
+# push useful entries out.
+DEFAULT_MAX_TEXT_LENGTH = 512
+
+
+class InlineCache:
+    """In-memory LRU cache of inline parse results, keyed by the inline text.
+
+    Values are stored as tuples of FrozenTextNodes, copied from the nodes
+    put in, so nothing handed out for one page can be changed by another,
+    and nothing the caller does to its own nodes reaches the cache.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_text_length=DEFAULT_MAX_TEXT_LENGTH):
+        if max_entries < 1:
+            raise ValueError("Inline cache needs room for at least one entry")
+        self.max_entries = max_entries
+        self.max_text_length = max_text_length
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text):
+        nodes = self.entries.get(text)
+        if nodes is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(text)
+        self.hits += 1
+        return nodes
+
+    def put(self, text, nodes):
+        if len(text) > self.max_text_length:
+            return
+        self.entries[text] = tuple(FrozenTextNode.of(node) for node in nodes)
+        self.entries.move_to_end(text)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self.entries)}
+
+    def __repr__(self):
+        return (
+            f"InlineCache(entries={len(self.entries)}/{self.max_entries}, hits={self.hits}, "
+            f"misses={self.misses}, evictions={self.evictions})"
+        )
@@ -1,74 +1,245 @@
 #!/usr/bin/env python3
 
-from textnode import TextNode, TextType
-from htmlnode import LeafNode
+import argparse
+from contextlib import nullcontext
 import os
-import shutil
-
-
-def copy_static_to_public(dir):
-    source_dir = os.path.join(dir, "static")
-    target_dir = os.path.join(dir, "public")
-    
-    if not os.path.exists(source_dir):
-        raise FileNotFoundError(f"Source directory '{source_dir}' does not exist")
-    
-    if os.path.exists(target_dir):
-        shutil.rmtree(target_dir)
-    
-    def copy_recursive(source, target):
-        os.makedirs(target, exist_ok=True)
-        
-        for item in os.listdir(source):
-            source_path = os.path.join(source, item)
-            target_path = os.path.join(target, item)
-            
-            if os.path.isdir(source_path):
-                copy_recursive(source_path, target_path)
-            else:
-                shutil.copy(source_path, target_path)
-    
-    copy_recursive(source_dir, target_dir)
-import os
-import shutil
-
-
-def copy_static_to_public(dir):
-    source_dir = os.path.join(dir, "static")
-    target_dir = os.path.join(dir, "public")
-    
-    if not os.path.exists(source_dir):
-        raise FileNotFoundError(f"Source directory '{source_dir}' does not exist")
-    
-    if os.path.exists(target_dir):
-        shutil.rmtree(target_dir)
-    
-    def copy_recursive(source, target):
-        os.makedirs(target, exist_ok=True)
-        
-        for item in os.listdir(source):
-            source_path = os.path.join(source, item)
-            target_path = os.path.join(target, item)
-            
-            if os.path.isdir(source_path):
-                copy_recursive(source_path, target_path)
-            else:
-                shutil.copy(source_path, target_path)
-    
-    copy_recursive(source_dir, target_dir)
-
-def main():
+import sys
+import time
+
+from ast_cache import ASTCache
+from build_report import BuildReport
+from copy_strategies import STRATEGY_NAMES
+from fingerprint import fingerprint_static, load_asset_manifest
+from generate import generate_pages
+from precompress import DEFAULT_LEVEL, DEFAULT_MAX_RATIO, DEFAULT_MIN_SIZE, precompress_public
+from output_writer import write_path_list
+from static_files import (
+    DEFAULT_WORKERS,
+    copy_static_to_public,
+    diff_snapshots,
+    load_manifest,
+    save_manifest,
+    snapshot_files,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static site into public/")
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="trust the size and mtime recorded by the last run instead of comparing every static file with public/",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"number of threads used to copy static files (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--copy-strategy",
+        choices=STRATEGY_NAMES,
+        default="auto",
+        help="how static files are published; auto probes hardlink, reflink, copy_file_range, sendfile, then copy",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="also publish static files as name.<hash>.ext and write public/asset-manifest.json",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of processes used to render pages (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--template",
+        default="template.html",
+        help="page template, relative to the current directory (default: template.html)",
+    )
+    parser.add_argument(
+        "--ast-cache-size",
+        type=int,
+        default=256,
+        help="size cap in MiB of the parsed markdown cache in .cache/ast, used with --fingerprint; "
+        "0 disables it (default: 256)",
+    )
+    parser.add_argument(
+        "--inline-cache-size",
+        type=int,
+        default=0,
+        help="entries in each render process's cache of parsed inline text, 0 disables it (default: 0)",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="minify generated pages, leaving pre, code, script, style and textarea contents alone",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="write .gz siblings of HTML, CSS, JS and SVG files in public/ after the build",
+    )
+    parser.add_argument(
+        "--gzip-level",
+        type=int,
+        default=DEFAULT_LEVEL,
+        choices=range(1, 10),
+        metavar="1-9",
+        help=f"gzip compression level for --precompress (default: {DEFAULT_LEVEL})",
+    )
+    parser.add_argument(
+        "--gzip-min-size",
+        type=int,
+        default=DEFAULT_MIN_SIZE,
+        help=f"smallest file in bytes that --precompress compresses (default: {DEFAULT_MIN_SIZE})",
+    )
+    parser.add_argument(
+        "--gzip-max-ratio",
+        type=float,
+        default=DEFAULT_MAX_RATIO,
+        help=f"largest compressed/original size ratio worth keeping a .gz for (default: {DEFAULT_MAX_RATIO})",
+    )
+    parser.add_argument(
+        "--changed-list",
+        metavar="PATH",
+        help="write the files in public/ that changed since the last build run with this option to PATH, "
+        "one per line, for rsync --files-from or a CDN upload",
+    )
+    parser.add_argument(
+        "--deleted-list",
+        metavar="PATH",
+        help="write the files removed from public/ since the last build run with --changed-list to PATH",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="print wall and CPU time per build stage and the slowest pages",
+    )
+    parser.add_argument(
+        "--report-top",
+        type=int,
+        default=10,
+        help="number of slowest pages listed in the report (default: 10)",
+    )
+    parser.add_argument(
+        "--report-json",
+        metavar="PATH",
+        help="also write the build report as JSON to PATH (implies --report)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = BuildReport() if args.report or args.report_json else None
+    build_start = time.perf_counter()
     current_dir = os.getcwd()
     print(f"Current directory: {current_dir}")
-    
+
     static_path = os.path.join(current_dir, "static")
     if not os.path.exists(static_path):
-        print(f"Static folder not found at: {static_path}")
-        return
-    
-    print("Static folder found, copying to public...")
-    copy_static_to_public(current_dir)
-    print("Copy completed!")
+        print(f"Static folder not found at: {static_path}, skipping static files")
+    else:
+        with report.totals.stage("static") if report else nullcontext():
+            copy_static(current_dir, args)
+
+    failed = False
+    content_path = os.path.join(current_dir, "content")
+    if not os.path.exists(content_path):
+        print(f"Content folder not found at: {content_path}, skipping page generation")
+    else:
+        print("Content folder found, generating pages...")
+        failed = not generate_content(current_dir, content_path, args, report)
+
+    if args.precompress:
+        with report.totals.stage("precompress") if report else nullcontext():
+            result = precompress_public(
+                current_dir,
+                level=args.gzip_level,
+                min_size=args.gzip_min_size,
+                max_ratio=args.gzip_max_ratio,
+                workers=args.jobs,
+                strategy=args.copy_strategy,
+            )
+        print(
+            f"Precompressed {len(result.compressed)} files, {len(result.reused)} reused, "
+            f"{len(result.skipped)} skipped, {len(result.removed)} removed "
+            f"({result.bytes_in} -> {result.bytes_out} bytes)"
+        )
+
+    if args.changed_list or args.deleted_list:
+        write_change_lists(current_dir, args)
+
+    if report is not None:
+        report.wall = time.perf_counter() - build_start
+        print(report.format(args.report_top))
+        if args.report_json:
+            report.write_json(args.report_json, args.report_top)
+    if failed:
+        sys.exit(1)
+
+
+def copy_static(current_dir, args):
+    if args.sync:
+        print("Static folder found, syncing to public...")
+    else:
+        print("Static folder found, copying to public...")
+    result = copy_static_to_public(current_dir, sync=args.sync, workers=args.workers, strategy=args.copy_strategy)
+    print(
+        f"{'Sync' if args.sync else 'Copy'} completed ({result.strategy}): {len(result.copied)} copied, "
+        f"{len(result.skipped)} unchanged, {len(result.deleted)} deleted"
+    )
+
+    if args.fingerprint:
+        manifest = fingerprint_static(current_dir, workers=args.workers, strategy=args.copy_strategy)
+        print(f"Fingerprinted {len(manifest)} assets")
+
+
+def generate_content(current_dir, content_path, args, report):
+    asset_manifest = load_asset_manifest(os.path.join(current_dir, "public")) if args.fingerprint else None
+    ast_cache = None
+    # Only pages with asset URLs to rewrite are parsed into trees.
+    if args.fingerprint and args.ast_cache_size > 0:
+        ast_cache = ASTCache(os.path.join(current_dir, ".cache", "ast"), args.ast_cache_size * 1024 * 1024)
+    result = generate_pages(
+        content_path,
+        os.path.join(current_dir, args.template),
+        os.path.join(current_dir, "public"),
+        workers=args.jobs,
+        asset_manifest=asset_manifest,
+        graph_path=os.path.join(current_dir, ".cache", "build-graph.json"),
+        ast_cache=ast_cache,
+        report=report is not None,
+        inline_cache_size=args.inline_cache_size,
+        minify=args.minify,
+    )
+    print(
+        f"Generated {len(result.generated)} pages ({len(result.unchanged)} identical on disk), "
+        f"{len(result.skipped)} unchanged, {len(result.removed)} removed"
+    )
+    if report is not None:
+        for rel_source, stats in result.page_stats:
+            report.add_page(rel_source, stats)
+    for rel_source, error in result.errors:
+        print(f"  failed: {rel_source}: {error}")
+    if result.errors:
+        print(f"{len(result.errors)} page(s) failed")
+    return not result.errors
+
+
+def write_change_lists(current_dir, args):
+    """Compare public/ with the snapshot the previous listing build saved and write the differences."""
+    snapshot_path = os.path.join(current_dir, ".cache", "output-snapshot.json")
+    snapshot = snapshot_files(os.path.join(current_dir, "public"))
+    changed, deleted = diff_snapshots(load_manifest(snapshot_path), snapshot)
+    if args.changed_list:
+        write_path_list(args.changed_list, changed)
+    if args.deleted_list:
+        write_path_list(args.deleted_list, deleted)
+    save_manifest(snapshot_path, snapshot)
+    print(f"Output changes: {len(changed)} changed, {len(deleted)} deleted")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
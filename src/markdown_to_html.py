@@ -1,82 +1,245 @@
 # StaticSiteGenerator/src/block_to_html.py
 
-from text_processing import markdown_to_blocks, block_to_block_type, text_to_textnodes
+from text_processing import (
+    markdown_to_blocks,
+    scan_block,
+    scan_blocks,
+    text_to_html,
+    text_to_textnodes,
+    textnodes_to_html,
+)
 from textnode import TextNode, TextType, BlockType, text_node_to_html_node
 from htmlnode import ParentNode
 import textwrap
 
-def text_to_children(text):
-    text_nodes = text_to_textnodes(text)
+# Bump whenever a change to the parser or renderer alters the tree or HTML it
+# produces; cached trees from other versions are discarded and pages built
+# by them are rendered again.
+PARSER_VERSION = "3"
+
+# Opt-in InlineCache consulted by text_to_children; None parses every time.
+_inline_cache = None
+
+def set_inline_cache(cache):
+    """Install cache (an InlineCache, or None to turn caching off); returns the previous one."""
+    global _inline_cache
+    previous = _inline_cache
+    _inline_cache = cache
+    return previous
+
+def get_inline_cache():
+    return _inline_cache
+
+def text_to_children(text, parse_inline=text_to_textnodes):
+    cache = _inline_cache
+    if cache is None:
+        text_nodes = parse_inline(text)
+    else:
+        text_nodes = cache.get(text)
+        if text_nodes is None:
+            text_nodes = parse_inline(text)
+            cache.put(text, text_nodes)
+    # Fresh leaves every time: later passes (asset rewriting) mutate them.
     return [text_node_to_html_node(n) for n in text_nodes]
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    block_nodes = []
+def _inline_html(text, parts):
+    # text_to_html, served from the inline cache when one is installed. The
+    # cache holds TextNodes for both paths; texts too long to be stored are
+    # written out directly.
+    cache = _inline_cache
+    if cache is None or len(text) > cache.max_text_length:
+        return text_to_html(text, parts)
+    text_nodes = cache.get(text)
+    if text_nodes is None:
+        text_nodes = text_to_textnodes(text)
+        cache.put(text, text_nodes)
+    textnodes_to_html(text_nodes, parts)
+    return len(text_nodes)
+
+def _scan_markdown(markdown):
+    return [scan_block(block) for block in markdown_to_blocks(markdown)]
+
+def markdown_to_html_node(markdown, timer=None):
+    scan = _scan_markdown
+    parse_inline = text_to_textnodes
+    if timer is not None:
+        scan = timer.wrap("blocks", scan)
+        parse_inline = timer.wrap("inline", parse_inline)
+
+    block_nodes = [block_to_html_node(block, parse_inline) for block in scan(markdown)]
+    return ParentNode("div", block_nodes)
 
+def markdown_to_html(markdown, timer=None):
+    """Return markdown_to_html_node(markdown).to_html() without building the tree.
+
+    Blocks and inline text are written straight out as HTML strings, for
+    builds that never look at the nodes. An installed InlineCache is used
+    here too. Raises the same ValueErrors, in the same order: parse errors
+    as blocks are reached, and an element left without children only once
+    the whole document has parsed. With timer, block scanning, inline
+    parsing and writing the HTML are timed as "blocks", "inline" and
+    "render".
+    """
+    scan = _scan_markdown
+    inline_html = _inline_html
+    render = _render_blocks
+    if timer is not None:
+        scan = timer.wrap("blocks", scan)
+        inline_html = timer.wrap("inline", inline_html)
+        render = timer.wrap("render", render)
+    return render(scan(markdown), inline_html)
+
+def _render_blocks(blocks, inline_html):
+    parts = ["<div>"]
+    empty = False
     for block in blocks:
-        blk = block
-        lines = blk.split("\n")
-        if len(lines) >= 3 and lines[0].lstrip().startswith("```") and lines[-1].lstrip().startswith("```"):
-            code_lines = lines[1:-1]
-            code_content = "\n".join(code_lines)
-            code_content = textwrap.dedent(code_content)
-            if not code_content.endswith("\n"):
-                code_content = code_content + "\n"
-            code_text_node = TextNode(code_content, TextType.TEXT)
-            code_child = text_node_to_html_node(code_text_node)
-            code_parent = ParentNode("code", [code_child])
-            node = ParentNode("pre", [code_parent])
-            block_nodes.append(node)
-            continue
-
-        block_type = block_to_block_type(blk)
-
-        if block_type == BlockType.PARAGRAPH:
-            clean_text = " ".join(line.strip() for line in blk.split("\n"))
-            children = text_to_children(clean_text)
-            node = ParentNode("p", children)
-
-        elif block_type == BlockType.HEADING:
-            first_line = lines[0].lstrip()
-            hash_part = first_line.split(" ")[0]
-            level = len(hash_part)
-            heading_text = first_line[level:].strip()
-            children = text_to_children(heading_text)
-            node = ParentNode(f"h{level}", children)
-
-        elif block_type == BlockType.QUOTE:
-            quote_lines = []
-            for line in lines:
-                stripped = line.lstrip()
-                if stripped.startswith(">"):
-                    stripped = stripped[1:]
-                    if stripped.startswith(" "):
-                        stripped = stripped[1:]
-                quote_lines.append(stripped.rstrip())
-            quote_text = " ".join(quote_lines)
-            children = text_to_children(quote_text)
-            node = ParentNode("blockquote", children)
-
-        elif block_type == BlockType.UNORDERED_LIST:
-            items = [line[2:].strip() if line.startswith("- ") else line.strip() for line in lines]
-            li_nodes = [ParentNode("li", text_to_children(item)) for item in items]
-            node = ParentNode("ul", li_nodes)
-
-        elif block_type == BlockType.ORDERED_LIST:
-            items = []
-            for line in lines:
-                if "." in line:
-                    dot_index = line.find(".")
-                    items.append(line[dot_index + 1 :].strip())
-                else:
-                    items.append(line.strip())
-            li_nodes = [ParentNode("li", text_to_children(item)) for item in items]
-            node = ParentNode("ol", li_nodes)
+        if not block_to_html(block, parts, inline_html):
+            empty = True
+    if empty or len(parts) == 1:
+        raise ValueError("All parent nodes must have children")
+    parts.append("</div>")
+    return "".join(parts)
+
+class ParsedDocument:
+    """A parsed document and the block texts its top-level children came from.
+
+    Pass it back to parse_document with the edited markdown to reparse only
+    the blocks that changed.
+    """
+
+    def __init__(self, blocks, children, reused=0):
+        self.blocks = blocks
+        self.node = ParentNode("div", children)
+        self.reused = reused
+
+    @property
+    def parsed(self):
+        return len(self.blocks) - self.reused
+
+    def __repr__(self):
+        return f"ParsedDocument(blocks={len(self.blocks)}, reused={self.reused}, parsed={self.parsed})"
+
+def parse_document(markdown, previous=None):
+    """Parse markdown like markdown_to_html_node, reusing unchanged blocks of previous.
 
+    Blocks are matched by their text, wherever they moved to, so only
+    inserted or edited blocks are parsed. Reused block nodes are shared with
+    previous, which should be dropped once the new document replaces it.
+    """
+    available = {}
+    if previous is not None:
+        for block, child in zip(previous.blocks, previous.node.children):
+            available.setdefault(block, []).append(child)
+
+    blocks = markdown_to_blocks(markdown)
+    children = []
+    reused = 0
+    for block in blocks:
+        candidates = available.get(block)
+        if candidates:
+            children.append(candidates.pop())
+            reused += 1
         else:
-            children = text_to_children(blk.strip())
-            node = ParentNode("p", children)
+            children.append(block_to_html_node(scan_block(block)))
+    return ParsedDocument(blocks, children, reused)
 
-        block_nodes.append(node)
+def markdown_file_to_html_nodes(fp):
+    """Yield the block nodes of a markdown file object one block at a time.
 
-    return ParentNode("div", block_nodes)
+    Only the block being converted is held in memory, so a document of any
+    size can be rendered by writing each node out as it arrives.
+    """
+    for block in scan_blocks(fp):
+        yield block_to_html_node(block)
+
+def write_markdown_file_as_html(fp, out):
+    """Write markdown_to_html_node(fp.read()).to_html() to out, block by block."""
+    opened = False
+    for node in markdown_file_to_html_nodes(fp):
+        if not opened:
+            out.write("<div>")
+            opened = True
+        node.write_html(out)
+    if not opened:
+        raise ValueError("All parent nodes must have children")
+    out.write("</div>")
+
+def block_to_html_node(block, parse_inline=text_to_textnodes):
+    """Convert a Block from scan_blocks into its HTML node."""
+    lines = block.lines
+    block_type = block.block_type
+
+    if block_type == BlockType.CODE and block.fenced:
+        code_content = textwrap.dedent("\n".join(lines[1:-1]))
+        if not code_content.endswith("\n"):
+            code_content = code_content + "\n"
+        code_child = text_node_to_html_node(TextNode(code_content, TextType.TEXT))
+        return ParentNode("pre", [ParentNode("code", [code_child])])
+
+    if block_type == BlockType.PARAGRAPH:
+        clean_text = " ".join(line.strip() for line in lines)
+        return ParentNode("p", text_to_children(clean_text, parse_inline))
+
+    if block_type == BlockType.HEADING:
+        heading_text = lines[0][block.level:].strip()
+        return ParentNode(f"h{block.level}", text_to_children(heading_text, parse_inline))
+
+    if block_type == BlockType.QUOTE:
+        quote_text = " ".join(line[start:].rstrip() for line, start in zip(lines, block.starts))
+        return ParentNode("blockquote", text_to_children(quote_text, parse_inline))
+
+    if block_type == BlockType.UNORDERED_LIST or block_type == BlockType.ORDERED_LIST:
+        tag = "ul" if block_type == BlockType.UNORDERED_LIST else "ol"
+        li_nodes = [
+            ParentNode("li", text_to_children(line[start:].strip(), parse_inline))
+            for line, start in zip(lines, block.starts)
+        ]
+        return ParentNode(tag, li_nodes)
+
+    # A two-line ``` block: code to block_to_block_type, but too short to fence.
+    return ParentNode("p", text_to_children("\n".join(lines), parse_inline))
+
+def block_to_html(block, parts, inline_html=_inline_html):
+    """Append the HTML of block_to_html_node(block) to parts.
+
+    Returns False if an element in it would have no children, which
+    to_html would reject.
+    """
+    lines = block.lines
+    block_type = block.block_type
+
+    if block_type == BlockType.CODE and block.fenced:
+        code_content = textwrap.dedent("\n".join(lines[1:-1]))
+        if not code_content.endswith("\n"):
+            code_content = code_content + "\n"
+        parts.append(f"<pre><code>{code_content}</code></pre>")
+        return True
+
+    if block_type == BlockType.UNORDERED_LIST or block_type == BlockType.ORDERED_LIST:
+        tag = "ul" if block_type == BlockType.UNORDERED_LIST else "ol"
+        parts.append(f"<{tag}>")
+        filled = True
+        for line, start in zip(lines, block.starts):
+            parts.append("<li>")
+            if not inline_html(line[start:].strip(), parts):
+                filled = False
+            parts.append("</li>")
+        parts.append(f"</{tag}>")
+        return filled
+
+    if block_type == BlockType.PARAGRAPH:
+        tag = "p"
+        text = " ".join(line.strip() for line in lines)
+    elif block_type == BlockType.HEADING:
+        tag = f"h{block.level}"
+        text = lines[0][block.level:].strip()
+    elif block_type == BlockType.QUOTE:
+        tag = "blockquote"
+        text = " ".join(line[start:].rstrip() for line, start in zip(lines, block.starts))
+    else:
+        tag = "p"
+        text = "\n".join(lines)
+    parts.append(f"<{tag}>")
+    filled = inline_html(text, parts) > 0
+    parts.append(f"</{tag}>")
+    return filled
@@ -0,0 +1,231 @@
+import re
+
+# Bump whenever a change alters the minified output; pages built with
+# another version are rebuilt.
+MINIFIER_VERSION = "1"
+
+# Elements whose contents are passed through untouched.
+RAW_TAGS = frozenset(["pre", "code", "script", "style", "textarea"])
+_RAW_END = {name: re.compile(rf"</{name}\s*>", re.IGNORECASE) for name in RAW_TAGS}
+
+# Elements whitespace next to which never renders, so a whitespace-only run
+# between two of them (or the start or end of the page) can go entirely.
+BLOCK_TAGS = frozenset([
+    "html", "head", "body", "title", "meta", "link", "base", "script", "style",
+    "address", "article", "aside", "blockquote", "details", "dialog", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hgroup", "hr", "li", "main", "menu", "nav", "ol", "p", "pre", "section",
+    "summary", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+])
+
+# A </p> may be left out when the next tag is one of these start tags...
+P_CLOSING_STARTS = frozenset([
+    "address", "article", "aside", "blockquote", "details", "div", "dl", "fieldset", "figcaption",
+    "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr",
+    "main", "menu", "nav", "ol", "p", "pre", "section", "table", "ul",
+])
+# ...or the end tag of one of these parents.
+P_CLOSING_ENDS = frozenset([
+    "article", "aside", "blockquote", "body", "dd", "details", "div", "figure", "footer", "form",
+    "header", "li", "main", "nav", "section", "td", "th",
+])
+OPTIONAL_END_TAGS = frozenset(["li", "p"])
+
+TAG_PATTERN = re.compile(
+    r"""<(?:(/?)([A-Za-z][A-Za-z0-9-]*)(?:[^>"']|"[^"]*"|'[^']*')*>|!--.*?-->|![^>]*>)""", re.DOTALL
+)
+# What a tag TAG_PATTERN does not match yet can look like when the chunk
+# ends inside it: a start or end tag cut anywhere, including inside a quoted
+# attribute value that may hold ">", or an unclosed comment or doctype.
+PARTIAL_TAG_PATTERN = re.compile(
+    r"""<(?:/?(?:[A-Za-z][A-Za-z0-9-]*(?:[^>"']|"[^"]*"|'[^']*')*(?:"[^"]*|'[^']*)?)?|!(?:--.*|-|[^>]*))\Z""",
+    re.DOTALL,
+)
+WHITESPACE_PATTERN = re.compile(r"[ \t\n\r\f]+")
+_WHITESPACE = " \t\n\r\f"
+
+# _previous at the start of the page, and after a doctype.
+_EDGE = ""
+_TEXT = "#text"
+_COMMENT = "#comment"
+_BOUNDARY = BLOCK_TAGS | {_EDGE}
+
+
+def _can_omit(pending, closing, name):
+    if pending == "li":
+        return name == "li" if not closing else name in ("ul", "ol", "menu")
+    return name in P_CLOSING_STARTS if not closing else name in P_CLOSING_ENDS
+
+
+class HTMLMinifier:
+    """Minifies HTML fed to it in chunks of any size.
+
+    Whitespace runs collapse to one space, and disappear entirely between
+    block-level tags. A </li> or </p> is dropped when the tag after it
+    closes the element anyway. The contents of pre, code, script, style
+    and textarea elements are never changed. Removed characters are all
+    ASCII, so chars_in - chars_out is also the number of bytes saved.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._raw_end = None
+        self._previous = _EDGE
+        # An optional end tag and its name, held until the next tag shows
+        # whether it can go.
+        self._pending = None
+        self.chars_in = 0
+        self.chars_out = 0
+
+    def feed(self, chunk):
+        """Take the next chunk of HTML and return the minified output it completes."""
+        self.chars_in += len(chunk)
+        self._buffer += chunk
+        return self._process(False)
+
+    def close(self):
+        """Return the rest of the output once all chunks are fed."""
+        return self._process(True)
+
+    def _process(self, final):
+        buffer = self._buffer
+        out = []
+        emit = out.append
+        find = buffer.find
+        match_tag = TAG_PATTERN.match
+        collapse = WHITESPACE_PATTERN.sub
+        boundary = _BOUNDARY
+        previous = self._previous
+        pending = self._pending
+        pos = 0
+        while True:
+            if self._raw_end is not None:
+                match = self._raw_end.search(buffer, pos)
+                if match is not None:
+                    emit(buffer[pos:match.end()])
+                    pos = match.end()
+                    self._raw_end = None
+                    continue
+                # Hold back a possible start of the closing tag.
+                keep = len(buffer) if final else buffer.rfind("<", pos)
+                if keep == -1 or len(buffer) - keep > 64:
+                    keep = len(buffer)
+                emit(buffer[pos:keep])
+                pos = keep
+                break
+
+            tag = None
+            search = pos
+            while True:
+                lt = find("<", search)
+                if lt == -1:
+                    break
+                tag = match_tag(buffer, lt)
+                if tag is not None or (not final and self._incomplete(buffer, lt)):
+                    break
+                search = lt + 1
+
+            if tag is None:
+                # Text up to the end of what has arrived so far.
+                self._previous, self._pending = previous, pending
+                end = len(buffer) if lt == -1 else lt
+                text = buffer[pos:end]
+                if final:
+                    self._text(text, None, out)
+                    pos = end
+                else:
+                    # Trailing whitespace waits for the tag after it.
+                    kept = len(text.rstrip(_WHITESPACE))
+                    self._text(text[:kept], _TEXT, out)
+                    pos += kept
+                previous, pending = self._previous, self._pending
+                break
+
+            name = tag.group(2)
+            if name is not None:
+                name = name.lower()
+            elif buffer.startswith("<!--", lt):
+                name = _COMMENT
+            else:
+                name = _EDGE
+
+            if lt > pos:
+                text = collapse(" ", buffer[pos:lt])
+                if text != " " or previous not in boundary or name not in boundary:
+                    if pending is not None:
+                        emit(pending[0])
+                        pending = None
+                    emit(text)
+                    previous = _TEXT
+
+            html = tag.group(0)
+            pos = tag.end()
+            if tag.group(2) is None:
+                if pending is not None:
+                    emit(pending[0])
+                    pending = None
+                emit(html)
+                previous = name
+                continue
+
+            closing = html[1] == "/"
+            if pending is not None:
+                if _can_omit(pending[1], closing, name):
+                    pending = None
+                else:
+                    emit(pending[0])
+                    pending = None
+            previous = name
+            if closing:
+                if name in OPTIONAL_END_TAGS:
+                    pending = (html, name)
+                    continue
+            elif name in RAW_TAGS and not html.endswith("/>"):
+                self._raw_end = _RAW_END[name]
+            emit(html)
+
+        self._buffer = buffer[pos:]
+        self._previous = previous
+        self._pending = pending
+        if final:
+            self._flush(out)
+        html = "".join(out)
+        self.chars_out += len(html)
+        return html
+
+    @staticmethod
+    def _incomplete(buffer, lt):
+        # Whether the "<" at lt could still start a tag once more input arrives.
+        return PARTIAL_TAG_PATTERN.match(buffer, lt) is not None
+
+    def _text(self, text, next_name, out):
+        if not text:
+            return
+        text = WHITESPACE_PATTERN.sub(" ", text)
+        if text == " " and self._previous in _BOUNDARY and (next_name is None or next_name in _BOUNDARY):
+            return
+        self._flush(out)
+        out.append(text)
+        self._previous = _TEXT
+
+    def _flush(self, out):
+        if self._pending is not None:
+            out.append(self._pending[0])
+            self._pending = None
+
+
+def iter_minified(chunks, minifier=None):
+    """Yield the minified HTML of an iterable of HTML chunks as it goes."""
+    if minifier is None:
+        minifier = HTMLMinifier()
+    for chunk in chunks:
+        html = minifier.feed(chunk)
+        if html:
+            yield html
+    html = minifier.close()
+    if html:
+        yield html
+
+
+def minify_html(html):
+    return "".join(iter_minified([html]))
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+COMPARE_CHUNK_SIZE = 1024 * 1024
+
+
+def temp_path(path):
+    """Return a hidden name next to path to build its replacement under."""
+    parent, name = os.path.split(path)
+    return os.path.join(parent, f".{name}.{os.getpid()}.tmp")
+
+
+def write_atomic(path, data):
+    """Write bytes data to path through a temporary file and a rename.
+
+    Readers see either the old file or the new one, never a partial write.
+    """
+    tmp_path = temp_path(path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def copy_atomic(source, target, copy_function=shutil.copy):
+    """Copy source to target with copy_function through a temporary file and a rename."""
+    tmp_path = temp_path(target)
+    try:
+        copy_function(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def same_content(path_a, path_b):
+    """Return whether two files hold the same bytes, reading both only as far as the first difference."""
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    with open(path_a, "rb") as a, open(path_b, "rb") as b:
+        while True:
+            chunk = a.read(COMPARE_CHUNK_SIZE)
+            if chunk != b.read(COMPARE_CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def write_if_changed(path, data):
+    """Write bytes data to path unless the file already holds exactly them; returns whether it wrote.
+
+    An identical file is left alone, so its mtime and inode survive the
+    build. The size is checked first, so only a file of the same length is
+    read back for comparison.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = None
+    if size == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    write_atomic(path, data)
+    return True
+
+
+def copy_if_changed(source, target, copy_function=shutil.copy):
+    """Copy source to target unless target already holds the same bytes; returns whether it copied."""
+    if os.path.isfile(target):
+        if os.path.samefile(source, target) or same_content(source, target):
+            return False
+    copy_atomic(source, target, copy_function)
+    return True
+
+
+def write_path_list(path, rel_paths):
+    """Write rel_paths to path one per line, in the form rsync --files-from reads."""
+    data = "".join(rel_path + "\n" for rel_path in rel_paths).encode("utf-8")
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    write_atomic(path, data)
@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import os
+
+from copy_strategies import get_copy_function
+from fingerprint import hash_files
+from output_writer import copy_if_changed, write_atomic
+from static_files import DEFAULT_WORKERS, load_manifest, save_manifest, walk_files
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".htm", ".css", ".js", ".mjs", ".svg")
+DEFAULT_LEVEL = 9
+# Below about one packet the saving is not worth a second file.
+DEFAULT_MIN_SIZE = 1024
+# A .gz larger than this fraction of its source is not published.
+DEFAULT_MAX_RATIO = 0.9
+
+
+class PrecompressResult:
+    def __init__(self):
+        self.compressed = []
+        self.reused = []
+        self.skipped = []
+        self.removed = []
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def __repr__(self):
+        return (
+            f"PrecompressResult(compressed={len(self.compressed)}, reused={len(self.reused)}, "
+            f"skipped={len(self.skipped)}, removed={len(self.removed)})"
+        )
+
+
+def artifact_name(digest, level):
+    return f"{digest}.{level}.gz"
+
+
+def compress_file(source, target, level=DEFAULT_LEVEL):
+    """Gzip source into target and return the compressed size.
+
+    The header carries no file name and an mtime of 0, so the same bytes
+    always compress to the same file.
+    """
+    with open(source, "rb") as f:
+        data = f.read()
+    compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    write_atomic(target, compressed)
+    return len(compressed)
+
+
+def _compress_job(job):
+    source, target, level = job
+    return compress_file(source, target, level)
+
+
+def precompress_public(
+    dir,
+    level=DEFAULT_LEVEL,
+    min_size=DEFAULT_MIN_SIZE,
+    max_ratio=DEFAULT_MAX_RATIO,
+    workers=None,
+    strategy="auto",
+):
+    """Write a .gz sibling next to every compressible file in public/.
+
+    Compressed files are kept in .cache/precompress, named by the sha256 of
+    their source and the level, so a file whose content did not change is
+    never compressed again, even after public/ was rebuilt from scratch;
+    the cached copy is published with the copy strategy. Files smaller
+    than min_size, or whose .gz would be more than max_ratio of their size,
+    get no sibling. Compression runs over a pool of `workers` processes
+    (default: one per CPU). .gz files this left in public/ on an earlier
+    run are removed once their source no longer gets one.
+    """
+    public_dir = os.path.join(dir, "public")
+    cache_dir = os.path.join(dir, ".cache", "precompress")
+    manifest_path = os.path.join(dir, ".cache", "precompress.json")
+    manifest = load_manifest(manifest_path)
+    hash_cache = manifest.get("hashes", {})
+    previous_outputs = set(manifest.get("outputs", []))
+
+    result = PrecompressResult()
+    sizes = {}
+    candidates = []
+    for rel_path in walk_files(public_dir):
+        if not rel_path.endswith(COMPRESSIBLE_EXTENSIONS):
+            continue
+        size = os.path.getsize(os.path.join(public_dir, rel_path))
+        if size < min_size:
+            result.skipped.append(rel_path)
+            continue
+        sizes[rel_path] = size
+        candidates.append(rel_path)
+
+    digests = hash_files(public_dir, candidates, hash_cache, workers or DEFAULT_WORKERS)
+    os.makedirs(cache_dir, exist_ok=True)
+    jobs = {}
+    for rel_path in candidates:
+        artifact = os.path.join(cache_dir, artifact_name(digests[rel_path], level))
+        if artifact not in jobs and not os.path.exists(artifact):
+            jobs[artifact] = (os.path.join(public_dir, rel_path), artifact, level)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        for job in jobs.values():
+            _compress_job(job)
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_compress_job, jobs.values()))
+
+    copy_function = get_copy_function(strategy, cache_dir, public_dir)
+    outputs = []
+    used = set()
+    for rel_path in candidates:
+        artifact = os.path.join(cache_dir, artifact_name(digests[rel_path], level))
+        used.add(os.path.basename(artifact))
+        compressed_size = os.path.getsize(artifact)
+        if compressed_size > sizes[rel_path] * max_ratio:
+            result.skipped.append(rel_path)
+            continue
+        copy_if_changed(artifact, os.path.join(public_dir, rel_path + ".gz"), copy_function)
+        outputs.append(rel_path + ".gz")
+        if artifact in jobs:
+            result.compressed.append(rel_path)
+        else:
+            result.reused.append(rel_path)
+        result.bytes_in += sizes[rel_path]
+        result.bytes_out += compressed_size
+
+    for rel_output in sorted(previous_outputs - set(outputs)):
+        stale_path = os.path.join(public_dir, rel_output)
+        if os.path.isfile(stale_path):
+            os.remove(stale_path)
+            result.removed.append(rel_output)
+    for name in os.listdir(cache_dir):
+        if name not in used:
+            os.remove(os.path.join(cache_dir, name))
+
+    result.skipped.sort()
+    save_manifest(manifest_path, {"hashes": hash_cache, "outputs": sorted(outputs)})
+    return result
@@ -0,0 +1,263 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+import hashlib
+import json
+import os
+import shutil
+
+from copy_strategies import get_copy_function, strategy_name
+from output_writer import copy_atomic, same_content, write_if_changed
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class CopyResult:
+    def __init__(self):
+        self.copied = []
+        self.skipped = []
+        self.deleted = []
+        self.errors = []
+        self.strategy = None
+
+    def __repr__(self):
+        return (
+            f"CopyResult(copied={len(self.copied)}, skipped={len(self.skipped)}, "
+            f"deleted={len(self.deleted)}, errors={len(self.errors)})"
+        )
+
+
+class CopyError(Exception):
+    def __init__(self, result):
+        self.result = result
+        lines = [f"  {rel_path}: {error}" for rel_path, error in result.errors]
+        super().__init__(f"Failed to copy {len(result.errors)} file(s):\n" + "\n".join(lines))
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict):
+        return {}
+    return manifest
+
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_if_changed(path, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+
+def scan_tree(root):
+    """Return (dirs, files) under root as sorted "/"-separated relative paths.
+
+    Directories come out parents-first, so creating them in order never
+    needs makedirs to fill in missing ancestors.
+    """
+    dirs = []
+    files = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as it:
+            for entry in it:
+                rel_path = rel_dir + "/" + entry.name if rel_dir else entry.name
+                if entry.is_dir():
+                    dirs.append(rel_path)
+                    stack.append(rel_path)
+                else:
+                    files.append(rel_path)
+    dirs.sort()
+    files.sort()
+    return dirs, files
+
+
+def walk_files(root):
+    return scan_tree(root)[1]
+
+
+def snapshot_files(root):
+    """Map every file under root to [size, mtime_ns, inode].
+
+    A file the build left alone keeps all three, so two snapshots differ
+    exactly where something was written or replaced.
+    """
+    if not os.path.isdir(root):
+        return {}
+    snapshot = {}
+    for rel_path in walk_files(root):
+        st = os.stat(os.path.join(root, rel_path))
+        snapshot[rel_path] = [st.st_size, st.st_mtime_ns, st.st_ino]
+    return snapshot
+
+
+def diff_snapshots(old, new):
+    """Return (changed, deleted): sorted paths new or different in new, and paths only in old."""
+    changed = [rel_path for rel_path, entry in sorted(new.items()) if old.get(rel_path) != entry]
+    deleted = sorted(rel_path for rel_path in old if rel_path not in new)
+    return changed, deleted
+
+
+def copy_files(pairs, workers=DEFAULT_WORKERS, copy_function=shutil.copy):
+    """Copy (rel_path, source, target) triples over a bounded thread pool.
+
+    Target directories must already exist. Returns a list of
+    (rel_path, exception) for every copy that failed; a failure never stops
+    the remaining copies.
+    """
+    errors = []
+    if workers <= 1:
+        for rel_path, source, target in pairs:
+            try:
+                copy_function(source, target)
+            except OSError as e:
+                errors.append((rel_path, e))
+        return errors
+
+    max_pending = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        for rel_path, source, target in pairs:
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _collect(future, pending.pop(future), errors)
+            pending[executor.submit(copy_function, source, target)] = rel_path
+        for future in list(pending):
+            _collect(future, pending.pop(future), errors)
+    errors.sort(key=lambda item: item[0])
+    return errors
+
+
+def _collect(future, rel_path, errors):
+    error = future.exception()
+    if error is None:
+        return
+    if not isinstance(error, OSError):
+        raise error
+    errors.append((rel_path, error))
+
+
+def remove_empty_parents(path, stop):
+    """Remove the directories above path that are empty, up to but not including stop."""
+    parent = os.path.dirname(path)
+    while parent != stop and parent.startswith(stop):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            return
+        parent = os.path.dirname(parent)
+
+
+def _manifest_entry(path, st):
+    return {"size": st.st_size, "mtime": st.st_mtime_ns, "hash": hash_file(path)}
+
+
+def sync_static(source_dir, target_dir, manifest_path, workers=DEFAULT_WORKERS, copy_function=shutil.copy, verify=False):
+    """Mirror source_dir into target_dir, touching only what changed.
+
+    The manifest records size, mtime and sha256 of every file copied on the
+    previous run. Files whose size and mtime are unchanged are skipped
+    without being read; files whose stat changed are hashed and only copied
+    if their content differs. Files that disappeared from source_dir are
+    removed from target_dir, anything else in target_dir is left alone.
+    A target with no manifest entry, such as one published by a full copy
+    or before the manifest was lost, is compared with its source and left
+    untouched when it already holds the new content. With verify, neither
+    the stat nor the recorded hash is trusted: every target is compared
+    with its source byte for byte, unless it is a hardlink to it. Copies go
+    through a temporary file and a rename, so a target is never seen
+    half-written.
+    """
+    old_manifest = load_manifest(manifest_path)
+    new_manifest = {}
+    result = CopyResult()
+    to_copy = []
+
+    for rel_path in walk_files(source_dir):
+        source_path = os.path.join(source_dir, rel_path)
+        target_path = os.path.join(target_dir, rel_path)
+        st = os.stat(source_path)
+        entry = old_manifest.get(rel_path)
+        stat_unchanged = entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns
+        target_ok = os.path.isfile(target_path) and os.path.getsize(target_path) == st.st_size
+
+        if verify:
+            matches = target_ok and (
+                os.path.samefile(source_path, target_path) or same_content(source_path, target_path)
+            )
+            # The recorded hash still describes a source whose stat is unchanged.
+            new_manifest[rel_path] = entry if matches and stat_unchanged else _manifest_entry(source_path, st)
+        elif stat_unchanged and target_ok:
+            matches = True
+            new_manifest[rel_path] = entry
+        else:
+            new_manifest[rel_path] = _manifest_entry(source_path, st)
+            digest = new_manifest[rel_path]["hash"]
+            matches = target_ok and (entry["hash"] == digest if entry else same_content(source_path, target_path))
+
+        if matches:
+            result.skipped.append(rel_path)
+        else:
+            to_copy.append((rel_path, source_path, target_path))
+
+    for parent in sorted({os.path.dirname(target_path) for _, _, target_path in to_copy}):
+        os.makedirs(parent, exist_ok=True)
+    result.errors = copy_files(to_copy, workers, partial(copy_atomic, copy_function=copy_function))
+    failed = {rel_path for rel_path, _ in result.errors}
+    for rel_path, _, _ in to_copy:
+        if rel_path in failed:
+            # Forget the entry so the next run retries the copy.
+            del new_manifest[rel_path]
+        else:
+            result.copied.append(rel_path)
+
+    for rel_path in sorted(old_manifest):
+        # A failed copy keeps whatever target it had; its source still exists.
+        if rel_path in new_manifest or rel_path in failed:
+            continue
+        target_path = os.path.join(target_dir, rel_path)
+        if os.path.isfile(target_path):
+            os.remove(target_path)
+            remove_empty_parents(target_path, target_dir)
+        result.deleted.append(rel_path)
+
+    save_manifest(manifest_path, new_manifest)
+    return result
+
+
+def copy_static_to_public(dir, sync=False, workers=DEFAULT_WORKERS, strategy="auto"):
+    """Publish static/ into public/, leaving files that already match untouched.
+
+    Both modes keep .cache/static-manifest.json and remove the files it
+    lists once they are gone from static/; other files in public/ are left
+    alone. By default every file is compared with its published copy by
+    content; with sync, files whose size and mtime match the manifest are
+    skipped without being read.
+    """
+    source_dir = os.path.join(dir, "static")
+    target_dir = os.path.join(dir, "public")
+
+    if not os.path.exists(source_dir):
+        raise FileNotFoundError(f"Source directory '{source_dir}' does not exist")
+
+    copy_function = get_copy_function(strategy, source_dir, target_dir)
+    manifest_path = os.path.join(dir, ".cache", "static-manifest.json")
+    result = sync_static(source_dir, target_dir, manifest_path, workers, copy_function, verify=not sync)
+    result.strategy = strategy_name(copy_function)
+
+    if result.errors:
+        raise CopyError(result)
+    return result
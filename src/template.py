@@ -0,0 +1,115 @@
+import os
+import re
+
+from static_files import hash_file
+
+PARTIAL_PATTERN = re.compile(r"\{\{>\s*([^}\s]+)\s*\}\}")
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def load_template(path):
+    """Read a template and expand its {{> partial }} includes.
+
+    Partial paths are relative to the file that includes them. Returns the
+    expanded text and the list of files it was built from, template first.
+    """
+    dependencies = []
+    text = _expand(os.path.normpath(path), dependencies, ())
+    return text, dependencies
+
+
+def _expand(path, dependencies, including):
+    if path in including:
+        chain = " -> ".join(including + (path,))
+        raise ValueError(f"Template include cycle: {chain}")
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path not in dependencies:
+        dependencies.append(path)
+
+    base_dir = os.path.dirname(path)
+
+    def include(match):
+        partial_path = os.path.normpath(os.path.join(base_dir, match.group(1)))
+        return _expand(partial_path, dependencies, including + (path,))
+
+    return PARTIAL_PATTERN.sub(include, text)
+
+
+class CompiledTemplate:
+    """A template split once into static chunks around its {{ Name }} slots.
+
+    chunks has one more entry than slots: chunk i comes before slot i, and
+    the last chunk ends the page. Filling it in is a single join, with no
+    rescanning of the template per placeholder. A slot with no value keeps
+    its placeholder text, as str.replace would have left it.
+    """
+
+    def __init__(self, chunks, slots, placeholders, dependencies=None, hashes=None):
+        self.chunks = chunks
+        self.slots = slots
+        self.placeholders = placeholders
+        self.dependencies = dependencies or []
+        self.hashes = hashes or {}
+
+    def iter_chunks(self, values):
+        """Yield the page's pieces in order: static chunks and slot values."""
+        chunks = self.chunks
+        yield chunks[0]
+        for i, name in enumerate(self.slots):
+            value = values.get(name)
+            yield self.placeholders[i] if value is None else value
+            yield chunks[i + 1]
+
+    def render(self, values):
+        return "".join(self.iter_chunks(values))
+
+    def write(self, fp, values):
+        """Write the page to the text file object fp without building it as one string."""
+        for chunk in self.iter_chunks(values):
+            if chunk:
+                fp.write(chunk)
+
+    def __repr__(self):
+        return f"CompiledTemplate(slots={self.slots}, chunks={len(self.chunks)}, dependencies={len(self.dependencies)})"
+
+
+def compile_template(text, dependencies=None, hashes=None):
+    """Split expanded template text into a CompiledTemplate."""
+    chunks = []
+    slots = []
+    placeholders = []
+    pos = 0
+    for match in SLOT_PATTERN.finditer(text):
+        chunks.append(text[pos:match.start()])
+        slots.append(match.group(1))
+        placeholders.append(match.group(0))
+        pos = match.end()
+    chunks.append(text[pos:])
+    return CompiledTemplate(chunks, slots, placeholders, dependencies, hashes)
+
+
+# Compiled templates by normalized path, kept while every file they were
+# built from still has the same content hash.
+_compiled = {}
+
+
+def load_compiled_template(path):
+    """Load, expand and compile the template at path, compiling each version only once.
+
+    The template and its partials are hashed on every call; while none of
+    them changed, the previously compiled template is returned. Its hashes
+    map each dependency to its sha256, so callers need not hash them again.
+    """
+    path = os.path.normpath(path)
+    cached = _compiled.get(path)
+    if cached is not None:
+        try:
+            if all(hash_file(dependency) == digest for dependency, digest in cached.hashes.items()):
+                return cached
+        except FileNotFoundError:
+            pass
+    text, dependencies = load_template(path)
+    hashes = {dependency: hash_file(dependency) for dependency in dependencies}
+    compiled = _compiled[path] = compile_template(text, dependencies, hashes)
+    return compiled
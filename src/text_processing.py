@@ -1,57 +1,90 @@
-from textnode import TextNode, TextType, BlockType
+from textnode import TextNode, TextSpan, TextType, BlockType
 import re
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)")
+LINK_PATTERN = re.compile(r"\[([^\[\]]*)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)")
+
+def _span_of(node):
+    # Where node's text lives: its own source span, or the whole text.
+    if isinstance(node, TextSpan):
+        return node.source, node.start, node.end
+    return node.text, 0, len(node.text)
+
+def _piece(like, source, start, end, text_type, url=None):
+    # Split a span into spans of the same source, and a plain node into plain nodes.
+    if isinstance(like, TextSpan):
+        return TextSpan(source, start, end, text_type, url)
+    return TextNode(source[start:end], text_type, url)
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
+    if not delimiter:
+        raise ValueError("empty separator")
     new_nodes = []
-    
+    size = len(delimiter)
+
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
-        
-        text = node.text
-        segments = text.split(delimiter)
+
+        source, start, end = _span_of(node)
+        segments = []
+        pos = start
+        while True:
+            found = source.find(delimiter, pos, end)
+            if found == -1:
+                break
+            segments.append((pos, found))
+            pos = found + size
+        segments.append((pos, end))
 
         if len(segments) % 2 == 0:
-            raise ValueError(f"Invalid Markdown syntax: unclosed delimiter '{delimiter}' in text: {text}")
-        
-        for i, segment in enumerate(segments):
-            if segment == "":
+            raise ValueError(f"Invalid Markdown syntax: unclosed delimiter '{delimiter}' in text: {node.text}")
+
+        for i, (segment_start, segment_end) in enumerate(segments):
+            if segment_start == segment_end:
                 continue
-            if i % 2 == 0:
-                new_nodes.append(TextNode(segment, TextType.TEXT))
-            else:
-                new_nodes.append(TextNode(segment, text_type))
+            segment_type = TextType.TEXT if i % 2 == 0 else text_type
+            new_nodes.append(_piece(node, source, segment_start, segment_end, segment_type))
     
     return new_nodes
 
-def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)"
-    matches = []
+def _image_matches(text, start=0, end=None):
+    if end is None:
+        end = len(text)
+    for match in IMAGE_PATTERN.finditer(text, start, end):
+        if match.start() > start and text[match.start() - 1] == '\\':
+            continue
+        yield match
 
-    for match in re.finditer(pattern, text):
-        if match.start() > 0 and text[match.start() - 1] == '\\':
+def _link_matches(text, start=0, end=None):
+    if end is None:
+        end = len(text)
+    for match in LINK_PATTERN.finditer(text, start, end):
+        if match.start() > start and text[match.start() - 1] in '\\!':
             continue
-        alt_text = match.group(1)
-        url = match.group(2)
-        matches.append((alt_text, url))
+        yield match
 
-    return matches
+def extract_markdown_images(text):
+    return [(match.group(1), match.group(2)) for match in _image_matches(text)]
 
 def extract_markdown_links(text):
-    pattern = r"\[([^\[\]]*)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)"
-    matches = []
-
-    for match in re.finditer(pattern, text):
-        if match.start() > 0 and text[match.start() - 1] == '\\':
-            continue
-        if match.start() > 0 and text[match.start() - 1] == '!':
-            continue
-        link_text = match.group(1)
-        url = match.group(2)
-        matches.append((link_text, url))
+    return [(match.group(1), match.group(2)) for match in _link_matches(text)]
 
-    return matches
+def _split_on_matches(node, matches, text_type, new_nodes):
+    source, start, end = _span_of(node)
+    pos = start
+    found = False
+    for match in matches:
+        found = True
+        if match.start() > pos:
+            new_nodes.append(_piece(node, source, pos, match.start(), TextType.TEXT))
+        new_nodes.append(_piece(node, source, match.start(1), match.end(1), text_type, match.group(2)))
+        pos = match.end()
+    if not found:
+        new_nodes.append(node)
+    elif pos < end:
+        new_nodes.append(_piece(node, source, pos, end, TextType.TEXT))
 
 def split_nodes_link(old_nodes):
     new_nodes = []
@@ -59,34 +92,7 @@ def split_nodes_link(old_nodes):
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
-        
-        text = node.text
-        links = extract_markdown_links(text)
-        
-        if not links:
-            new_nodes.append(node)
-            continue
-        
-        temp_text = text
-        segments = []
-        
-        for link_text, url in links:
-            link_pattern = f"[{link_text}]({url})"
-            if link_pattern in temp_text:
-                before, after = temp_text.split(link_pattern, 1)
-                if before:
-                    segments.append(TextNode(before, TextType.TEXT))
-                segments.append(TextNode(link_text, TextType.LINK, url))
-                temp_text = after
-            else:
-                if temp_text:
-                    segments.append(TextNode(temp_text, TextType.TEXT))
-                break
-        if temp_text and (not segments or segments[-1].text_type != TextType.TEXT):
-            segments.append(TextNode(temp_text, TextType.TEXT))
-        
-        new_nodes.extend(segments)
-    
+        _split_on_matches(node, _link_matches(*_span_of(node)), TextType.LINK, new_nodes)
     return new_nodes
 
 def split_nodes_image(old_nodes):
@@ -95,54 +101,270 @@ def split_nodes_image(old_nodes):
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
-        
-        text = node.text
-        images = extract_markdown_images(text)
-        
-        if not images:
-            new_nodes.append(node)
-            continue
-        
-        temp_text = text
-        segments = []
-        
-        for alt_text, url in images:
-            image_pattern = f"![{alt_text}]({url})"
-            if image_pattern in temp_text:
-                before, after = temp_text.split(image_pattern, 1)
-                if before:
-                    segments.append(TextNode(before, TextType.TEXT))
-                segments.append(TextNode(alt_text, TextType.IMAGE, url))
-                temp_text = after
-            else:
-                if temp_text:
-                    segments.append(TextNode(temp_text, TextType.TEXT))
-                break
-        
-        if temp_text and (not segments or segments[-1].text_type != TextType.TEXT):
-            segments.append(TextNode(temp_text, TextType.TEXT))
-        
-        new_nodes.extend(segments)
-    
+        _split_on_matches(node, _image_matches(*_span_of(node)), TextType.IMAGE, new_nodes)
     return new_nodes
 
-def text_to_textnodes(text):
+# Split in this order inside the text between links and images: code spans
+# first, so their contents are never split further, then bold, then italic.
+INLINE_DELIMITERS = (("`", TextType.CODE), ("**", TextType.BOLD), ("_", TextType.ITALIC))
+
+def text_to_textnodes(text, spans=False):
+    """Split inline markdown into TextNodes in a single left-to-right walk.
+
+    Produces the same nodes as running split_nodes_image, split_nodes_link
+    and split_nodes_delimiter for code, bold and italic in turn, but works
+    on offsets into `text` instead of building a new node list per pass.
+    With spans, the nodes are TextSpans into `text` and no substring is
+    copied until a node's text is read.
+    """
     if text == "":
         return [TextNode("", TextType.TEXT)]
 
-    nodes = [TextNode(text, TextType.TEXT)] 
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-
+    nodes = []
+    pos = 0
+    for match in _image_matches(text):
+        _scan_links(text, pos, match.start(), nodes, spans)
+        if spans:
+            nodes.append(TextSpan(text, match.start(1), match.end(1), TextType.IMAGE, match.group(2)))
+        else:
+            nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        pos = match.end()
+    _scan_links(text, pos, len(text), nodes, spans)
     return nodes
 
+def _scan_links(text, start, end, nodes, spans):
+    pos = start
+    for match in _link_matches(text, start, end):
+        _scan_delimiters(text, pos, match.start(), 0, nodes, spans)
+        if spans:
+            nodes.append(TextSpan(text, match.start(1), match.end(1), TextType.LINK, match.group(2)))
+        else:
+            nodes.append(TextNode(match.group(1), TextType.LINK, match.group(2)))
+        pos = match.end()
+    _scan_delimiters(text, pos, end, 0, nodes, spans)
+
+def _scan_delimiters(text, start, end, level, nodes, spans):
+    if start >= end:
+        return
+    if level == len(INLINE_DELIMITERS):
+        nodes.append(TextSpan(text, start, end, TextType.TEXT) if spans else TextNode(text[start:end], TextType.TEXT))
+        return
+
+    delimiter, text_type = INLINE_DELIMITERS[level]
+    size = len(delimiter)
+    pos = start
+    while True:
+        open_at = text.find(delimiter, pos, end)
+        if open_at == -1:
+            break
+        close_at = text.find(delimiter, open_at + size, end)
+        if close_at == -1:
+            raise ValueError(
+                f"Invalid Markdown syntax: unclosed delimiter '{delimiter}' at offset {open_at} in text: {text[start:end]}"
+            )
+        _scan_delimiters(text, pos, open_at, level + 1, nodes, spans)
+        if close_at > open_at + size:
+            if spans:
+                nodes.append(TextSpan(text, open_at + size, close_at, text_type))
+            else:
+                nodes.append(TextNode(text[open_at + size:close_at], text_type))
+        pos = close_at + size
+    _scan_delimiters(text, pos, end, level + 1, nodes, spans)
+
+# The tags text_node_to_html_node renders each delimited text type with.
+_INLINE_TAGS = {TextType.CODE: "code", TextType.BOLD: "b", TextType.ITALIC: "i"}
+_DELIMITER_HTML = tuple(
+    (delimiter, f"<{_INLINE_TAGS[text_type]}>", f"</{_INLINE_TAGS[text_type]}>")
+    for delimiter, text_type in INLINE_DELIMITERS
+)
+
+def text_to_html(text, parts):
+    """Append to parts the HTML of text's inline nodes, without building any nodes.
+
+    The pieces join to what the leaves text_to_textnodes(text) converts to
+    would render, and the same ValueErrors are raised: a delimiter error
+    first, then the first link or image without a URL. Returns how many
+    nodes text_to_textnodes would have produced.
+    """
+    if text == "":
+        return 1
+
+    missing_url = []
+    count = 0
+    pos = 0
+    for match in _image_matches(text):
+        count += _links_to_html(text, pos, match.start(), parts, missing_url) + 1
+        url = match.group(2)
+        if not url:
+            missing_url.append("Image TextNode must have a URL")
+        parts.append(f'<img src="{url}" alt="{match.group(1)}">')
+        pos = match.end()
+    count += _links_to_html(text, pos, len(text), parts, missing_url)
+    if missing_url:
+        raise ValueError(missing_url[0])
+    return count
+
+def textnodes_to_html(text_nodes, parts):
+    """Append to parts the HTML the leaves of text_nodes would render.
+
+    Raises the ValueError text_node_to_html_node raises for the first link
+    or image without a URL.
+    """
+    for node in text_nodes:
+        text_type = node.text_type
+        if text_type == TextType.TEXT:
+            parts.append(node.text)
+        elif text_type == TextType.LINK:
+            if not node.url:
+                raise ValueError("Link TextNode must have a URL")
+            parts.append(f'<a href="{node.url}">{node.text}</a>')
+        elif text_type == TextType.IMAGE:
+            if not node.url:
+                raise ValueError("Image TextNode must have a URL")
+            parts.append(f'<img src="{node.url}" alt="{node.text}">')
+        else:
+            tag = _INLINE_TAGS[text_type]
+            parts.append(f"<{tag}>{node.text}</{tag}>")
+
+def _links_to_html(text, start, end, parts, missing_url):
+    count = 0
+    pos = start
+    for match in _link_matches(text, start, end):
+        count += _delimiters_to_html(text, pos, match.start(), 0, parts) + 1
+        url = match.group(2)
+        if not url:
+            missing_url.append("Link TextNode must have a URL")
+        parts.append(f'<a href="{url}">{match.group(1)}</a>')
+        pos = match.end()
+    return count + _delimiters_to_html(text, pos, end, 0, parts)
+
+def _delimiters_to_html(text, start, end, level, parts):
+    if start >= end:
+        return 0
+    if level == len(_DELIMITER_HTML):
+        parts.append(text[start:end])
+        return 1
+
+    delimiter, open_tag, close_tag = _DELIMITER_HTML[level]
+    size = len(delimiter)
+    count = 0
+    pos = start
+    while True:
+        open_at = text.find(delimiter, pos, end)
+        if open_at == -1:
+            break
+        close_at = text.find(delimiter, open_at + size, end)
+        if close_at == -1:
+            raise ValueError(
+                f"Invalid Markdown syntax: unclosed delimiter '{delimiter}' at offset {open_at} in text: {text[start:end]}"
+            )
+        count += _delimiters_to_html(text, pos, open_at, level + 1, parts)
+        if close_at > open_at + size:
+            parts.append(open_tag + text[open_at + size:close_at] + close_tag)
+            count += 1
+        pos = close_at + size
+    return count + _delimiters_to_html(text, pos, end, level + 1, parts)
+
 def markdown_to_blocks(markdown):
     blocks = markdown.split("\n\n")
     return [block.strip() for block in blocks if block.strip()]
 
+def iter_blocks(lines):
+    """Yield the blocks markdown_to_blocks would return, from an iterable of lines.
+
+    Accepts a file object (lines keep their "\n") or any other line
+    iterable, and yields each block as soon as the blank line ending it is
+    read, so only the current block is ever held in memory.
+    """
+    block_lines = []
+    for line in lines:
+        if line.endswith("\n"):
+            line = line[:-1]
+        if line:
+            block_lines.append(line)
+            continue
+        if block_lines:
+            block = "\n".join(block_lines).strip()
+            block_lines = []
+            if block:
+                yield block
+    if block_lines:
+        block = "\n".join(block_lines).strip()
+        if block:
+            yield block
+
+HEADING_PREFIXES = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
+# "1. ", "2. ", ...: grown on demand so no item marker is formatted twice.
+_ORDERED_PREFIXES = []
+
+class Block:
+    """A block as found by scan_blocks, classified and ready to render.
+
+    lines are the lines of the block markdown_to_blocks returns. level is
+    the heading level. For quotes and lists, starts holds the offset in
+    each line where its text begins, just past the marker. fenced is False
+    for a two-line ``` block, which is code to block_to_block_type but
+    renders as a plain paragraph.
+    """
+
+    def __init__(self, block_type, lines, level=0, starts=None, fenced=False):
+        self.block_type = block_type
+        self.lines = lines
+        self.level = level
+        self.starts = starts
+        self.fenced = fenced
+
+    def __repr__(self):
+        return f"Block({self.block_type}, {self.lines!r}, level={self.level}, starts={self.starts!r}, fenced={self.fenced})"
+
+def scan_block(block):
+    """Classify a stripped block, splitting it into lines exactly once.
+
+    Quote and unordered list checks count line starts in the block text
+    instead of looping over lines; only a block opening with "1. " has its
+    lines walked, and that walk records where each item's text starts.
+    """
+    lines = block.split("\n")
+    first = lines[0]
+    last = lines[-1]
+    marker = first[:1]
+
+    if marker == "`" and first.startswith("```"):
+        if len(lines) >= 3 and last.lstrip().startswith("```"):
+            return Block(BlockType.CODE, lines, fenced=True)
+        if len(lines) > 1 and last.startswith("```"):
+            return Block(BlockType.CODE, lines)
+    elif marker == "#":
+        if first.startswith(HEADING_PREFIXES) and (len(lines) > 1 or len(first.strip("#")) != 1):
+            return Block(BlockType.HEADING, lines, level=len(first) - len(first.lstrip("#")))
+    elif marker == ">":
+        if block.count("\n>") == len(lines) - 1:
+            starts = [2 if line.startswith("> ") else 1 for line in lines]
+            return Block(BlockType.QUOTE, lines, starts=starts)
+    elif marker == "-":
+        if first.startswith("- ") and block.count("\n- ") == len(lines) - 1:
+            return Block(BlockType.UNORDERED_LIST, lines, starts=[2] * len(lines))
+    elif marker == "1":
+        starts = _ordered_starts(lines)
+        if starts is not None:
+            return Block(BlockType.ORDERED_LIST, lines, starts=starts)
+    return Block(BlockType.PARAGRAPH, lines)
+
+def _ordered_starts(lines):
+    while len(_ORDERED_PREFIXES) < len(lines):
+        _ORDERED_PREFIXES.append(f"{len(_ORDERED_PREFIXES) + 1}. ")
+    starts = []
+    for line, prefix in zip(lines, _ORDERED_PREFIXES):
+        if len(line) <= len(prefix) or not line.startswith(prefix):
+            return None
+        starts.append(len(prefix) - 1)
+    return starts
+
+def scan_blocks(lines):
+    """Yield a scanned Block for each block iter_blocks finds in lines."""
+    for block in iter_blocks(lines):
+        yield scan_block(block)
+
 def block_to_block_type(block):
     lines = block.split("\n")
 
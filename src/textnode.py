@@ -18,6 +18,8 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -33,6 +35,55 @@ class TextNode:
     def __repr__(self):
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
     
+class TextSpan(TextNode):
+    """A TextNode for source[start:end] that slices out its text only when read.
+
+    source, start and end stay set once the text is materialized, so a span
+    can always say where in its source it came from.
+    """
+
+    __slots__ = ("source", "start", "end", "_text")
+
+    def __init__(self, source, start, end, text_type, url=None):
+        self.source = source
+        self.start = start
+        self.end = end
+        self._text = None
+        self.text_type = text_type
+        self.url = url
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.source[self.start:self.end]
+        return self._text
+
+class FrozenTextNode(TextNode):
+    """An immutable TextNode, for parse results shared between pages."""
+
+    __slots__ = ()
+
+    def __init__(self, text, text_type, url=None):
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "text_type", text_type)
+        object.__setattr__(self, "url", url)
+
+    @classmethod
+    def of(cls, node):
+        """Return node itself if already frozen, else a frozen copy of it."""
+        if type(node) is cls:
+            return node
+        return cls(node.text, node.text_type, node.url)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"FrozenTextNode({self.text}, {self.text_type.value}, {self.url})"
+
 def text_node_to_html_node(text_node):  
     if text_node.text_type == TextType.TEXT:
         return LeafNode(None, text_node.text)
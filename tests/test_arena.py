@@ -0,0 +1,104 @@
+import random
+import unittest
+
+from arena import NONE, ArenaBuilder, markdown_to_arena
+from htmlnode import HTMLNode, LeafNode, ParentNode
+from markdown_to_html import markdown_to_html_node
+
+MARKDOWN = """# Title
+
+Some **bold** and _italic_ text with a [link](https://example.com) and ![img](/a.png)
+
+- one
+- two with `code`
+
+> quoted
+
+```
+code block
+```
+"""
+
+
+class TestArena(unittest.TestCase):
+    def test_markdown_to_arena_matches_to_html(self):
+        tree = markdown_to_arena(MARKDOWN)
+        self.assertEqual(tree.render(), markdown_to_html_node(MARKDOWN).to_html())
+
+    def test_iter_html_in_batches(self):
+        markdown = "\n\n".join(f"- item {i}\n- **item** {i}" for i in range(300))
+        tree = markdown_to_arena(markdown)
+        chunks = list(tree.iter_html(batch_size=16))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), markdown_to_html_node(markdown).to_html())
+
+    def test_links_and_shared_tables(self):
+        tree = markdown_to_arena("[a](/x) [b](/x)\n\n[c](/x)")
+        self.assertEqual(tree.props, [(("href", "/x"),)])
+        self.assertEqual(tree.tags, ["div", "p", "a"])
+        root_children = list(tree.children(0))
+        self.assertEqual(len(root_children), 2)
+        self.assertTrue(all(tree.parents[child] == 0 for child in root_children))
+        self.assertEqual(tree.parents[0], NONE)
+
+    def test_to_node_round_trip(self):
+        node = markdown_to_html_node(MARKDOWN)
+        builder = ArenaBuilder()
+        builder.add(node)
+        view = builder.build().to_node()
+        self.assertIsInstance(view, ParentNode)
+        self.assertEqual(view.to_html(), node.to_html())
+        self.assertEqual(view.children[1].children[-1].props, node.children[1].children[-1].props)
+
+    def test_subtree_render(self):
+        tree = markdown_to_arena(MARKDOWN)
+        heading = tree.first_child[0]
+        self.assertEqual(tree.render(heading), "<h1>Title</h1>")
+
+    def test_deep_tree(self):
+        node = LeafNode(None, "deep")
+        for _ in range(5000):
+            node = ParentNode("blockquote", [node])
+        builder = ArenaBuilder()
+        builder.add(node)
+        self.assertEqual(builder.build().render(), node.to_html())
+
+    def test_errors_match_to_html(self):
+        cases = [
+            ParentNode("div", [ParentNode("p", [])]),
+            ParentNode("div", [LeafNode("b", None)]),
+            ParentNode(None, [LeafNode(None, "x")]),
+        ]
+        for node in cases:
+            builder = ArenaBuilder()
+            builder.add(node)
+            with self.assertRaises(ValueError) as arena_error:
+                builder.build().render()
+            with self.assertRaises(ValueError) as node_error:
+                node.to_html()
+            self.assertEqual(str(arena_error.exception), str(node_error.exception))
+
+    def test_custom_nodes_are_kept_as_html(self):
+        class Comment(HTMLNode):
+            def to_html(self):
+                return "<!-- c -->"
+
+        node = ParentNode("div", [Comment(), LeafNode("br", "")])
+        builder = ArenaBuilder()
+        builder.add(node)
+        self.assertEqual(builder.build().render(), "<div><!-- c --><br></div>")
+
+    def test_random_documents(self):
+        rng = random.Random(7)
+        lines = ["# h", "text **b**", "- a", "- [l](/u)", "1. x", "2. y", "> q", "```", "code", "![i](/i.png)", ""]
+        for _ in range(300):
+            markdown = "\n".join(rng.choice(lines) for _ in range(rng.randint(1, 15)))
+            try:
+                expected = markdown_to_html_node(markdown).to_html()
+            except ValueError:
+                continue
+            self.assertEqual(markdown_to_arena(markdown).render(), expected, repr(markdown))
+
+
+if __name__ == "__main__":
+    unittest.main()
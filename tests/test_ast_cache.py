@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import ast_cache
+from ast_cache import ASTCache, content_key, decode_node, encode_node, parse_cached
+from htmlnode import LeafNode, ParentNode
+from markdown_to_html import markdown_to_html_node
+
+MARKDOWN = "# Title\n\nSome **bold** and a [link](https://example.com)\n\n- one\n- two"
+
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        node = markdown_to_html_node(MARKDOWN)
+        decoded = decode_node(encode_node(node))
+        self.assertEqual(decoded.to_html(), node.to_html())
+        self.assertIsInstance(decoded, ParentNode)
+        self.assertIsInstance(decoded.children[0].children[0], LeafNode)
+
+    def test_props_survive(self):
+        node = ParentNode("p", [LeafNode("img", "", {"src": "a.png", "alt": "A"})], {"class": "x"})
+        self.assertEqual(decode_node(encode_node(node)).to_html(), '<p class="x"><img src="a.png" alt="A"></p>')
+
+
+class TestASTCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ast")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_miss_then_hit_skips_parsing(self):
+        cache = ASTCache(self.path)
+        calls = []
+
+        def parse(markdown):
+            calls.append(markdown)
+            return markdown_to_html_node(markdown)
+
+        first = parse_cached(MARKDOWN, cache, parse)
+        second = parse_cached(MARKDOWN, cache, parse)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first.to_html(), second.to_html())
+
+    def test_parser_version_change_invalidates(self):
+        cache = ASTCache(self.path)
+        cache.put(content_key(MARKDOWN), markdown_to_html_node(MARKDOWN))
+        with mock.patch.object(ast_cache, "PARSER_VERSION", "next"):
+            cache = ASTCache(self.path)
+        self.assertIsNone(cache.get(content_key(MARKDOWN)))
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = ASTCache(self.path)
+        key = content_key(MARKDOWN)
+        cache.put(key, markdown_to_html_node(MARKDOWN))
+        with open(os.path.join(self.path, key[:2], key[2:]), "wb") as f:
+            f.write(b"\x00garbage")
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(os.path.exists(os.path.join(self.path, key[:2], key[2:])))
+
+    def test_prune_evicts_least_recently_used(self):
+        cache = ASTCache(self.path)
+        keys = []
+        for i in range(4):
+            markdown = f"# Page {i}\n\n" + "text " * 200
+            key = content_key(markdown)
+            cache.put(key, markdown_to_html_node(markdown))
+            entry = os.path.join(self.path, key[:2], key[2:])
+            os.utime(entry, ns=(i * 10**9, i * 10**9))
+            keys.append(key)
+        entry_size = os.path.getsize(os.path.join(self.path, keys[0][:2], keys[0][2:]))
+        cache.max_bytes = entry_size * 2 + entry_size // 2
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertEqual(cache.prune(), 2)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNone(cache.get(keys[2]))
+        self.assertIsNotNone(cache.get(keys[3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
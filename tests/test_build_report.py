@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import unittest
+
+from build_report import NULL_TIMER, BuildReport, StageTimer
+from generate import generate_pages
+from markdown_to_html import markdown_to_html, markdown_to_html_node
+
+MARKDOWN = "# Title\n\nSome **bold** text\n\n- one\n- two\n\n```\ncode\n```"
+
+
+class TestStageTimer(unittest.TestCase):
+    def test_wrap_and_stage_accumulate(self):
+        timer = StageTimer()
+        double = timer.wrap("math", lambda x: x * 2)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(3), 6)
+        with timer.stage("io"):
+            pass
+        self.assertEqual(sorted(timer.stages), ["io", "math"])
+        self.assertTrue(all(wall >= 0 and cpu >= 0 for wall, cpu in timer.stages.values()))
+
+    def test_parse_is_split_into_tree(self):
+        timer = StageTimer()
+        timer.add("parse", 1.0, 0.8)
+        timer.add("blocks", 0.1, 0.1)
+        timer.add("inline", 0.5, 0.4)
+        stats = timer.as_dict()
+        self.assertNotIn("parse", stats["stages"])
+        self.assertAlmostEqual(stats["stages"]["tree"][0], 0.4)
+        self.assertAlmostEqual(stats["stages"]["tree"][1], 0.3)
+
+    def test_render_is_split_into_to_html(self):
+        timer = StageTimer()
+        timer.add("blocks", 0.1, 0.1)
+        timer.add("render", 1.0, 0.8)
+        timer.add("inline", 0.5, 0.4)
+        stats = timer.as_dict()
+        self.assertNotIn("render", stats["stages"])
+        self.assertNotIn("tree", stats["stages"])
+        self.assertAlmostEqual(stats["stages"]["to_html"][0], 0.5)
+        self.assertAlmostEqual(stats["stages"]["to_html"][1], 0.4)
+
+    def test_null_timer(self):
+        function = len
+        self.assertIs(NULL_TIMER.wrap("x", function), function)
+        with NULL_TIMER.stage("x"):
+            pass
+        NULL_TIMER.count_io(10, 20)
+
+    def test_markdown_to_html_node_with_timer(self):
+        timer = StageTimer()
+        html = markdown_to_html_node(MARKDOWN, timer=timer).to_html()
+        self.assertEqual(html, markdown_to_html_node(MARKDOWN).to_html())
+        self.assertEqual(sorted(timer.stages), ["blocks", "inline"])
+
+    def test_markdown_to_html_with_timer(self):
+        timer = StageTimer()
+        self.assertEqual(markdown_to_html(MARKDOWN, timer=timer), markdown_to_html(MARKDOWN))
+        self.assertEqual(sorted(timer.stages), ["blocks", "inline", "render"])
+
+
+class TestBuildReport(unittest.TestCase):
+    def make_report(self):
+        report = BuildReport()
+        report.add_page("a.md", {"stages": {"read": [0.001, 0.001], "inline": [0.002, 0.002]}, "bytes_read": 10, "bytes_written": 30})
+        report.add_page("b.md", {"stages": {"read": [0.001, 0.001], "inline": [0.009, 0.008]}, "bytes_read": 20, "bytes_written": 50})
+        report.add_page("c.md", {"stages": {"read": [0.002, 0.002]}, "bytes_read": 5, "bytes_written": 9})
+        report.wall = 0.5
+        return report
+
+    def test_totals_and_slowest(self):
+        report = self.make_report()
+        self.assertEqual([page["page"] for page in report.slowest(2)], ["b.md", "a.md"])
+        self.assertEqual(report.totals.bytes_read, 35)
+        self.assertEqual(report.totals.bytes_written, 89)
+        self.assertAlmostEqual(report.totals.stages["inline"][0], 0.011)
+
+    def test_format(self):
+        text = self.make_report().format(top_n=1)
+        self.assertIn("3 pages rendered in 0.500s", text)
+        self.assertIn("bytes read: 35, bytes written: 89", text)
+        self.assertIn("slowest 1 pages:", text)
+        self.assertIn("b.md", text)
+        self.assertNotIn("c.md", text)
+        self.assertLess(text.index("read"), text.index("inline"))
+
+    def test_inline_cache_counts_are_summed(self):
+        report = self.make_report()
+        self.assertNotIn("inline cache", report.format())
+        for hits in (3, 1):
+            stats = {"stages": {}, "bytes_read": 0, "bytes_written": 0}
+            stats["inline_cache"] = {"hits": hits, "misses": 2, "evictions": 0}
+            report.add_page("d.md", stats)
+        self.assertEqual(report.inline_cache, {"hits": 4, "misses": 4, "evictions": 0})
+        self.assertIn("inline cache: 4 hits, 4 misses (50.0% hit rate), 0 evictions", report.format())
+
+    def test_write_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.json")
+            self.make_report().write_json(path, top_n=2)
+            with open(path) as f:
+                data = json.load(f)
+        self.assertEqual(data["pages"], 3)
+        self.assertEqual([page["page"] for page in data["slowest"]], ["b.md", "a.md"])
+        self.assertEqual(data["stages"]["read"]["wall"], 0.004)
+
+    def test_generate_pages_collects_page_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            os.makedirs(content)
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w") as f:
+                f.write("{{ Title }}{{ Content }}")
+            with open(os.path.join(content, "index.md"), "w") as f:
+                f.write(MARKDOWN)
+            result = generate_pages(content, template, os.path.join(tmp, "public"), workers=1, report=True)
+        self.assertEqual(len(result.page_stats), 1)
+        page, stats = result.page_stats[0]
+        self.assertEqual(page, "index.md")
+        self.assertEqual(stats["bytes_read"], len(MARKDOWN))
+        # The report times the path a normal build takes, which builds no tree.
+        self.assertEqual(sorted(stats["stages"]), ["blocks", "inline", "read", "to_html", "write"])
+        self.assertNotIn("minify", stats)
+
+    def test_minify_savings_are_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            os.makedirs(content)
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w") as f:
+                f.write("<html>\n  <body>\n    {{ Content }}\n  </body>\n</html>\n")
+            with open(os.path.join(content, "index.md"), "w") as f:
+                f.write(MARKDOWN)
+            result = generate_pages(content, template, os.path.join(tmp, "public"), workers=1, report=True, minify=True)
+            with open(os.path.join(tmp, "public", "index.html"), "rb") as f:
+                written = len(f.read())
+        page, stats = result.page_stats[0]
+        self.assertIn("minify", stats["stages"])
+        self.assertEqual(stats["minify"]["bytes_out"], written)
+        self.assertGreater(stats["minify"]["bytes_in"], written)
+        report = BuildReport()
+        report.add_page(page, stats)
+        summary = report.minify_summary()
+        self.assertEqual(summary["bytes_saved"], stats["minify"]["bytes_in"] - written)
+        self.assertIn(f"saved {summary['bytes_saved']} ", report.format())
+        self.assertEqual(report.as_dict()["minify"], summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import errno
+import os
+import stat
+import tempfile
+import unittest
+
+import copy_strategies
+from copy_strategies import STRATEGIES, AutoCopier, get_copy_function, strategy_name
+
+
+class TestCopyStrategies(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.tmp.name, "static")
+        self.target_dir = os.path.join(self.tmp.name, "public")
+        os.makedirs(self.source_dir)
+        os.makedirs(self.target_dir)
+        self.source = os.path.join(self.source_dir, "image.png")
+        with open(self.source, "wb") as f:
+            f.write(os.urandom(256 * 1024))
+        os.chmod(self.source, 0o640)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_strategies_copy_content_and_mode(self):
+        for name, function in STRATEGIES.items():
+            with self.subTest(strategy=name):
+                target = os.path.join(self.target_dir, f"{name}.png")
+                try:
+                    function(self.source, target)
+                except OSError as e:
+                    if e.errno in copy_strategies.HARDLINK_UNSUPPORTED_ERRNOS:
+                        self.assertFalse(os.path.exists(target))
+                        continue
+                    raise
+                self.assertEqual(self.read(target), self.read(self.source))
+                self.assertEqual(stat.S_IMODE(os.stat(target).st_mode), 0o640)
+
+    def test_hardlink_replaces_existing_target(self):
+        target = os.path.join(self.target_dir, "image.png")
+        with open(target, "w") as f:
+            f.write("old")
+        STRATEGIES["hardlink"](self.source, target)
+        self.assertTrue(os.path.samefile(self.source, target))
+
+    def test_copies_never_write_through_a_hardlinked_target(self):
+        original = self.read(self.source)
+        for name, function in STRATEGIES.items():
+            with self.subTest(strategy=name):
+                target = os.path.join(self.target_dir, f"{name}.png")
+                other = os.path.join(self.source_dir, f"{name}-new.png")
+                with open(other, "wb") as f:
+                    f.write(b"new content")
+                os.link(self.source, target)
+                try:
+                    function(other, target)
+                except OSError as e:
+                    if e.errno in copy_strategies.HARDLINK_UNSUPPORTED_ERRNOS:
+                        continue
+                    raise
+                finally:
+                    self.assertEqual(self.read(self.source), original)
+                self.assertEqual(self.read(target), b"new content")
+
+    def test_auto_reraises_permission_errors(self):
+        def denied(source, target):
+            raise PermissionError(errno.EPERM, "Operation not permitted")
+
+        original = dict(STRATEGIES)
+        STRATEGIES["reflink"] = denied
+        try:
+            copier = AutoCopier(self.source_dir, self.target_dir)
+            copier.candidates.remove("hardlink")
+            with self.assertRaises(PermissionError):
+                copier(self.source, os.path.join(self.target_dir, "image.png"))
+        finally:
+            STRATEGIES.clear()
+            STRATEGIES.update(original)
+        self.assertEqual(copier.name, "reflink")
+
+    def test_auto_prefers_hardlink_on_same_filesystem(self):
+        copier = get_copy_function("auto", self.source_dir, self.target_dir)
+        target = os.path.join(self.target_dir, "image.png")
+        copier(self.source, target)
+        self.assertEqual(strategy_name(copier), "hardlink")
+        self.assertTrue(os.path.samefile(self.source, target))
+
+    def test_auto_without_hardlinks(self):
+        for strategy in ("auto", "hardlink"):
+            copier = get_copy_function(strategy, self.source_dir, self.target_dir, hardlink=False)
+            target = os.path.join(self.target_dir, f"{strategy}.png")
+            copier(self.source, target)
+            self.assertNotEqual(strategy_name(copier), "hardlink")
+            self.assertFalse(os.path.samefile(self.source, target))
+            self.assertEqual(self.read(target), self.read(self.source))
+
+    def test_auto_falls_back_on_unsupported(self):
+        def unsupported(source, target):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        original = dict(STRATEGIES)
+        STRATEGIES["hardlink"] = unsupported
+        STRATEGIES["reflink"] = unsupported
+        try:
+            copier = AutoCopier(self.source_dir, self.target_dir)
+            target = os.path.join(self.target_dir, "image.png")
+            copier(self.source, target)
+        finally:
+            STRATEGIES.clear()
+            STRATEGIES.update(original)
+        self.assertNotIn(copier.name, ("hardlink", "reflink"))
+        self.assertEqual(self.read(target), self.read(self.source))
+
+    def test_auto_reraises_real_errors(self):
+        copier = AutoCopier(self.source_dir, self.target_dir)
+        with self.assertRaises(FileNotFoundError):
+            copier(os.path.join(self.source_dir, "missing.png"), os.path.join(self.target_dir, "missing.png"))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError) as context:
+            get_copy_function("teleport", self.source_dir, self.target_dir)
+        self.assertEqual(str(context.exception), "Unknown copy strategy: teleport")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import fingerprint
+from fingerprint import (
+    asset_url,
+    fingerprint_static,
+    fingerprinted_name,
+    hash_files,
+    load_asset_manifest,
+    rewrite_asset_urls,
+    rewrite_template_asset_urls,
+)
+from htmlnode import LeafNode, ParentNode
+from static_files import hash_file
+from template import compile_template
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+class TestFingerprintStatic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        write(os.path.join(self.static, "index.css"), "body {}")
+        write(os.path.join(self.static, "images", "a.png"), "png-bytes")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprinted_name(self):
+        self.assertEqual(fingerprinted_name("images/a.png", "0123456789abcdef"), "images/a.01234567.png")
+        self.assertEqual(fingerprinted_name("LICENSE", "0123456789abcdef"), "LICENSE.01234567")
+
+    def test_writes_hashed_files_and_manifest(self):
+        manifest = fingerprint_static(self.root, workers=2)
+        digest = hash_file(os.path.join(self.static, "index.css"))
+        self.assertEqual(manifest["index.css"], f"index.{digest[:8]}.css")
+        self.assertEqual(load_asset_manifest(self.public), manifest)
+        for hashed_path in manifest.values():
+            self.assertTrue(os.path.isfile(os.path.join(self.public, hashed_path)))
+
+    def test_changed_file_replaces_old_fingerprint(self):
+        old = fingerprint_static(self.root)["index.css"]
+        write(os.path.join(self.static, "index.css"), "body { color: red; }")
+        new = fingerprint_static(self.root)["index.css"]
+        self.assertNotEqual(old, new)
+        self.assertFalse(os.path.exists(os.path.join(self.public, old)))
+        self.assertTrue(os.path.exists(os.path.join(self.public, new)))
+
+    def test_in_place_edit_leaves_fingerprinted_file_alone(self):
+        for strategy in ("auto", "hardlink"):
+            with self.subTest(strategy=strategy):
+                hashed = fingerprint_static(self.root, strategy=strategy)["index.css"]
+                source = os.path.join(self.static, "index.css")
+                published = os.path.join(self.public, hashed)
+                self.assertFalse(os.path.samefile(source, published))
+                with open(source, "a") as f:
+                    f.write("\n")
+                self.assertEqual(hash_file(published)[:8], hashed.split(".")[1])
+                write(source, "body {}")
+
+    def test_hardlinked_fingerprint_is_replaced(self):
+        hashed = fingerprint_static(self.root)["index.css"]
+        source = os.path.join(self.static, "index.css")
+        published = os.path.join(self.public, hashed)
+        os.remove(published)
+        os.link(source, published)
+        fingerprint_static(self.root)
+        self.assertFalse(os.path.samefile(source, published))
+        self.assertEqual(hash_file(published)[:8], hashed.split(".")[1])
+
+    def test_unchanged_files_are_not_rehashed(self):
+        fingerprint_static(self.root)
+        with mock.patch.object(fingerprint, "hash_file", side_effect=AssertionError("rehashed")):
+            fingerprint_static(self.root)
+
+    def test_hash_cache_drops_removed_files(self):
+        cache = {}
+        hash_files(self.static, ["index.css", "images/a.png"], cache)
+        hash_files(self.static, ["index.css"], cache)
+        self.assertEqual(list(cache), ["index.css"])
+
+
+class TestAssetRewriting(unittest.TestCase):
+    manifest = {"images/a.png": "images/a.1234abcd.png"}
+
+    def test_asset_url(self):
+        self.assertEqual(asset_url("/images/a.png", self.manifest), "/images/a.1234abcd.png")
+        self.assertEqual(asset_url("images/a.png", self.manifest), "images/a.1234abcd.png")
+        self.assertEqual(asset_url("./images/a.png?v=1", self.manifest), "./images/a.1234abcd.png?v=1")
+        self.assertEqual(asset_url("/images/b.png", self.manifest), "/images/b.png")
+        self.assertEqual(asset_url("https://example.com/images/a.png", self.manifest), "https://example.com/images/a.png")
+
+    def test_rewrite_asset_urls(self):
+        tree = ParentNode("div", [
+            ParentNode("p", [
+                LeafNode("img", "", {"src": "/images/a.png", "alt": "A"}),
+                LeafNode("a", "link", {"href": "/images/a.png"}),
+            ]),
+        ])
+        rewrite_asset_urls(tree, self.manifest)
+        self.assertEqual(
+            tree.to_html(),
+            '<div><p><img src="/images/a.1234abcd.png" alt="A"><a href="/images/a.png">link</a></p></div>',
+        )
+
+    def test_rewrite_template_asset_urls(self):
+        manifest = {"index.css": "index.0badf00d.css", "app.js": "app.1234abcd.js", **self.manifest}
+        template = compile_template(
+            '<link href="/index.css" rel="stylesheet" /><script src=\'/app.js\'></script>'
+            '<title>{{ Title }}</title><a href="/index.css">css</a><img alt="x" SRC="images/a.png">{{ Content }}'
+        )
+        rewritten = rewrite_template_asset_urls(template, manifest)
+        self.assertEqual(
+            rewritten.render({"Title": "T", "Content": '<link href="/index.css">'}),
+            '<link href="/index.0badf00d.css" rel="stylesheet" /><script src=\'/app.1234abcd.js\'></script>'
+            '<title>T</title><a href="/index.css">css</a><img alt="x" SRC="images/a.1234abcd.png">'
+            '<link href="/index.css">',
+        )
+        self.assertEqual(template.chunks[0], '<link href="/index.css" rel="stylesheet" /><script src=\'/app.js\'></script><title>')
+        self.assertIs(rewrite_template_asset_urls(template, {}), template)
+
+
+if __name__ == "__main__":
+    unittest.main()
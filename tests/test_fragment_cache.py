@@ -0,0 +1,180 @@
+import unittest
+
+from fragment_cache import FragmentCache
+from htmlnode import (
+    FrozenLeafNode,
+    FrozenParentNode,
+    HTMLNode,
+    LeafNode,
+    ParentNode,
+    freeze,
+    iter_html_chunks,
+    render_html,
+    set_fragment_cache,
+)
+from markdown_to_html import markdown_to_html_node
+
+
+def admonition(text):
+    return ParentNode("div", [LeafNode("b", "Note"), LeafNode(None, text)], {"class": "note"})
+
+
+class TestFrozenNodes(unittest.TestCase):
+    def test_equal_structure_hashes_equal(self):
+        a = FrozenParentNode("div", [LeafNode("b", "Note"), LeafNode(None, "same")], {"class": "note"})
+        b = FrozenParentNode("div", [LeafNode("b", "Note"), LeafNode(None, "same")], {"class": "note"})
+        self.assertIsNot(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, freeze(admonition("other")))
+        self.assertNotEqual(a, FrozenParentNode("section", a.children, {"class": "note"}))
+
+    def test_freeze_shares_equal_subtrees(self):
+        a = freeze(admonition("same"))
+        b = freeze(admonition("same"))
+        self.assertIs(a, b)
+        self.assertIsNot(freeze(admonition("other")), a)
+        self.assertIs(freeze(ParentNode("p", [admonition("same")])).children[0], a)
+
+    def test_equal_values_of_other_types_stay_apart(self):
+        one, true = freeze(LeafNode("b", 1)), freeze(LeafNode("b", True))
+        self.assertIsNot(one, true)
+        self.assertNotEqual(one, true)
+        self.assertNotEqual(FrozenParentNode("p", [one]), FrozenParentNode("p", [true]))
+
+    def test_immutable(self):
+        node = freeze(admonition("x"))
+        with self.assertRaises(AttributeError):
+            node.tag = "span"
+        with self.assertRaises(AttributeError):
+            node.children[0].value = "y"
+        with self.assertRaises(TypeError):
+            node.props["class"] = "warning"
+        self.assertIsInstance(node.children, tuple)
+
+    def test_freeze_renders_the_same(self):
+        md = "# Title\n\n- **a**\n- [b](/b)\n\n![i](/i.png)\n\n```\ncode\n```"
+        node = markdown_to_html_node(md)
+        frozen = freeze(node)
+        self.assertIsInstance(frozen, FrozenParentNode)
+        self.assertEqual(frozen.to_html(), node.to_html())
+        self.assertIs(freeze(frozen), frozen)
+
+    def test_freeze_keeps_custom_nodes_as_html(self):
+        class Comment(HTMLNode):
+            def to_html(self):
+                return "<!-- c -->"
+
+        frozen = freeze(ParentNode("div", [Comment()]))
+        self.assertEqual(frozen.children[0], FrozenLeafNode(None, "<!-- c -->"))
+
+    def test_deep_trees(self):
+        node = LeafNode(None, "deep")
+        for _ in range(20000):
+            node = ParentNode("i", [node])
+        a, b = freeze(node), freeze(node)
+        self.assertEqual(a, b)
+        self.assertEqual(render_html(a), render_html(node))
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = FragmentCache(64, min_nodes=1)
+        self.previous = set_fragment_cache(self.cache)
+
+    def tearDown(self):
+        set_fragment_cache(self.previous)
+
+    def test_repeated_subtree_is_a_lookup(self):
+        page_one = FrozenParentNode("div", [admonition("shared"), LeafNode("p", "one")])
+        page_two = FrozenParentNode("div", [LeafNode("p", "two"), admonition("shared")])
+        self.assertEqual(page_one.to_html(), '<div><div class="note"><b>Note</b>shared</div><p>one</p></div>')
+        self.assertEqual(self.cache.stats()["entries"], 2)
+        self.assertEqual(page_two.to_html(), '<div><p>two</p><div class="note"><b>Note</b>shared</div></div>')
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(page_one.to_html(), page_one.to_html())
+        self.assertEqual(self.cache.hits, 3)
+
+    def test_output_matches_uncached(self):
+        md = "\n\n".join(["> quoted **text**", "- a\n- b", "> quoted **text**", "- a\n- b"] * 3)
+        node = markdown_to_html_node(md)
+        frozen = freeze(node)
+        cached = "".join(frozen.iter_html())
+        self.assertEqual(cached, node.to_html())
+        self.assertGreater(self.cache.hits, 0)
+        set_fragment_cache(None)
+        self.assertEqual(frozen.to_html(), cached)
+
+    def test_colliding_hashes_render_their_own_html(self):
+        # hash(-1) == hash(-2), so these two subtrees share a structural hash.
+        a = FrozenParentNode("p", [LeafNode("b", -1)])
+        b = FrozenParentNode("p", [LeafNode("b", -2)])
+        self.assertEqual(hash(a), hash(b))
+        self.assertNotEqual(a, b)
+        self.assertEqual(a.to_html(), "<p><b>-1</b></p>")
+        self.assertEqual(b.to_html(), "<p><b>-2</b></p>")
+        self.assertEqual(a.to_html(), "<p><b>-1</b></p>")
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_equal_subtree_from_another_tree_hits(self):
+        a = freeze(admonition("shared"))
+        b = freeze(admonition("shared"))
+        html = a.to_html()
+        self.assertEqual(b.to_html(), html)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_small_batches_while_recording(self):
+        page = FrozenParentNode("ul", [LeafNode("li", str(i)) for i in range(50)])
+        chunks = list(render_html(page) for _ in range(2))
+        self.assertEqual(chunks[0], chunks[1])
+        self.assertEqual("".join(iter_html_chunks(page, batch_size=4)), chunks[0])
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_plain_parents_are_not_cached(self):
+        admonition("x").to_html()
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_small_subtrees_are_rendered(self):
+        self.cache.min_nodes = 4
+        page = FrozenParentNode("div", [admonition("a"), FrozenParentNode("p", [admonition("b")])])
+        page.to_html()
+        self.assertEqual(list(self.cache.entries), [hash(page.children[1]), hash(page)])
+        self.assertEqual((page._size, page.children[0]._size), (8, 3))
+
+    def test_invalid_subtrees_are_not_cached(self):
+        node = FrozenParentNode("div", [FrozenParentNode("p", [LeafNode("b", "ok")]), LeafNode("b", None)])
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                node.to_html()
+        self.assertEqual(list(self.cache.entries), [hash(node.children[0])])
+
+
+class TestFragmentCacheBounds(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = FragmentCache(2)
+        a, b, c = (freeze(admonition(text)) for text in "abc")
+        cache.put(a, "A")
+        cache.put(b, "B")
+        cache.get(a)
+        cache.put(c, "C")
+        self.assertEqual(list(cache.entries), [hash(a), hash(c)])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_bounded_by_characters(self):
+        cache = FragmentCache(10, max_chars=6)
+        a, b, c = (freeze(admonition(text)) for text in "abc")
+        cache.put(a, "xxx")
+        cache.put(b, "yyy")
+        cache.put(c, "zz")
+        self.assertEqual(list(cache.entries), [hash(b), hash(c)])
+        self.assertEqual(cache.chars, 5)
+        cache.put(a, "too long")
+        self.assertNotIn(hash(a), cache.entries)
+
+    def test_needs_one_entry(self):
+        with self.assertRaises(ValueError):
+            FragmentCache(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ast_cache import ASTCache
+import generate
+from generate import extract_title, find_pages, generate_pages, render_page
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def read_tree(root):
+    files = {}
+    for current, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(current, name)
+            with open(path) as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+class TestExtractTitle(unittest.TestCase):
+    def test_extract_title(self):
+        self.assertEqual(extract_title("# Hello"), "Hello")
+        self.assertEqual(extract_title("intro\n\n#  Spaced title  \n\ntext"), "Spaced title")
+
+    def test_ignores_deeper_headings(self):
+        self.assertEqual(extract_title("## Sub\n\n# Main"), "Main")
+
+    def test_missing_title_raises(self):
+        with self.assertRaises(ValueError):
+            extract_title("## Only a subheading")
+
+
+class TestRenderPage(unittest.TestCase):
+    def test_render_page(self):
+        html = render_page("# Title\n\nSome **bold** text", TEMPLATE)
+        self.assertEqual(
+            html,
+            "<title>Title</title><main><div><h1>Title</h1><p>Some <b>bold</b> text</p></div></main>",
+        )
+
+    def test_render_page_rewrites_assets(self):
+        html = render_page("# T\n\n![tolkien](/images/tolkien.png)", TEMPLATE, {"images/tolkien.png": "images/tolkien.abcd1234.png"})
+        self.assertIn('<img src="/images/tolkien.abcd1234.png" alt="tolkien">', html)
+
+
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        write(self.template, TEMPLATE)
+        write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        for i in range(12):
+            write(os.path.join(self.content, "blog", f"post{i}", "index.md"), f"# Post {i}\n\n- item _{i}_")
+        write(os.path.join(self.content, "notes.txt"), "not markdown")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_pages(self):
+        pages = find_pages(self.content)
+        self.assertEqual(len(pages), 13)
+        self.assertEqual(pages[-1], ("index.md", "index.html"))
+        self.assertIn(("blog/post3/index.md", "blog/post3/index.html"), pages)
+
+    def test_parallel_output_matches_serial(self):
+        serial_dir = os.path.join(self.tmp.name, "serial")
+        parallel_dir = os.path.join(self.tmp.name, "parallel")
+        serial = generate_pages(self.content, self.template, serial_dir, workers=1)
+        parallel = generate_pages(self.content, self.template, parallel_dir, workers=3)
+        self.assertEqual(serial.generated, parallel.generated)
+        self.assertEqual(len(serial.generated), 13)
+        self.assertEqual(read_tree(serial_dir), read_tree(parallel_dir))
+        self.assertEqual(
+            read_tree(serial_dir)[os.path.join("blog", "post2", "index.html")],
+            "<title>Post 2</title><main><div><h1>Post 2</h1><ul><li>item <i>2</i></li></ul></div></main>",
+        )
+
+    def test_ast_cache_output_matches_uncached(self):
+        cache = ASTCache(os.path.join(self.tmp.name, ".cache", "ast"))
+        plain_dir = os.path.join(self.tmp.name, "plain")
+        cold_dir = os.path.join(self.tmp.name, "cold")
+        warm_dir = os.path.join(self.tmp.name, "warm")
+        generate_pages(self.content, self.template, plain_dir, workers=1)
+        generate_pages(self.content, self.template, cold_dir, workers=2, ast_cache=cache)
+        generate_pages(self.content, self.template, warm_dir, workers=2, ast_cache=cache)
+        self.assertEqual(read_tree(plain_dir), read_tree(cold_dir))
+        self.assertEqual(read_tree(plain_dir), read_tree(warm_dir))
+
+    def test_inline_cache_output_matches_uncached(self):
+        write(os.path.join(self.content, "nav.md"), "# Nav\n\n- item _1_\n- item _2_")
+        plain_dir = os.path.join(self.tmp.name, "plain")
+        cached_dir = os.path.join(self.tmp.name, "cached")
+        generate_pages(self.content, self.template, plain_dir, workers=1)
+        result = generate_pages(self.content, self.template, cached_dir, workers=1, report=True, inline_cache_size=64)
+        self.assertEqual(read_tree(plain_dir), read_tree(cached_dir))
+        counts = [stats["inline_cache"] for _, stats in result.page_stats]
+        self.assertEqual(sum(c["hits"] for c in counts), 2)
+        self.assertEqual(sum(c["misses"] for c in counts), 27)
+
+    def test_failed_pages_are_reported(self):
+        write(os.path.join(self.content, "broken.md"), "# Broken\n\nunclosed **bold")
+        write(os.path.join(self.content, "untitled.md"), "no title here")
+        dest = os.path.join(self.tmp.name, "public")
+        result = generate_pages(self.content, self.template, dest, workers=2)
+        self.assertEqual(len(result.generated), 13)
+        self.assertEqual([rel for rel, _ in result.errors], ["broken.md", "untitled.md"])
+        self.assertIn("unclosed delimiter", result.errors[0][1])
+        self.assertTrue(os.path.exists(os.path.join(dest, "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(dest, "broken.html")))
+
+
+class TestIncrementalGeneration(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.graph = os.path.join(self.tmp.name, ".cache", "build-graph.json")
+        write(self.template, "<title>{{ Title }}</title>{{> footer.html }}{{ Content }}")
+        write(os.path.join(self.tmp.name, "footer.html"), "<footer>v1</footer>")
+        write(os.path.join(self.content, "index.md"), "# Home")
+        write(os.path.join(self.content, "about.md"), "# About")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, **kwargs):
+        return generate_pages(self.content, self.template, self.public, workers=1, graph_path=self.graph, **kwargs)
+
+    def test_second_build_skips_everything(self):
+        first = self.build()
+        self.assertEqual(first.generated, ["about.md", "blog/post.md", "index.md"])
+        second = self.build()
+        self.assertEqual(second.generated, [])
+        self.assertEqual(second.skipped, ["about.md", "blog/post.md", "index.md"])
+
+    def test_changed_source_rebuilds_only_that_page(self):
+        self.build()
+        write(os.path.join(self.content, "about.md"), "# About us")
+        result = self.build()
+        self.assertEqual(result.generated, ["about.md"])
+        with open(os.path.join(self.public, "about.html")) as f:
+            self.assertIn("<h1>About us</h1>", f.read())
+
+    def test_changed_partial_rebuilds_every_page(self):
+        self.build()
+        write(os.path.join(self.tmp.name, "footer.html"), "<footer>v2</footer>")
+        result = self.build()
+        self.assertEqual(result.generated, ["about.md", "blog/post.md", "index.md"])
+
+    def test_changed_asset_manifest_rebuilds(self):
+        self.build(asset_manifest={"a.png": "a.1111.png"})
+        self.assertEqual(self.build(asset_manifest={"a.png": "a.1111.png"}).generated, [])
+        self.assertEqual(len(self.build(asset_manifest={"a.png": "a.2222.png"}).generated), 3)
+
+    def test_new_parser_version_rebuilds(self):
+        self.build()
+        with mock.patch.object(generate, "PARSER_VERSION", "next"):
+            result = self.build()
+            self.assertEqual(result.generated, ["about.md", "blog/post.md", "index.md"])
+            self.assertEqual(self.build().generated, [])
+
+    def test_missing_output_is_rebuilt(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        self.assertEqual(self.build().generated, ["index.md"])
+
+    def test_deleted_source_removes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        result = self.build()
+        self.assertEqual(result.removed, ["blog/post.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_minify_rebuilds_and_minifies(self):
+        self.build()
+        write(os.path.join(self.content, "list.md"), "# List\n\n- a\n- b")
+        self.assertEqual(self.build().generated, ["list.md"])
+        result = self.build(minify=True)
+        self.assertEqual(result.generated, ["about.md", "blog/post.md", "index.md", "list.md"])
+        self.assertEqual(self.build(minify=True).generated, [])
+        with open(os.path.join(self.public, "list.html")) as f:
+            self.assertEqual(f.read(), "<title>List</title><footer>v1</footer><div><h1>List</h1><ul><li>a<li>b</ul></div>")
+
+    def test_identical_output_is_not_rewritten(self):
+        self.build()
+        page = os.path.join(self.public, "index.html")
+        st = os.stat(page)
+        os.utime(page, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        before = os.stat(page)
+        # Without the graph every page is rendered again, to the same bytes.
+        os.remove(self.graph)
+        result = self.build()
+        self.assertEqual(result.generated, ["about.md", "blog/post.md", "index.md"])
+        self.assertEqual(result.unchanged, ["about.md", "blog/post.md", "index.md"])
+        after = os.stat(page)
+        self.assertEqual((after.st_ino, after.st_mtime_ns), (before.st_ino, before.st_mtime_ns))
+
+    def test_changed_output_is_replaced(self):
+        self.build()
+        write(os.path.join(self.content, "about.md"), "# About us")
+        result = self.build()
+        self.assertEqual(result.unchanged, [])
+        self.assertEqual(sorted(os.listdir(self.public)), ["about.html", "blog", "index.html"])
+
+    def test_failed_page_is_retried(self):
+        write(os.path.join(self.content, "broken.md"), "no title")
+        self.assertEqual([rel for rel, _ in self.build().errors], ["broken.md"])
+        self.assertEqual([rel for rel, _ in self.build().errors], ["broken.md"])
+
+    def test_failed_page_output_is_removed_with_its_source(self):
+        write(os.path.join(self.content, "broken.md"), "# Broken")
+        self.build()
+        write(os.path.join(self.content, "broken.md"), "no title")
+        self.assertEqual([rel for rel, _ in self.build().errors], ["broken.md"])
+        self.assertTrue(os.path.exists(os.path.join(self.public, "broken.html")))
+        os.remove(os.path.join(self.content, "broken.md"))
+        result = self.build()
+        self.assertEqual(result.removed, ["broken.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "broken.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import io
+import sys
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import HTMLNode, LeafNode, ParentNode, freeze, render_html
 from textnode import TextNode, TextType, text_node_to_html_node
 
 
@@ -209,8 +211,111 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
             text_node_to_html_node(node)
         self.assertTrue("Unknown text type" in str(context.exception))
 
-if __name__ == "__main__":
-    unittest.main()
+class TestStreamingRender(unittest.TestCase):
+    def make_tree(self):
+        items = [ParentNode("li", [LeafNode(None, f"item {i} "), LeafNode("b", "bold")]) for i in range(400)]
+        return ParentNode("div", [LeafNode("h1", "List"), ParentNode("ul", items, {"class": "big"})])
+
+    def test_iter_html_matches_to_html(self):
+        tree = self.make_tree()
+        chunks = list(tree.iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), tree.to_html())
+
+    def test_leaf_iter_html(self):
+        self.assertEqual(list(LeafNode("img", "", {"src": "a.png"}).iter_html()), ['<img src="a.png">'])
+
+    def test_write_html_matches_to_html(self):
+        tree = self.make_tree()
+        for buffer_size in (1, 100, 1 << 20):
+            out = io.StringIO()
+            tree.write_html(out, buffer_size)
+            self.assertEqual(out.getvalue(), tree.to_html())
+
+    def test_iter_html_raises_like_to_html(self):
+        with self.assertRaises(ValueError) as context:
+            list(ParentNode("div", [ParentNode("p", [])]).iter_html())
+        self.assertEqual(str(context.exception), "All parent nodes must have children")
+        with self.assertRaises(ValueError):
+            list(ParentNode("div", [LeafNode("b", None)]).iter_html())
+
+
+class TestIterativeRender(unittest.TestCase):
+    def test_deep_tree_renders_without_recursion(self):
+        depth = 20000
+        node = LeafNode(None, "deep")
+        for _ in range(depth):
+            node = ParentNode("blockquote", [node])
+        html = node.to_html()
+        self.assertEqual(html, "<blockquote>" * depth + "deep" + "</blockquote>" * depth)
+        self.assertEqual(render_html(node), html)
+
+    def test_matches_recursive_render(self):
+        def recursive(node):
+            if isinstance(node, LeafNode):
+                return node.to_html()
+            inner = "".join(recursive(child) for child in node.children)
+            return f"<{node.tag}{node.props_to_html()}>{inner}</{node.tag}>"
+
+        tree = ParentNode("div", [
+            ParentNode("ul", [ParentNode("li", [LeafNode(None, "a"), LeafNode("img", "", {"src": "x", "alt": "y"})])]),
+            ParentNode("p", [LeafNode("a", "link", {"href": "/"}), LeafNode("br", "")], {"class": "c"}),
+        ])
+        self.assertEqual(render_html(tree), recursive(tree))
+
+    def test_first_error_in_document_order(self):
+        tree = ParentNode("div", [ParentNode("p", [LeafNode("b", None)]), ParentNode(None, [LeafNode(None, "x")])])
+        with self.assertRaises(ValueError) as context:
+            tree.to_html()
+        self.assertEqual(str(context.exception), "All leaf nodes must have a value")
+
+    def test_subclasses(self):
+        class Comment(HTMLNode):
+            def to_html(self):
+                return f"<!-- {self.value} -->"
+
+        class Section(ParentNode):
+            def to_html(self):
+                return "<!-- section -->" + super().to_html()
+
+        class Plain(ParentNode):
+            pass
+
+        tree = Plain("div", [Comment(value="note"), Section("section", [LeafNode("p", "x")])])
+        self.assertEqual(tree.to_html(), "<div><!-- note --><!-- section --><section><p>x</p></section></div>")
+
+class TestSlots(unittest.TestCase):
+    def test_unknown_attributes_rejected(self):
+        nodes = [HTMLNode("div"), LeafNode("p", "x"), ParentNode("div", [LeafNode("p", "x")])]
+        for node in nodes:
+            with self.subTest(node=type(node).__name__):
+                self.assertFalse(hasattr(node, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    node.colour = "red"
+
+    def test_known_attributes_still_settable(self):
+        node = LeafNode("p", "x")
+        node.value = "y"
+        node.props = {"class": "c"}
+        self.assertEqual(node.to_html(), '<p class="c">y</p>')
+
+    def test_tags_interned(self):
+        tag = "".join(["l", "i"])
+        self.assertIsNot(tag, "li")
+        self.assertIs(LeafNode(tag, "x").tag, sys.intern("li"))
+        self.assertIs(ParentNode("".join(["u", "l"]), []).tag, ParentNode("ul", []).tag)
+        self.assertIsNone(LeafNode(None, "x").tag)
+
+    def test_repr(self):
+        self.assertEqual(repr(LeafNode("p", "x", {"class": "c"})), "LeafNode(p, x, {'class': 'c'})")
+        self.assertEqual(repr(ParentNode("div", [LeafNode(None, "x")])), "ParentNode(div, [LeafNode(None, x, None)], None)")
+
+    def test_eq_of_frozen_nodes(self):
+        a = ParentNode("div", [LeafNode("p", "x", {"class": "c"})])
+        b = ParentNode("".join(["d", "iv"]), [LeafNode("p", "x", {"class": "c"})])
+        c = ParentNode("div", [LeafNode("p", "y", {"class": "c"})])
+        self.assertEqual(freeze(a), freeze(b))
+        self.assertNotEqual(freeze(a), freeze(c))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+import unittest
+
+from inline_cache import InlineCache
+from markdown_to_html import markdown_to_html_node, set_inline_cache, text_to_children
+from textnode import FrozenTextNode, TextNode, TextSpan, TextType
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_counts_hits_and_misses(self):
+        cache = InlineCache(4)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", [TextNode("a", TextType.TEXT)])
+        self.assertEqual(cache.get("a"), (TextNode("a", TextType.TEXT),))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "evictions": 0, "entries": 1})
+
+    def test_entries_are_immutable_copies(self):
+        cache = InlineCache(4)
+        nodes = [TextNode("Docs", TextType.LINK, "/docs"), TextSpan("say hi", 4, 6, TextType.TEXT)]
+        cache.put("[Docs](/docs) hi", nodes)
+        nodes[0].url = "/changed"
+        hit = cache.get("[Docs](/docs) hi")
+        for node in hit:
+            self.assertIs(type(node), FrozenTextNode)
+            with self.assertRaises(AttributeError):
+                node.url = "/elsewhere"
+            with self.assertRaises(AttributeError):
+                node.text = "changed"
+        self.assertEqual(cache.get("[Docs](/docs) hi"), (TextNode("Docs", TextType.LINK, "/docs"), TextNode("hi", TextType.TEXT)))
+
+    def test_frozen_nodes_are_stored_as_they_are(self):
+        cache = InlineCache(4)
+        node = FrozenTextNode("a", TextType.TEXT)
+        cache.put("a", [node])
+        self.assertIs(cache.get("a")[0], node)
+        self.assertEqual(repr(node), "FrozenTextNode(a, text, None)")
+
+    def test_evicts_least_recently_used(self):
+        cache = InlineCache(2)
+        cache.put("a", [])
+        cache.put("b", [])
+        cache.get("a")
+        cache.put("c", [])
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_long_text_is_not_stored(self):
+        cache = InlineCache(4, max_text_length=5)
+        cache.put("too long", [])
+        self.assertEqual(len(cache.entries), 0)
+
+    def test_needs_one_entry(self):
+        with self.assertRaises(ValueError):
+            InlineCache(0)
+
+
+class TestTextToChildrenCaching(unittest.TestCase):
+    def setUp(self):
+        self.cache = InlineCache(16)
+        self.previous = set_inline_cache(self.cache)
+
+    def tearDown(self):
+        set_inline_cache(self.previous)
+
+    def test_output_matches_uncached(self):
+        md = "# Title\n\n- **Home**\n- [Docs](/docs)\n\n- **Home**\n- [Docs](/docs)\n\n![logo](/logo.png)"
+        cached = markdown_to_html_node(md).to_html()
+        set_inline_cache(None)
+        self.assertEqual(cached, markdown_to_html_node(md).to_html())
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_returned_nodes_are_not_shared(self):
+        first = text_to_children("![logo](/logo.png)")
+        first[0].props["src"] = "/logo.1234abcd.png"
+        second = text_to_children("![logo](/logo.png)")
+        self.assertIsNot(first[0], second[0])
+        self.assertEqual(second[0].props["src"], "/logo.png")
+
+    def test_parse_errors_are_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                text_to_children("unclosed **bold")
+        self.assertEqual(len(self.cache.entries), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from fingerprint import load_asset_manifest
+import generate
+from main import main
+
+TEMPLATE = '<html><head><title>{{ Title }}</title><link href="/index.css" rel="stylesheet"></head><body>{{ Content }}</body></html>'
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        write(os.path.join(self.root, "template.html"), TEMPLATE)
+        write(os.path.join(self.root, "static", "index.css"), "body { margin: 0 }")
+        write(os.path.join(self.root, "static", "images", "a.png"), "png-bytes")
+        write(os.path.join(self.root, "content", "index.md"), "# Home\n\nWelcome **home**.")
+        write(os.path.join(self.root, "content", "blog", "post.md"), "# Post\n\nA [link](/index.html).")
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def build(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            main(["--jobs", "1"] + list(argv))
+        return out.getvalue()
+
+    def test_changed_list_after_a_default_build(self):
+        lists = ["--changed-list", "changed.txt", "--deleted-list", "deleted.txt"]
+        self.build(*lists)
+        self.assertEqual(
+            read("changed.txt").split(),
+            ["blog/post.html", "images/a.png", "index.css", "index.html"],
+        )
+        self.build(*lists)
+        self.assertEqual(read("changed.txt"), "")
+        self.assertEqual(read("deleted.txt"), "")
+
+        write(os.path.join(self.root, "content", "index.md"), "# Home\n\nWelcome back.")
+        os.remove(os.path.join(self.root, "static", "images", "a.png"))
+        self.build(*lists)
+        self.assertEqual(read("changed.txt"), "index.html\n")
+        self.assertEqual(read("deleted.txt"), "images/a.png\n")
+
+    def test_pages_are_built_without_a_static_folder(self):
+        shutil.rmtree(os.path.join(self.root, "static"))
+        out = self.build()
+        self.assertIn("Static folder not found", out)
+        self.assertIn("<h1>Home</h1>", read(os.path.join("public", "index.html")))
+        self.assertIn("<h1>Post</h1>", read(os.path.join("public", "blog", "post.html")))
+
+    def test_default_build_writes_html_straight_from_markdown(self):
+        with mock.patch.object(generate, "markdown_to_html", wraps=generate.markdown_to_html) as direct, \
+                mock.patch.object(generate, "markdown_to_html_node", wraps=generate.markdown_to_html_node) as tree:
+            self.build()
+        self.assertEqual(direct.call_count, 2)
+        self.assertEqual(tree.call_count, 0)
+        self.assertIn("<p>Welcome <b>home</b>.</p>", read(os.path.join("public", "index.html")))
+
+    def test_report_times_the_default_path(self):
+        with mock.patch.object(generate, "markdown_to_html", wraps=generate.markdown_to_html) as direct, \
+                mock.patch.object(generate, "markdown_to_html_node", wraps=generate.markdown_to_html_node) as tree:
+            out = self.build("--report")
+        self.assertEqual(direct.call_count, 2)
+        self.assertEqual(tree.call_count, 0)
+        self.assertNotIn("tree", out)
+        self.assertIn("to_html", out)
+
+    def test_ast_cache_only_with_fingerprint(self):
+        self.build()
+        self.build("--report")
+        self.assertFalse(os.path.exists(os.path.join(".cache", "ast")))
+        self.build("--fingerprint")
+        self.assertTrue(os.path.isdir(os.path.join(".cache", "ast")))
+
+    def test_fingerprint_rewrites_the_template_stylesheet(self):
+        self.build("--fingerprint")
+        hashed = load_asset_manifest("public")["index.css"]
+        self.assertRegex(hashed, r"^index\.[0-9a-f]{8}\.css$")
+        for page in ("index.html", os.path.join("blog", "post.html")):
+            self.assertIn(f'<link href="/{hashed}" rel="stylesheet">', read(os.path.join("public", page)))
+
+        write(os.path.join(self.root, "static", "index.css"), "body { margin: 1em }")
+        self.build("--fingerprint")
+        rehashed = load_asset_manifest("public")["index.css"]
+        self.assertNotEqual(rehashed, hashed)
+        self.assertIn(f'<link href="/{rehashed}" rel="stylesheet">', read(os.path.join("public", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,91 @@
+import io
+import random
+import textwrap
 import unittest
 
+from inline_cache import InlineCache
 from markdown_to_html import *
+from text_processing import block_to_block_type, markdown_to_blocks
+
+
+def reference_markdown_to_html(markdown):
+    """The split, classify and convert pipeline that scan_blocks replaced."""
+    nodes = []
+    for block in markdown_to_blocks(markdown):
+        lines = block.split("\n")
+        if len(lines) >= 3 and lines[0].lstrip().startswith("```") and lines[-1].lstrip().startswith("```"):
+            code = textwrap.dedent("\n".join(lines[1:-1]))
+            if not code.endswith("\n"):
+                code += "\n"
+            nodes.append(ParentNode("pre", [ParentNode("code", [text_node_to_html_node(TextNode(code, TextType.TEXT))])]))
+            continue
+        block_type = block_to_block_type(block)
+        if block_type == BlockType.PARAGRAPH:
+            nodes.append(ParentNode("p", text_to_children(" ".join(line.strip() for line in lines))))
+        elif block_type == BlockType.HEADING:
+            level = len(lines[0].split(" ")[0])
+            nodes.append(ParentNode(f"h{level}", text_to_children(lines[0][level:].strip())))
+        elif block_type == BlockType.QUOTE:
+            quote_lines = []
+            for line in lines:
+                stripped = line[1:]
+                if stripped.startswith(" "):
+                    stripped = stripped[1:]
+                quote_lines.append(stripped.rstrip())
+            nodes.append(ParentNode("blockquote", text_to_children(" ".join(quote_lines))))
+        elif block_type == BlockType.UNORDERED_LIST:
+            nodes.append(ParentNode("ul", [ParentNode("li", text_to_children(line[2:].strip())) for line in lines]))
+        elif block_type == BlockType.ORDERED_LIST:
+            items = [line[line.find(".") + 1:].strip() for line in lines]
+            nodes.append(ParentNode("ol", [ParentNode("li", text_to_children(item)) for item in items]))
+        else:
+            nodes.append(ParentNode("p", text_to_children(block)))
+    return ParentNode("div", nodes).to_html()
+
+
+# Lines chosen to sit on either side of every classification rule.
+SCANNER_LINES = [
+    "", "", "", " ", "  ", "\t",
+    "plain text", "  indented text", "text with **bold** and `code`  ",
+    "# Title", "## Sub", "###### six", "####### seven", "#", "#no space", " # lead",
+    "> quote", ">", ">tight", "> ", "  > indented quote",
+    "- item", "- ", "-", "-item", "- item  ",
+    "1. one", "2. two", "3. three", "1. ", "2. ", "1.  spaced", "01. zero", "10. ten", "1.", "2.x",
+    "```", "```python", "  ```", "    code line", "```trailing```",
+]
+
+
+def outcome(convert, markdown):
+    try:
+        return convert(markdown)
+    except ValueError as e:
+        return f"ValueError: {e}"
+
+
+class TestBlockScanner(unittest.TestCase):
+    def test_matches_reference_pipeline(self):
+        rng = random.Random(4321)
+        for _ in range(3000):
+            lines = [rng.choice(SCANNER_LINES) for _ in range(rng.randint(1, 12))]
+            if rng.random() < 0.3:
+                first = rng.choice(("1. one", "- item", "> quote"))
+                lines = [first] + [rng.choice(("2. two", "3. three", "- item", "> q", "- ", "2. ")) for _ in range(3)]
+            md = "\n".join(lines)
+            if not md.strip():
+                continue
+            self.assertEqual(
+                outcome(lambda text: markdown_to_html_node(text).to_html(), md),
+                outcome(reference_markdown_to_html, md),
+                repr(md),
+            )
+
+    def test_ordered_list_up_to_ten(self):
+        md = "\n".join(f"{i}. item {i}" for i in range(1, 11))
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, reference_markdown_to_html(md))
+        self.assertTrue(html.startswith("<div><ol><li>item 1</li>"))
+        self.assertTrue(html.endswith("<li>item 10</li></ol></div>"))
+
 class TestTextNode(unittest.TestCase):
     def test_paragraphs(self):
         md = """
@@ -32,4 +117,136 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(
             html,
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
-        )
\ No newline at end of file
+        )
+
+class TestStreamingConversion(unittest.TestCase):
+    md = """# Changelog
+
+## 1.2.0
+
+- Added **streaming**
+- Fixed _things_
+
+> quoted
+> text
+
+1. one
+2. two
+
+```
+code here
+```
+
+Closing paragraph with a [link](https://example.com)
+"""
+
+    def test_block_nodes_match_tree(self):
+        nodes = list(markdown_file_to_html_nodes(io.StringIO(self.md)))
+        self.assertEqual([node.to_html() for node in nodes], [node.to_html() for node in markdown_to_html_node(self.md).children])
+
+    def test_write_matches_to_html(self):
+        out = io.StringIO()
+        write_markdown_file_as_html(io.StringIO(self.md), out)
+        self.assertEqual(out.getvalue(), markdown_to_html_node(self.md).to_html())
+
+    def test_write_empty_document_raises(self):
+        with self.assertRaises(ValueError):
+            write_markdown_file_as_html(io.StringIO("\n\n"), io.StringIO())
+
+
+class TestIncrementalReparse(unittest.TestCase):
+    md = "# Doc\n\nFirst **para**\n\n- a\n- b\n\nLast para"
+
+    def test_first_parse_matches_tree(self):
+        doc = parse_document(self.md)
+        self.assertEqual(doc.node.to_html(), markdown_to_html_node(self.md).to_html())
+        self.assertEqual((doc.reused, doc.parsed), (0, 4))
+
+    def test_only_edited_block_is_parsed(self):
+        first = parse_document(self.md)
+        edited = self.md.replace("First **para**", "First _edited_ para")
+        second = parse_document(edited, first)
+        self.assertEqual(second.node.to_html(), markdown_to_html_node(edited).to_html())
+        self.assertEqual((second.reused, second.parsed), (3, 1))
+        self.assertIs(second.node.children[0], first.node.children[0])
+        self.assertIsNot(second.node.children[1], first.node.children[1])
+
+    def test_moved_inserted_and_deleted_blocks(self):
+        first = parse_document(self.md)
+        edited = "Last para\n\nNew block\n\n# Doc\n\n- a\n- b"
+        second = parse_document(edited, first)
+        self.assertEqual(second.node.to_html(), markdown_to_html_node(edited).to_html())
+        self.assertEqual((second.reused, second.parsed), (3, 1))
+
+    def test_repeated_blocks_are_not_reused_twice(self):
+        first = parse_document("same\n\nsame")
+        second = parse_document("same\n\nsame\n\nsame", first)
+        self.assertEqual((second.reused, second.parsed), (2, 1))
+        self.assertEqual(second.node.to_html(), "<div><p>same</p><p>same</p><p>same</p></div>")
+
+
+# Inline pieces that exercise every branch of the inline scanner, including
+# the ones that fail or leave an element without children.
+INLINE_PIECES = [
+    "word", " ", "  ", "**bold**", "_it_", "`code`", "`a _b_ **c**`", "**_both_**", "****", "__", "``",
+    "[link](/u)", "[link](https://x.y/a_(b))", "![img](/i.png)", "![](/e.png)", "[a]()", "![b]()",
+    "\\[esc](/e)", "![[x](/y)](/z)", "**", "_", "`", "a_b", "[", "](", ")",
+]
+
+
+def direct_outcome(markdown):
+    return outcome(markdown_to_html, markdown)
+
+
+def tree_outcome(markdown):
+    return outcome(lambda text: markdown_to_html_node(text).to_html(), markdown)
+
+
+class TestDirectHTML(unittest.TestCase):
+    def test_matches_tree_on_documents(self):
+        for md in ["# Title\n\nSome **bold** _it_ `code` [l](/a) ![i](/b.png)",
+                   TestStreamingConversion.md, "\n\n\n", "", "only one line",
+                   "```\n    indented\n  code\n```", "```\nx```", "# \nbody", "- ****\n- b"]:
+            self.assertEqual(direct_outcome(md), tree_outcome(md), repr(md))
+
+    def test_matches_tree_on_random_documents(self):
+        rng = random.Random(2024)
+        for _ in range(3000):
+            lines = []
+            for _ in range(rng.randint(1, 10)):
+                line = rng.choice(SCANNER_LINES)
+                if rng.random() < 0.6:
+                    line += "".join(rng.choice(INLINE_PIECES) for _ in range(rng.randint(1, 5)))
+                lines.append(line)
+            md = "\n".join(lines)
+            self.assertEqual(direct_outcome(md), tree_outcome(md), repr(md))
+
+    def test_inline_cache_gives_the_same_html(self):
+        rng = random.Random(7)
+        docs = []
+        for _ in range(500):
+            lines = [rng.choice(SCANNER_LINES) + "".join(rng.choice(INLINE_PIECES) for _ in range(rng.randint(0, 3)))
+                     for _ in range(rng.randint(1, 6))]
+            docs.append("\n".join(lines))
+        expected = [direct_outcome(md) for md in docs]
+        cache = InlineCache(64)
+        previous = set_inline_cache(cache)
+        try:
+            self.assertEqual([direct_outcome(md) for md in docs], expected)
+            self.assertEqual([direct_outcome(md) for md in docs], expected)
+        finally:
+            set_inline_cache(previous)
+        self.assertGreater(cache.hits, 0)
+
+    def test_errors_follow_tree_order(self):
+        # A childless element only fails at render time, after every block parsed.
+        self.assertEqual(direct_outcome("****\n\n**open"), tree_outcome("****\n\n**open"))
+        self.assertIn("unclosed", direct_outcome("****\n\n**open"))
+        # Within one text, delimiter errors win over a missing URL.
+        self.assertEqual(direct_outcome("[a]() **open"), tree_outcome("[a]() **open"))
+        self.assertEqual(direct_outcome("[a]() ![b]()"), "ValueError: Link TextNode must have a URL")
+        self.assertEqual(direct_outcome(""), tree_outcome(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import random
+import unittest
+
+from markdown_to_html import markdown_to_html_node
+from minify import HTMLMinifier, iter_minified, minify_html
+
+PAGE = """<!DOCTYPE html>
+<html>
+  <head>
+    <title>  My   page </title>
+    <style>
+      body  { margin: 0 }
+    </style>
+  </head>
+  <body>
+    <ul>
+      <li>one <b>bold</b></li>
+      <li>two
+        <ul><li>nested</li></ul>
+      </li>
+    </ul>
+    <p>first</p>
+    <p>second</p>
+    <pre><code>def f():
+    return  1
+</code></pre>
+    <textarea>  keep
+  this </textarea>
+    <script>if (a  <  b) { x = "</p>  " }</script>
+  </body>
+</html>
+"""
+
+
+class TestMinifyHTML(unittest.TestCase):
+    def test_page(self):
+        self.assertEqual(
+            minify_html(PAGE),
+            "<!DOCTYPE html><html><head><title> My page </title><style>\n      body  { margin: 0 }\n    </style>"
+            "</head><body><ul><li>one <b>bold</b><li>two <ul><li>nested</ul></ul><p>first<p>second"
+            "<pre><code>def f():\n    return  1\n</code></pre> <textarea>  keep\n  this </textarea> "
+            '<script>if (a  <  b) { x = "</p>  " }</script></body></html>',
+        )
+
+    def test_inline_whitespace_collapses_but_stays(self):
+        self.assertEqual(minify_html("<p><b>a</b>  \n <i>b</i></p>"), "<p><b>a</b> <i>b</i></p>")
+        self.assertEqual(minify_html("<div>\n  text\n  more\n</div>"), "<div> text more </div>")
+
+    def test_code_blocks_from_markdown_are_untouched(self):
+        md = "# Code\n\n```\n  indented   line\n\tand a tab\n```\n\nInline `a   b` code"
+        html = markdown_to_html_node(md).to_html()
+        minified = minify_html(html)
+        self.assertIn("<pre><code>  indented   line\n\tand a tab\n</code></pre>", minified)
+        self.assertIn("<code>a   b</code>", minified)
+
+    def test_optional_end_tags(self):
+        self.assertEqual(minify_html("<ol><li>a</li> <li>b</li></ol>"), "<ol><li>a<li>b</ol>")
+        self.assertEqual(minify_html("<div><p>a</p></div>"), "<div><p>a</div>")
+        self.assertEqual(minify_html("<p>a</p><h2>b</h2>"), "<p>a<h2>b</h2>")
+        # Kept where the next tag would not close the element.
+        self.assertEqual(minify_html("<p>a</p><span>b</span>"), "<p>a</p><span>b</span>")
+        self.assertEqual(minify_html("<a><p>a</p></a>"), "<a><p>a</p></a>")
+        self.assertEqual(minify_html("<li>a</li>text"), "<li>a</li>text")
+        self.assertEqual(minify_html("<p>end</p>"), "<p>end</p>")
+
+    def test_text_that_is_not_a_tag(self):
+        self.assertEqual(minify_html("<p>1 <  2 and 3 > 2</p>"), "<p>1 < 2 and 3 > 2</p>")
+        self.assertEqual(minify_html("a <"), "a <")
+
+    def test_comments_are_kept(self):
+        self.assertEqual(minify_html("<div>\n<!-- a  > b -->\n</div>"), "<div> <!-- a  > b --> </div>")
+
+    def test_any_chunking_gives_the_same_output(self):
+        expected = minify_html(PAGE)
+        rng = random.Random(11)
+        for _ in range(200):
+            cuts = sorted(rng.sample(range(1, len(PAGE)), rng.randint(1, 30)))
+            chunks = [PAGE[start:end] for start, end in zip([0] + cuts, cuts + [len(PAGE)])]
+            self.assertEqual("".join(iter_minified(chunks)), expected)
+        self.assertEqual("".join(iter_minified(PAGE)), expected)
+
+    def test_every_split_of_quoted_attributes(self):
+        for html in [
+            '<pre class="a>b">  x   y  </pre>',
+            '<p><a title="x>  y">link</a>  text</p>',
+            "<div data-x='1 > 0'>\n  <p>a</p>\n</div>",
+            '<textarea placeholder="<b>  </b>">  keep  </textarea>',
+            "<!-- a > b -->  <p>x</p>",
+            "<!DOCTYPE html>  <p>x</p>",
+        ]:
+            expected = minify_html(html)
+            for cut in range(1, len(html)):
+                with self.subTest(html=html, cut=cut):
+                    self.assertEqual("".join(iter_minified([html[:cut], html[cut:]])), expected)
+        self.assertEqual(minify_html('<pre class="a>b">  x   y  </pre>'), '<pre class="a>b">  x   y  </pre>')
+
+    def test_unfinished_tag_at_the_end_is_text(self):
+        self.assertEqual(minify_html('a <b title="x  y'), 'a <b title="x y')
+        self.assertEqual("".join(iter_minified(["a <b ti", 'tle="x  y'])), 'a <b title="x y')
+
+    def test_counts_characters(self):
+        minifier = HTMLMinifier()
+        out = "".join(iter_minified(["<div>\n  ", "<p>x</p>\n</div>"], minifier))
+        self.assertEqual(out, "<div><p>x</div>")
+        self.assertEqual((minifier.chars_in, minifier.chars_out), (23, len(out)))
+
+
+if __name__ == "__main__":
+    unittest.main()
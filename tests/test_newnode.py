@@ -1,6 +1,6 @@
 import unittest
 
-from textnode import TextNode, TextType
+from textnode import TextNode, TextSpan, TextType
 
 
 class TestTextNode(unittest.TestCase):
@@ -29,6 +29,27 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD, url="http://different.com")
         self.assertNotEqual(node, node2)
 
+class TestSlots(unittest.TestCase):
+    def test_unknown_attributes_rejected(self):
+        for node in (TextNode("a", TextType.TEXT), TextSpan("abc", 1, 2, TextType.TEXT)):
+            with self.subTest(node=type(node).__name__):
+                self.assertFalse(hasattr(node, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    node.colour = "red"
+
+    def test_span_reads_its_text_lazily(self):
+        span = TextSpan("say **hi**", 6, 8, TextType.BOLD)
+        self.assertIsNone(span._text)
+        self.assertEqual(span.text, "hi")
+        self.assertEqual((span.start, span.end), (6, 8))
+
+    def test_span_eq_and_repr(self):
+        span = TextSpan("see [docs](/d)", 5, 9, TextType.LINK, "/d")
+        self.assertEqual(span, TextNode("docs", TextType.LINK, "/d"))
+        self.assertEqual(TextNode("docs", TextType.LINK, "/d"), span)
+        self.assertNotEqual(span, TextNode("docs", TextType.LINK, "/e"))
+        self.assertEqual(repr(span), "TextNode(docs, link, /d)")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
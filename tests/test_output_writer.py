@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+from copy_strategies import copy_hardlink
+from output_writer import copy_atomic, copy_if_changed, same_content, write_if_changed, write_path_list
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def age(path):
+    """Push path's mtime into the past so a rewrite can't land on the same timestamp."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+    return os.stat(path)
+
+
+class TestWriteIfChanged(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_missing_file(self):
+        self.assertTrue(write_if_changed(self.path, b"<p>hi</p>"))
+        self.assertEqual(read(self.path), b"<p>hi</p>")
+
+    def test_identical_file_untouched(self):
+        write(self.path, b"<p>hi</p>")
+        before = age(self.path)
+        self.assertFalse(write_if_changed(self.path, b"<p>hi</p>"))
+        after = os.stat(self.path)
+        self.assertEqual(after.st_mtime_ns, before.st_mtime_ns)
+        self.assertEqual(after.st_ino, before.st_ino)
+
+    def test_same_size_different_content_is_written(self):
+        write(self.path, b"<p>hi</p>")
+        before = age(self.path)
+        self.assertTrue(write_if_changed(self.path, b"<p>ho</p>"))
+        self.assertEqual(read(self.path), b"<p>ho</p>")
+        self.assertNotEqual(os.stat(self.path).st_mtime_ns, before.st_mtime_ns)
+
+    def test_replaces_instead_of_truncating(self):
+        write(self.path, b"old")
+        other = os.path.join(self.tmp.name, "other.html")
+        os.link(self.path, other)
+        write_if_changed(self.path, b"new content")
+        # A rename gives path a new inode; the old one, still linked, keeps its bytes.
+        self.assertEqual(read(other), b"old")
+        self.assertEqual(read(self.path), b"new content")
+
+    def test_leaves_no_temporary_files(self):
+        write_if_changed(self.path, b"a")
+        write_if_changed(self.path, b"bb")
+        self.assertEqual(os.listdir(self.tmp.name), ["page.html"])
+
+    def test_failed_write_keeps_old_file(self):
+        write(self.path, b"old")
+
+        class Boom(Exception):
+            pass
+
+        def failing_copy(source, target):
+            write(target, b"partial")
+            raise Boom()
+
+        with self.assertRaises(Boom):
+            copy_atomic(self.path, self.path, failing_copy)
+        self.assertEqual(read(self.path), b"old")
+        self.assertEqual(os.listdir(self.tmp.name), ["page.html"])
+
+
+class TestCopyIfChanged(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "source.css")
+        self.target = os.path.join(self.tmp.name, "target.css")
+        write(self.source, b"body {}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_copies_missing_target(self):
+        self.assertTrue(copy_if_changed(self.source, self.target))
+        self.assertEqual(read(self.target), b"body {}")
+
+    def test_identical_target_untouched(self):
+        write(self.target, b"body {}")
+        before = age(self.target)
+        self.assertFalse(copy_if_changed(self.source, self.target))
+        self.assertEqual(os.stat(self.target).st_mtime_ns, before.st_mtime_ns)
+
+    def test_changed_target_replaced(self):
+        write(self.target, b"body {color: red}")
+        self.assertTrue(copy_if_changed(self.source, self.target))
+        self.assertEqual(read(self.target), b"body {}")
+
+    def test_existing_hardlink_untouched(self):
+        copy_hardlink(self.source, self.target)
+        self.assertFalse(copy_if_changed(self.source, self.target, copy_hardlink))
+        self.assertTrue(os.path.samefile(self.source, self.target))
+
+    def test_with_hardlink_strategy(self):
+        write(self.target, b"old")
+        self.assertTrue(copy_if_changed(self.source, self.target, copy_hardlink))
+        self.assertTrue(os.path.samefile(self.source, self.target))
+
+    def test_same_content(self):
+        write(self.target, b"body {}")
+        self.assertTrue(same_content(self.source, self.target))
+        write(self.target, b"body {")
+        self.assertFalse(same_content(self.source, self.target))
+        write(self.target, b"body ()")
+        self.assertFalse(same_content(self.source, self.target))
+
+
+class TestWritePathList(unittest.TestCase):
+    def test_one_path_per_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out", "changed.txt")
+            write_path_list(path, ["index.html", "blog/a b.html"])
+            self.assertEqual(read(path), b"index.html\nblog/a b.html\n")
+            write_path_list(path, [])
+            self.assertEqual(read(path), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
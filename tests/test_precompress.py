@@ -0,0 +1,111 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from precompress import artifact_name, compress_file, precompress_public
+from static_files import hash_file
+
+PAGE = "<html><body>" + "<p>repeated paragraph text</p>" * 200 + "</body></html>"
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = "wb" if isinstance(content, bytes) else "w"
+    with open(path, mode) as f:
+        f.write(content)
+
+
+class TestCompressFile(unittest.TestCase):
+    def test_output_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "a.html")
+            write(source, PAGE)
+            size = compress_file(source, os.path.join(tmp, "a.gz"), level=6)
+            with open(os.path.join(tmp, "a.gz"), "rb") as f:
+                data = f.read()
+            self.assertEqual(size, len(data))
+            self.assertEqual(data[4:8], b"\0\0\0\0")
+            self.assertEqual(gzip.decompress(data).decode(), PAGE)
+            compress_file(source, os.path.join(tmp, "b.gz"), level=6)
+            self.assertEqual(hash_file(os.path.join(tmp, "a.gz")), hash_file(os.path.join(tmp, "b.gz")))
+
+
+class TestPrecompressPublic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.public = os.path.join(self.root, "public")
+        write(os.path.join(self.public, "index.html"), PAGE)
+        write(os.path.join(self.public, "blog", "post.html"), PAGE.replace("repeated", "other"))
+        write(os.path.join(self.public, "small.css"), "body {}")
+        write(os.path.join(self.public, "random.js"), os.urandom(4096))
+        write(os.path.join(self.public, "image.png"), PAGE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_precompress(self, **kwargs):
+        return precompress_public(self.root, workers=1, **kwargs)
+
+    def gz(self, rel_path):
+        return os.path.join(self.public, rel_path + ".gz")
+
+    def test_compresses_eligible_files(self):
+        result = self.run_precompress()
+        self.assertEqual(result.compressed, ["blog/post.html", "index.html"])
+        self.assertEqual(result.skipped, ["random.js", "small.css"])
+        with open(self.gz("index.html"), "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()).decode(), PAGE)
+        for rel_path in ("small.css", "random.js", "image.png"):
+            self.assertFalse(os.path.exists(self.gz(rel_path)))
+        self.assertEqual(result.bytes_in, 2 * len(PAGE) - len("repeated") * 200 + len("other") * 200)
+        self.assertLess(result.bytes_out, result.bytes_in / 10)
+
+    def test_unchanged_files_are_not_compressed_again(self):
+        self.run_precompress()
+        before = os.stat(self.gz("index.html"))
+        result = self.run_precompress()
+        self.assertEqual(result.compressed, [])
+        self.assertEqual(result.reused, ["blog/post.html", "index.html"])
+        after = os.stat(self.gz("index.html"))
+        self.assertEqual((before.st_ino, before.st_mtime_ns), (after.st_ino, after.st_mtime_ns))
+
+    def test_rebuilt_public_reuses_cache(self):
+        self.run_precompress()
+        shutil.rmtree(self.public)
+        write(os.path.join(self.public, "index.html"), PAGE)
+        result = self.run_precompress()
+        self.assertEqual((result.compressed, result.reused), ([], ["index.html"]))
+        self.assertTrue(os.path.exists(self.gz("index.html")))
+
+    def test_changed_and_removed_sources(self):
+        self.run_precompress()
+        old_artifact = artifact_name(hash_file(os.path.join(self.public, "index.html")), 9)
+        write(os.path.join(self.public, "index.html"), PAGE + "<!-- changed -->")
+        os.remove(os.path.join(self.public, "blog", "post.html"))
+        result = self.run_precompress()
+        self.assertEqual(result.compressed, ["index.html"])
+        self.assertEqual(result.removed, ["blog/post.html.gz"])
+        self.assertFalse(os.path.exists(self.gz("blog/post.html")))
+        self.assertNotIn(old_artifact, os.listdir(os.path.join(self.root, ".cache", "precompress")))
+        with open(self.gz("index.html"), "rb") as f:
+            self.assertTrue(gzip.decompress(f.read()).decode().endswith("<!-- changed -->"))
+
+    def test_thresholds_and_level(self):
+        self.run_precompress()
+        result = self.run_precompress(min_size=len(PAGE) + 1)
+        self.assertEqual(sorted(result.removed), ["blog/post.html.gz", "index.html.gz"])
+        result = self.run_precompress(level=1)
+        self.assertEqual(result.compressed, ["blog/post.html", "index.html"])
+
+    def test_process_pool(self):
+        result = precompress_public(self.root, workers=2)
+        self.assertEqual(result.compressed, ["blog/post.html", "index.html"])
+        with open(self.gz("blog/post.html"), "rb") as f:
+            self.assertIn(b"other", gzip.decompress(f.read()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import static_files
+from static_files import (
+    CopyError,
+    CopyResult,
+    copy_files,
+    copy_static_to_public,
+    diff_snapshots,
+    hash_file,
+    load_manifest,
+    remove_empty_parents,
+    scan_tree,
+    snapshot_files,
+    sync_static,
+)
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class TestCopyStaticToPublic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        write(os.path.join(self.static, "index.css"), "body {}")
+        write(os.path.join(self.static, "images", "a.png"), "png-bytes")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_missing_static_raises(self):
+        with tempfile.TemporaryDirectory() as empty:
+            with self.assertRaises(FileNotFoundError):
+                copy_static_to_public(empty)
+
+    def test_full_copy(self):
+        write(os.path.join(self.static, "stale.txt"), "old")
+        copy_static_to_public(self.root)
+        self.assertEqual(read(os.path.join(self.public, "index.css")), "body {}")
+        self.assertEqual(read(os.path.join(self.public, "images", "a.png")), "png-bytes")
+        os.remove(os.path.join(self.static, "stale.txt"))
+        write(os.path.join(self.public, "index.html"), "<html></html>")
+        result = copy_static_to_public(self.root)
+        self.assertEqual(result.deleted, ["stale.txt"])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "stale.txt")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_full_copy_leaves_identical_files_untouched(self):
+        copy_static_to_public(self.root, strategy="copy")
+        css = os.path.join(self.public, "index.css")
+        st = os.stat(css)
+        os.utime(css, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        before = os.stat(css)
+        result = copy_static_to_public(self.root, strategy="copy")
+        self.assertEqual(result.copied, [])
+        self.assertEqual(result.skipped, ["images/a.png", "index.css"])
+        after = os.stat(css)
+        self.assertEqual((after.st_ino, after.st_mtime_ns), (before.st_ino, before.st_mtime_ns))
+
+    def test_full_copy_does_not_read_hardlinked_files(self):
+        copy_static_to_public(self.root, strategy="hardlink")
+        with mock.patch.object(static_files, "hash_file", wraps=hash_file) as hashed, \
+                mock.patch.object(static_files, "same_content") as compared:
+            result = copy_static_to_public(self.root)
+        self.assertEqual(result.skipped, ["images/a.png", "index.css"])
+        hashed.assert_not_called()
+        compared.assert_not_called()
+
+    def test_full_copy_compares_instead_of_hashing(self):
+        copy_static_to_public(self.root, strategy="copy")
+        with mock.patch.object(static_files, "hash_file", wraps=hash_file) as hashed, \
+                mock.patch.object(static_files, "same_content", wraps=static_files.same_content) as compared:
+            result = copy_static_to_public(self.root, strategy="copy")
+        self.assertEqual(result.skipped, ["images/a.png", "index.css"])
+        hashed.assert_not_called()
+        self.assertEqual(compared.call_count, 2)
+
+    def test_full_copy_repairs_what_sync_trusts(self):
+        copy_static_to_public(self.root, strategy="copy")
+        css = os.path.join(self.public, "index.css")
+        st = os.stat(css)
+        write(css, "xxxx {}")
+        os.utime(css, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(copy_static_to_public(self.root, sync=True, strategy="copy").copied, [])
+        self.assertEqual(copy_static_to_public(self.root, strategy="copy").copied, ["index.css"])
+        self.assertEqual(read(css), "body {}")
+
+    def test_sync_first_run_copies_everything(self):
+        result = copy_static_to_public(self.root, sync=True)
+        self.assertEqual(result.copied, ["images/a.png", "index.css"])
+        self.assertEqual(result.skipped, [])
+        self.assertEqual(result.deleted, [])
+        manifest = load_manifest(os.path.join(self.root, ".cache", "static-manifest.json"))
+        self.assertEqual(manifest["index.css"]["hash"], hash_file(os.path.join(self.static, "index.css")))
+        self.assertEqual(manifest["index.css"]["size"], 7)
+
+    def test_sync_skips_unchanged(self):
+        copy_static_to_public(self.root, sync=True)
+        result = copy_static_to_public(self.root, sync=True)
+        self.assertEqual(result.copied, [])
+        self.assertEqual(result.skipped, ["images/a.png", "index.css"])
+
+    def test_sync_copies_changed(self):
+        copy_static_to_public(self.root, sync=True)
+        write(os.path.join(self.static, "index.css"), "body { color: red; }")
+        result = copy_static_to_public(self.root, sync=True)
+        self.assertEqual(result.copied, ["index.css"])
+        self.assertEqual(result.skipped, ["images/a.png"])
+        self.assertEqual(read(os.path.join(self.public, "index.css")), "body { color: red; }")
+
+    def test_sync_touch_without_content_change_is_skipped(self):
+        copy_static_to_public(self.root, sync=True)
+        css = os.path.join(self.static, "index.css")
+        st = os.stat(css)
+        os.utime(css, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        result = copy_static_to_public(self.root, sync=True)
+        self.assertEqual(result.copied, [])
+        manifest = load_manifest(os.path.join(self.root, ".cache", "static-manifest.json"))
+        self.assertEqual(manifest["index.css"]["mtime"], st.st_mtime_ns + 10**9)
+
+    def test_sync_recopies_missing_target(self):
+        copy_static_to_public(self.root, sync=True)
+        os.remove(os.path.join(self.public, "index.css"))
+        result = copy_static_to_public(self.root, sync=True)
+        self.assertEqual(result.copied, ["index.css"])
+
+    def test_sync_without_manifest_keeps_identical_targets(self):
+        copy_static_to_public(self.root, strategy="copy")
+        css = os.path.join(self.public, "index.css")
+        st = os.stat(css)
+        os.utime(css, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        before = os.stat(css)
+        write(os.path.join(self.static, "images", "a.png"), "new-bytes")
+        result = copy_static_to_public(self.root, sync=True, strategy="copy")
+        self.assertEqual(result.copied, ["images/a.png"])
+        self.assertEqual(result.skipped, ["index.css"])
+        self.assertEqual(os.stat(css).st_mtime_ns, before.st_mtime_ns)
+        self.assertEqual(read(os.path.join(self.public, "images", "a.png")), "new-bytes")
+
+    def test_sync_failed_copy_keeps_target_and_retries(self):
+        manifest_path = os.path.join(self.root, ".cache", "static-manifest.json")
+        sync_static(self.static, self.public, manifest_path)
+        write(os.path.join(self.static, "index.css"), "body { color: red; }")
+
+        def failing_copy(source, target):
+            raise OSError("disk full")
+
+        result = sync_static(self.static, self.public, manifest_path, workers=1, copy_function=failing_copy)
+        self.assertEqual([rel_path for rel_path, _ in result.errors], ["index.css"])
+        self.assertEqual(result.deleted, [])
+        self.assertEqual(read(os.path.join(self.public, "index.css")), "body {}")
+        self.assertNotIn("index.css", load_manifest(manifest_path))
+
+        result = sync_static(self.static, self.public, manifest_path)
+        self.assertEqual(result.copied, ["index.css"])
+        self.assertEqual(read(os.path.join(self.public, "index.css")), "body { color: red; }")
+
+    def test_sync_deletes_removed_and_keeps_unmanaged(self):
+        copy_static_to_public(self.root, sync=True)
+        write(os.path.join(self.public, "index.html"), "<html></html>")
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        result = copy_static_to_public(self.root, sync=True)
+        self.assertEqual(result.deleted, ["images/a.png"])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+
+class TestRemoveEmptyParents(unittest.TestCase):
+    def test_stops_at_first_non_empty_directory(self):
+        with tempfile.TemporaryDirectory() as root:
+            write(os.path.join(root, "a", "keep.txt"), "x")
+            os.makedirs(os.path.join(root, "a", "b", "c"))
+            remove_empty_parents(os.path.join(root, "a", "b", "c", "gone.txt"), root)
+            self.assertEqual(os.listdir(os.path.join(root, "a")), ["keep.txt"])
+            os.remove(os.path.join(root, "a", "keep.txt"))
+            remove_empty_parents(os.path.join(root, "a", "keep.txt"), root)
+            self.assertEqual(os.listdir(root), [])
+            self.assertTrue(os.path.isdir(root))
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_diff_reports_written_added_and_deleted(self):
+        with tempfile.TemporaryDirectory() as root:
+            write(os.path.join(root, "keep.html"), "same")
+            write(os.path.join(root, "edit.html"), "old")
+            write(os.path.join(root, "gone", "x.css"), "x")
+            old = snapshot_files(root)
+            edit = os.path.join(root, "edit.html")
+            os.remove(edit)
+            write(edit, "new")
+            os.utime(edit, ns=(0, 10**9))
+            write(os.path.join(root, "new.html"), "n")
+            os.remove(os.path.join(root, "gone", "x.css"))
+            changed, deleted = diff_snapshots(old, snapshot_files(root))
+            self.assertEqual(changed, ["edit.html", "new.html"])
+            self.assertEqual(deleted, ["gone/x.css"])
+
+    def test_missing_root_is_empty(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.assertEqual(snapshot_files(os.path.join(root, "public")), {})
+
+
+class TestParallelCopy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "src")
+        self.target = os.path.join(self.tmp.name, "dst")
+        for i in range(20):
+            write(os.path.join(self.source, f"d{i % 3}", "nested", f"f{i}.txt"), f"file {i}")
+        write(os.path.join(self.source, "top.txt"), "top")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_tree_orders_parents_first(self):
+        dirs, files = scan_tree(self.source)
+        self.assertEqual(dirs, ["d0", "d0/nested", "d1", "d1/nested", "d2", "d2/nested"])
+        self.assertEqual(len(files), 21)
+        self.assertEqual(files, sorted(files))
+
+    def test_sync_parallel_matches_serial(self):
+        manifest = os.path.join(self.tmp.name, "parallel.json")
+        parallel = sync_static(self.source, self.target, manifest, workers=8)
+        serial_target = os.path.join(self.tmp.name, "serial")
+        serial = sync_static(self.source, serial_target, os.path.join(self.tmp.name, "serial.json"), workers=1)
+        self.assertEqual(parallel.copied, serial.copied)
+        self.assertEqual(len(parallel.copied), 21)
+        self.assertEqual(parallel.errors, [])
+        for rel_path in parallel.copied:
+            self.assertEqual(
+                read(os.path.join(self.target, rel_path)),
+                read(os.path.join(serial_target, rel_path)),
+            )
+
+    def test_copy_files_aggregates_errors(self):
+        def flaky_copy(source, target):
+            if source.endswith(("f3.txt", "f7.txt")):
+                raise PermissionError(f"denied: {source}")
+            with open(source) as src, open(target, "w") as dst:
+                dst.write(src.read())
+
+        dirs, files = scan_tree(self.source)
+        for rel_dir in dirs:
+            os.makedirs(os.path.join(self.target, rel_dir), exist_ok=True)
+        pairs = [(f, os.path.join(self.source, f), os.path.join(self.target, f)) for f in files]
+        errors = copy_files(pairs, workers=4, copy_function=flaky_copy)
+        self.assertEqual([rel_path for rel_path, _ in errors], ["d0/nested/f3.txt", "d1/nested/f7.txt"])
+        self.assertTrue(all(isinstance(e, PermissionError) for _, e in errors))
+        self.assertTrue(os.path.exists(os.path.join(self.target, "top.txt")))
+        self.assertTrue(os.path.exists(os.path.join(self.target, "d1", "nested", "f19.txt")))
+        self.assertFalse(os.path.exists(os.path.join(self.target, "d0", "nested", "f3.txt")))
+
+    def test_copy_error_lists_every_file(self):
+        result = CopyResult()
+        result.errors = [("a.css", OSError("disk full")), ("b.png", OSError("disk full"))]
+        message = str(CopyError(result))
+        self.assertIn("2 file(s)", message)
+        self.assertIn("a.css: disk full", message)
+        self.assertIn("b.png: disk full", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import io
+import os
+import tempfile
+import unittest
+
+from template import compile_template, load_compiled_template, load_template
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_no_partials(self):
+        path = os.path.join(self.root, "template.html")
+        write(path, "<title>{{ Title }}</title>")
+        text, deps = load_template(path)
+        self.assertEqual(text, "<title>{{ Title }}</title>")
+        self.assertEqual(deps, [path])
+
+    def test_nested_partials(self):
+        path = os.path.join(self.root, "template.html")
+        write(path, "<body>{{> partials/header.html }}{{ Content }}{{>partials/footer.html}}</body>")
+        write(os.path.join(self.root, "partials", "header.html"), "<header>{{> nav.html }}</header>")
+        write(os.path.join(self.root, "partials", "nav.html"), "<nav>{{ Title }}</nav>")
+        write(os.path.join(self.root, "partials", "footer.html"), "<footer></footer>")
+        text, deps = load_template(path)
+        self.assertEqual(text, "<body><header><nav>{{ Title }}</nav></header>{{ Content }}<footer></footer></body>")
+        self.assertEqual(
+            deps,
+            [
+                path,
+                os.path.join(self.root, "partials", "header.html"),
+                os.path.join(self.root, "partials", "nav.html"),
+                os.path.join(self.root, "partials", "footer.html"),
+            ],
+        )
+
+    def test_include_cycle_raises(self):
+        path = os.path.join(self.root, "a.html")
+        write(path, "{{> b.html }}")
+        write(os.path.join(self.root, "b.html"), "{{> a.html }}")
+        with self.assertRaises(ValueError) as context:
+            load_template(path)
+        self.assertIn("include cycle", str(context.exception))
+
+    def test_missing_partial_raises(self):
+        path = os.path.join(self.root, "template.html")
+        write(path, "{{> missing.html }}")
+        with self.assertRaises(FileNotFoundError):
+            load_template(path)
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    def test_splits_into_chunks_and_slots(self):
+        template = compile_template("<title>{{ Title }}</title><main>{{Content}}</main>")
+        self.assertEqual(template.chunks, ["<title>", "</title><main>", "</main>"])
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+    def test_render_matches_replace(self):
+        text = "<title>{{ Title }}</title>{{ Content }}<h1>{{ Title }}</h1>"
+        values = {"Title": "Home", "Content": "<p>hi</p>"}
+        expected = text.replace("{{ Title }}", "Home").replace("{{ Content }}", "<p>hi</p>")
+        self.assertEqual(compile_template(text).render(values), expected)
+
+    def test_values_are_not_scanned_for_slots(self):
+        template = compile_template("{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render({"Title": "{{ Content }}", "Content": "x"}), "{{ Content }}|x")
+
+    def test_missing_values_keep_placeholder(self):
+        template = compile_template("{{ Title }} {{  Author }}")
+        self.assertEqual(template.render({"Title": "T"}), "T {{  Author }}")
+
+    def test_no_slots(self):
+        self.assertEqual(compile_template("<p>static</p>").render({}), "<p>static</p>")
+        self.assertEqual(compile_template("").render({"Title": "x"}), "")
+
+    def test_write(self):
+        out = io.StringIO()
+        compile_template("<b>{{ Content }}</b>").write(out, {"Content": "body"})
+        self.assertEqual(out.getvalue(), "<b>body</b>")
+
+
+class TestLoadCompiledTemplate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "template.html")
+        self.footer = os.path.join(self.tmp.name, "footer.html")
+        write(self.path, "<title>{{ Title }}</title>{{> footer.html }}")
+        write(self.footer, "<footer>{{ Content }}</footer>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compiles_expanded_template(self):
+        template = load_compiled_template(self.path)
+        self.assertEqual(template.render({"Title": "T", "Content": "C"}), "<title>T</title><footer>C</footer>")
+        self.assertEqual(template.dependencies, [self.path, self.footer])
+        self.assertEqual(len(template.hashes[self.footer]), 64)
+
+    def test_unchanged_files_reuse_compiled_template(self):
+        self.assertIs(load_compiled_template(self.path), load_compiled_template(self.path))
+
+    def test_changed_partial_recompiles(self):
+        first = load_compiled_template(self.path)
+        write(self.footer, "<footer>new {{ Content }}</footer>")
+        second = load_compiled_template(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.render({"Title": "T", "Content": "C"}), "<title>T</title><footer>new C</footer>")
+
+    def test_removed_partial_raises(self):
+        load_compiled_template(self.path)
+        os.remove(self.footer)
+        with self.assertRaises(FileNotFoundError):
+            load_compiled_template(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
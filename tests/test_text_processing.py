@@ -1,7 +1,9 @@
+import io
+import random
 import unittest
 
 from text_processing import *
-from textnode import TextNode, TextType, BlockType
+from textnode import TextNode, TextSpan, TextType, BlockType
 
 class TestSplitNodesDelimiter(unittest.TestCase):
     def test_code_delimiter(self):
@@ -560,6 +562,23 @@ class TestSplitNodesLink(unittest.TestCase):
         expected = [node1, node2, node3]
         self.assertEqual(new_nodes, expected)
 
+    def test_split_nodes_link_escaped_duplicate(self):
+        node = TextNode("\\[a](b) is escaped but [a](b) is not", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        expected = [
+            TextNode("\\[a](b) is escaped but ", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b"),
+            TextNode(" is not", TextType.TEXT),
+        ]
+        self.assertEqual(new_nodes, expected)
+
+    def test_split_nodes_link_hundreds_of_links(self):
+        text = " ".join(f"[l{i}](u{i})" for i in range(500))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 999)
+        self.assertEqual(new_nodes[0], TextNode("l0", TextType.LINK, "u0"))
+        self.assertEqual(new_nodes[-1], TextNode("l499", TextType.LINK, "u499"))
+
 class TestSplitNodesImage(unittest.TestCase):
     def test_split_nodes_image_basic(self):
         node = TextNode(
@@ -656,6 +675,15 @@ class TestSplitNodesImage(unittest.TestCase):
         expected = [node1, node2, node3]
         self.assertEqual(new_nodes, expected)
 
+    def test_split_nodes_image_escaped_duplicate(self):
+        node = TextNode("\\![a](b) then ![a](b)", TextType.TEXT)
+        new_nodes = split_nodes_image([node])
+        expected = [
+            TextNode("\\![a](b) then ", TextType.TEXT),
+            TextNode("a", TextType.IMAGE, "b"),
+        ]
+        self.assertEqual(new_nodes, expected)
+
 class TestMixedContent(unittest.TestCase):
     def test_text_with_both_images_and_links(self):
         node = TextNode(
@@ -1018,6 +1046,23 @@ This is the same paragraph on a new line
             ]
         )
 
+class TestIterBlocks(unittest.TestCase):
+    def test_matches_markdown_to_blocks(self):
+        rng = random.Random(99)
+        fragments = ["text", " ", "  ", "\t", "\n", "\n\n", "\n\n\n", "# h", "- item", "```"]
+        for _ in range(2000):
+            md = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 20)))
+            self.assertEqual(list(iter_blocks(md.split("\n"))), markdown_to_blocks(md), repr(md))
+            self.assertEqual(list(iter_blocks(io.StringIO(md))), markdown_to_blocks(md), repr(md))
+
+    def test_yields_before_input_is_exhausted(self):
+        def lines():
+            yield "first block\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+
+        self.assertEqual(next(iter_blocks(lines())), "first block")
+
 class TestBlockToBlockType(unittest.TestCase):
 
     def test_paragraph(self):
@@ -1087,6 +1132,158 @@ class TestBlockToBlockType(unittest.TestCase):
         self.assertEqual(block_to_block_type("2. Wrong start\n3. Second"), BlockType.PARAGRAPH)
         self.assertEqual(block_to_block_type("1. A\n2. B\n3. C\n4. D\n5. E\n6. F\n7. G\n8. H\n9. I\n10. J"), BlockType.ORDERED_LIST)
 
+class TestTextSpans(unittest.TestCase):
+    def test_spans_match_substring_nodes(self):
+        text = "a **b** _c_ `d` [e](f) ![g](h) tail"
+        spans = text_to_textnodes(text, spans=True)
+        self.assertTrue(all(isinstance(node, TextSpan) for node in spans))
+        self.assertEqual(spans, text_to_textnodes(text))
+
+    def test_spans_point_into_source(self):
+        text = "see [docs](/d) and **bold**"
+        nodes = text_to_textnodes(text, spans=True)
+        for node in nodes:
+            self.assertIs(node.source, text)
+            self.assertEqual(text[node.start:node.end], node.text)
+        self.assertEqual((nodes[1].start, nodes[1].end), (5, 9))
+
+    def test_text_is_sliced_on_first_read(self):
+        node = TextSpan("hello world", 6, 11, TextType.TEXT)
+        self.assertIsNone(node._text)
+        self.assertEqual(node.text, "world")
+        self.assertIs(node.text, node.text)
+
+    def test_splitters_keep_offsets_into_the_original_source(self):
+        text = "x [a](u) y **b** z"
+        nodes = [TextSpan(text, 0, len(text), TextType.TEXT)]
+        nodes = split_nodes_link(nodes)
+        nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+        self.assertEqual(nodes, text_to_textnodes(text))
+        bold = nodes[3]
+        self.assertEqual(bold.text_type, TextType.BOLD)
+        self.assertEqual((bold.source, bold.start, bold.end), (text, 13, 14))
+
+    def test_unclosed_delimiter_reports_offset(self):
+        with self.assertRaises(ValueError) as context:
+            text_to_textnodes("fine **bold** then _open")
+        self.assertIn("'_' at offset 19", str(context.exception))
+
+class TestScanBlock(unittest.TestCase):
+    def test_agrees_with_block_to_block_type(self):
+        blocks = [
+            "plain", "# h", "###### h", "####### h", "#", "# a\nmore", "```\ncode\n```", "```\n```",
+            "> q\n>r", "> q\nr", "- a\n- b", "- a\n-b", "1. a\n2. b", "1. a\n3. b",
+            "1. a\n2. ", "01. a", "1.a", "\n".join(f"{i}. x" for i in range(1, 12)),
+        ]
+        for block in blocks:
+            self.assertEqual(scan_block(block).block_type, block_to_block_type(block), repr(block))
+
+    def test_indented_closing_fence_is_code(self):
+        # Rendered as a code block even though block_to_block_type says paragraph.
+        block = scan_block("```\ncode\n  ```")
+        self.assertEqual(block.block_type, BlockType.CODE)
+        self.assertTrue(block.fenced)
+
+    def test_records_levels_and_markers(self):
+        self.assertEqual(scan_block("### Title").level, 3)
+        self.assertEqual(scan_block("> a\n>b").starts, [2, 1])
+        self.assertEqual(scan_block("- a\n- b").starts, [2, 2])
+        block = scan_block("\n".join(f"{i}. x" for i in range(1, 11)))
+        self.assertEqual(block.starts, [2] * 9 + [3])
+        self.assertEqual(block.lines[9], "10. x")
+
+    def test_two_line_fence_is_not_fenced(self):
+        block = scan_block("```\n```")
+        self.assertEqual(block.block_type, BlockType.CODE)
+        self.assertFalse(block.fenced)
+        self.assertTrue(scan_block("```\nx\n```").fenced)
+
+    def test_scan_blocks_streams_lines(self):
+        blocks = list(scan_blocks(io.StringIO("# T\n\n- a\n- b\n\n\ntext\n")))
+        self.assertEqual([b.block_type for b in blocks], [BlockType.HEADING, BlockType.UNORDERED_LIST, BlockType.PARAGRAPH])
+        self.assertEqual(blocks[1].lines, ["- a", "- b"])
+
+def five_pass_text_to_textnodes(text):
+    # The original pipeline, kept as the reference for the single-pass scanner.
+    # Its link and image splits match by offset; the very first versions
+    # split on the first literal "[text](url)", which could be an escaped
+    # copy of the link (see test_escaped_copy_of_a_later_link).
+    if text == "":
+        return [TextNode("", TextType.TEXT)]
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return nodes
+
+class TestTextToTextNodesDifferential(unittest.TestCase):
+    def assertSameAsFivePass(self, text):
+        try:
+            expected = five_pass_text_to_textnodes(text)
+        except ValueError:
+            with self.assertRaises(ValueError, msg=repr(text)):
+                text_to_textnodes(text)
+            return
+        self.assertEqual(text_to_textnodes(text), expected, repr(text))
+
+    def test_handwritten_cases(self):
+        cases = [
+            "",
+            "plain",
+            "**bold** _it_ `code`",
+            "`code with **bold** and _it_ inside`",
+            "**bold with `code` inside**",
+            "[link](https://a.b/c_(d)) then ![img](/x_y.png) and **b**",
+            "![a](b)![c](d)[e](f)[g](h)",
+            "\\![escaped](img) and \\[escaped](link)",
+            "**[link](u) inside bold**",
+            "****empty bold**** and ``",
+            "_a_b_c_",
+            "unclosed `code",
+            "[not a link] (url) and [also](not",
+            "[x![a](b)](c)",
+            "[a](b ![c](d))",
+            "a ! [b](c) and ![b](c)",
+            "\\[a](b)[a](b)[a](b)!",
+            "\\![a](b)![a](b) and \\[a](b) [a](b)",
+        ]
+        for text in cases:
+            self.assertSameAsFivePass(text)
+
+    def test_escaped_copy_of_a_later_link(self):
+        # The escaped copy stays text and every unescaped one is a link. The
+        # original str.split pipeline turned the escaped copy into the first
+        # link instead.
+        self.assertEqual(
+            text_to_textnodes("\\[a](b)[a](b)[a](b)!"),
+            [
+                TextNode("\\[a](b)", TextType.TEXT),
+                TextNode("a", TextType.LINK, "b"),
+                TextNode("a", TextType.LINK, "b"),
+                TextNode("!", TextType.TEXT),
+            ],
+        )
+
+    def test_random_inputs(self):
+        rng = random.Random(1234)
+        fragments = ["word", " ", "**", "_", "`", "\\", "!", "[", "]", "(", ")", "\n"]
+        for _ in range(3000):
+            parts = []
+            for _ in range(rng.randint(0, 14)):
+                # A small pool, so the same link often appears twice,
+                # escaped or not.
+                k = rng.randrange(3)
+                choice = rng.random()
+                if choice < 0.12:
+                    parts.append(f"[l{k}](https://u{k}.io/p_{k})")
+                elif choice < 0.22:
+                    parts.append(f"![i{k}](/img/{k}.png)")
+                else:
+                    parts.append(rng.choice(fragments))
+            self.assertSameAsFivePass("".join(parts))
+
 if __name__ == '__main__':
     unittest.main()
 